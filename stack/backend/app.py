@@ -3,50 +3,295 @@
 # Connects Param's ML Pipeline to Diwaker's Frontend
 # ================================================================
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context, g
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+from werkzeug.exceptions import RequestEntityTooLarge
 import pandas as pd
 import numpy as np
 import sys
 import os
 import pickle
-from datetime import datetime
+import time
+import hashlib
+import json
+import functools
+import threading
+from datetime import datetime, timezone
 
 # Add ML folder to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'ml'))
 
 try:
     from param_ml_pipeline import DropoutPredictor, EarlyWarningSystem
+    from compact_model import compact_model_path
     ML_AVAILABLE = True
 except ImportError:
     print("⚠️ ML Pipeline not found - using fallback mode")
     ML_AVAILABLE = False
 
+from risk_events import RiskEventLog, diff_risk_tables, format_sse
+from dataset_store import DatasetStore
+from storage import open_storage
+from metrics import metrics
+from batching import MicroBatcher
+from tenants import Tenant, TenantRegistry, load_tenant_configs
+from validation import validate_students
+from distributions import DEFAULT_BINS, DISTRIBUTION_METRICS, GROUP_COLUMNS, MAX_BINS, build_distributions
+import search_index
+import bulk_predict
+import drift
+import simulation
+
+DATA_PATH = os.environ.get('DATA_PATH', "../ml/final_clean_students_14k.csv")
+MODEL_PATH = os.environ.get('ML_MODEL_PATH', "../ml/dropout_prediction_model.pkl")
+# "compact" serves the model built by ml/compact_model.py when it exists
+MODEL_VARIANT = os.environ.get('ML_MODEL_VARIANT', 'full')
+STORAGE_URL = os.environ.get('STORAGE_URL', "sqlite:///../ml/students.db")
+# Concurrent single predictions are coalesced for up to this long / this many students
+PREDICT_BATCH_MAX_WAIT_MS = float(os.environ.get('PREDICT_BATCH_MAX_WAIT_MS', 2))
+PREDICT_BATCH_MAX_SIZE = int(os.environ.get('PREDICT_BATCH_MAX_SIZE', 64))
+# Several institutions: TENANTS_CONFIG names a JSON file of per-tenant data/model paths
+TENANTS_CONFIG = os.environ.get('TENANTS_CONFIG')
+DEFAULT_TENANT = os.environ.get('DEFAULT_TENANT', None if TENANTS_CONFIG else 'default')
+TENANT_MEMORY_BUDGET_MB = float(os.environ.get('TENANT_MEMORY_BUDGET_MB', 2048))
+# Browsers may keep read responses but must revalidate them (cheap 304s)
+HTTP_CACHE_CONTROL = os.environ.get('HTTP_CACHE_CONTROL', 'private, no-cache')
+# Largest body and row count /api/predict/bulk accepts in one request
+BULK_PREDICT_MAX_MB = float(os.environ.get('BULK_PREDICT_MAX_MB', 64))
+BULK_PREDICT_MAX_ROWS = int(os.environ.get('BULK_PREDICT_MAX_ROWS', 500000))
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """Flask's JSON encoding, recorded as the serialization stage"""
+    def dumps(self, obj, **kwargs):
+        with metrics.time('serialization'):
+            return super().dumps(obj, **kwargs)
+
 app = Flask(__name__)
+app.json = TimedJSONProvider(app)
 CORS(app)  # Enable CORS for frontend communication
 
-# Initialize ML components
-if ML_AVAILABLE:
+def load_tenant(tenant_id, config):
+    """Load (or train) one tenant's model and restore its roster"""
+    model_path = config['model_path']
+    model_variant = config.get('model_variant', MODEL_VARIANT)
+    if model_variant == 'compact':
+        if os.path.exists(compact_model_path(model_path)):
+            model_path = compact_model_path(model_path)
+        else:
+            print("⚠️ Compact model not found - serving the full model")
+            model_variant = 'full'
+    
+    predictor = DropoutPredictor()
+    # Try to load existing model or create new one
     try:
-        predictor = DropoutPredictor()
-        # Try to load existing model or create new one
-        try:
-            predictor.load_model("../ml/dropout_prediction_model.pkl")
-            print("✅ Pre-trained model loaded successfully")
-        except:
-            print("📚 Training new model...")
-            data = predictor.load_data("../ml/final_clean_students_14k.csv")
-            labels = predictor.create_dropout_labels()
-            X, y = predictor.prepare_features()
-            predictor.train_model(X, y)
-            predictor.save_model("../ml/dropout_prediction_model.pkl")
-            print("✅ New model trained and saved")
-        
-        ews = EarlyWarningSystem(predictor)
-        print("🚀 ML Pipeline initialized successfully")
+        predictor.load_model(model_path)
+        print("✅ Pre-trained model loaded successfully")
+    except:
+        print("📚 Training new model...")
+        predictor.train_pipeline(config['data_path'])
+        predictor.save_model(model_path)
+        print("✅ New model trained and saved")
+    
+    ews = EarlyWarningSystem(predictor)
+    batcher = MicroBatcher(predictor, PREDICT_BATCH_MAX_SIZE, PREDICT_BATCH_MAX_WAIT_MS)
+    # Students and predictions persist in storage; the CSV is only imported on first run
+    storage = open_storage(config.get('storage_url', 'none'))
+    model_version = storage.register_model_version(model_path, predictor) if storage else None
+    with metrics.time('data_load'):
+        store = DatasetStore(predictor, storage, model_version).bootstrap(config['data_path'])
+    # Risk transitions pushed to the notification center
+    return Tenant(tenant_id, predictor, ews, store, batcher, RiskEventLog(), model_path, model_variant)
+
+# ML components are created by init_ml(), not on import: importing the app
+# (tools, WSGI/ASGI servers, health checks) loads no model, data or sklearn
+tenants = None
+_init_lock = threading.Lock()
+
+def init_ml():
+    """Create the tenant registry once and load the default tenant; returns None if ML is unavailable"""
+    global tenants, ML_AVAILABLE
+    if tenants is not None:
+        return tenants
+    with _init_lock:
+        if tenants is None and ML_AVAILABLE:
+            try:
+                if TENANTS_CONFIG:
+                    tenant_configs = load_tenant_configs(TENANTS_CONFIG)
+                else:
+                    tenant_configs = {'default': {'data_path': DATA_PATH, 'model_path': MODEL_PATH, 'storage_url': STORAGE_URL}}
+                registry = TenantRegistry(tenant_configs, load_tenant, TENANT_MEMORY_BUDGET_MB * 2**20)
+                # A single institution loads up front as before; configured tenants load on first request
+                if not TENANTS_CONFIG:
+                    registry.get(DEFAULT_TENANT)
+                tenants = registry
+                print("🚀 ML Pipeline initialized successfully")
+            except Exception as e:
+                print(f"❌ ML initialization failed: {e}")
+                ML_AVAILABLE = False
+    return tenants
+
+# ================================================================
+# Request Instrumentation
+# ================================================================
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    """Per-endpoint latency, response size and error counts"""
+    endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+    elapsed = time.perf_counter() - g.get('request_start', time.perf_counter())
+    
+    metrics.observe('http_request_duration_seconds', elapsed, method=request.method, endpoint=endpoint)
+    metrics.inc('http_requests_total', method=request.method, endpoint=endpoint, status=response.status_code)
+    if not response.is_streamed:
+        metrics.observe('http_response_size_bytes', response.calculate_content_length() or 0, endpoint=endpoint)
+    if response.status_code >= 500:
+        metrics.inc('http_request_errors_total', method=request.method, endpoint=endpoint)
+    return response
+
+# ================================================================
+# Tenant Selection
+# ================================================================
+
+# Endpoints that describe the server itself rather than one institution
+TENANT_FREE_PATHS = {'/api/health', '/api/metrics'}
+
+class TenantPathMiddleware:
+    """Serves /t/<tenant>/api/... as /api/... and remembers the tenant for the request"""
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+    
+    def __call__(self, environ, start_response):
+        path = environ.get('PATH_INFO', '')
+        if path.startswith('/t/'):
+            tenant_id, _, rest = path[3:].partition('/')
+            if tenant_id:
+                environ['sih.tenant'] = tenant_id
+                environ['SCRIPT_NAME'] = environ.get('SCRIPT_NAME', '') + '/t/' + tenant_id
+                environ['PATH_INFO'] = '/' + rest
+        return self.wsgi_app(environ, start_response)
+
+app.wsgi_app = TenantPathMiddleware(app.wsgi_app)
+
+@app.before_request
+def resolve_tenant():
+    """Pick the tenant from the /t/<tenant> prefix or X-Tenant-ID header, loading it if needed"""
+    # Servers that import the app without calling init_ml() initialize on the first tenant request
+    if request.path in TENANT_FREE_PATHS or init_ml() is None:
+        return None
+    tenant_id = request.environ.get('sih.tenant') or request.headers.get('X-Tenant-ID') or DEFAULT_TENANT
+    if not tenant_id:
+        return jsonify({'error': 'Tenant not specified: send X-Tenant-ID or use /t/<tenant>/api/...'}), 400
+    try:
+        g.tenant = tenants.get(tenant_id)
+    except KeyError:
+        return jsonify({'error': f"Unknown tenant: {tenant_id}"}), 404
     except Exception as e:
-        print(f"❌ ML initialization failed: {e}")
-        ML_AVAILABLE = False
+        return jsonify({'error': f"Tenant {tenant_id} failed to load: {e}"}), 500
+    return None
+
+# ================================================================
+# Conditional GET
+# ================================================================
+
+metrics.describe('http_cache_requests_total', 'counter', 'Cacheable GETs by result: hit (answered 304) or miss')
+metrics.describe('http_cache_hit_ratio', 'gauge', 'Share of cacheable GETs answered with 304 since startup')
+_cache_results = {'hit': 0, 'miss': 0}
+_cache_lock = threading.Lock()
+
+def dataset_etag(tenant):
+    """Validator for the current request: tenant, data version, model version and query"""
+    store = tenant.store
+    key = json.dumps([
+        tenant.tenant_id, store.version, store.modified_at, store.model_version, tenant.model_variant,
+        request.path, sorted(request.args.items(multi=True))
+    ], default=str)
+    return hashlib.sha1(key.encode()).hexdigest()[:20]
+
+def record_cache_result(result, endpoint):
+    metrics.inc('http_cache_requests_total', endpoint=endpoint, result=result)
+    with _cache_lock:
+        _cache_results[result] += 1
+        ratio = _cache_results['hit'] / (_cache_results['hit'] + _cache_results['miss'])
+    metrics.set('http_cache_hit_ratio', ratio)
+
+def conditional_get(view):
+    """ETag/Last-Modified on a read endpoint; a matching request gets 304 before the view runs"""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        tenant = g.get('tenant')
+        if tenant is None:
+            return view(*args, **kwargs)
+        
+        etag = dataset_etag(tenant)
+        last_modified = datetime.fromtimestamp(int(tenant.store.modified_at), timezone.utc)
+        # HTTP dates have whole seconds: while the data's second is still running another
+        # change could share its stamp, so the date is neither sent nor trusted until it ends
+        settled = time.time() >= int(tenant.store.modified_at) + 1
+        # If-None-Match wins over If-Modified-Since when both are sent
+        if request.if_none_match:
+            fresh = request.if_none_match.contains_weak(etag)
+        else:
+            fresh = settled and request.if_modified_since is not None and last_modified <= request.if_modified_since
+        record_cache_result('hit' if fresh else 'miss', request.url_rule.rule)
+        
+        response = app.response_class(status=304) if fresh else app.make_response(view(*args, **kwargs))
+        if response.status_code in (200, 304):
+            response.set_etag(etag, weak=True)
+            if settled:
+                response.last_modified = last_modified
+            response.headers['Cache-Control'] = HTTP_CACHE_CONTROL
+            response.vary.add('X-Tenant-ID')
+        return response
+    return wrapper
+
+# ================================================================
+# Risk Change Tracking
+# ================================================================
+
+def publish_risk_changes(tenant, old_risk, changed_ids, reason):
+    """Diff the rows that were just re-scored against the previous risk table"""
+    if old_risk is None or not len(changed_ids):
+        return 0
+    
+    groups = diff_risk_tables(old_risk, tenant.store.risk.loc[changed_ids])
+    return tenant.event_log.publish(groups, reason)
+
+def upsert_student_data(students_data):
+    """Apply an upload as a delta: only new or changed rows are stored and re-scored"""
+    if not ML_AVAILABLE:
+        return jsonify({'error': 'ML pipeline not available'}), 500
+    
+    store = g.tenant.store
+    incoming = pd.DataFrame(students_data)
+    with metrics.time('validation'):
+        validation = validate_students(incoming, store.predictor, required=['Student_ID'])
+    if validation.missing_columns:
+        return jsonify({'error': f"Missing columns for upsert: {', '.join(validation.missing_columns)}"}), 400
+    
+    result = store.upsert(validation.valid)
+    store.observe_batch(validation.valid)
+    changed_ids = result.pop('changed_ids')
+    risk_events = publish_risk_changes(g.tenant, result.pop('old_risk'), changed_ids, 'upload')
+    
+    # Only the inserted/updated rows are sent back, with their fresh predictions
+    risk = store.risk.loc[changed_ids, ['risk_score', 'risk_level', 'confidence']]
+    changed = store.students(changed_ids).join(
+        risk.rename(columns={'risk_score': 'dropout_risk'}).reset_index(drop=True))
+    
+    return jsonify(dict(
+        result,
+        message='Data upserted successfully',
+        mode='upsert',
+        processed_count=len(validation.valid),
+        validation=validation.report(),
+        risk_events=risk_events,
+        data=changed.to_dict('records')
+    ))
 
 # ================================================================
 # API Endpoints
@@ -55,42 +300,50 @@ if ML_AVAILABLE:
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
+    default = tenants.peek(DEFAULT_TENANT) if tenants and DEFAULT_TENANT else None
     return jsonify({
         'status': 'healthy',
         'ml_available': ML_AVAILABLE,
+        'model_variant': default.model_variant if default else MODEL_VARIANT,
+        'tenants_loaded': tenants.loaded() if tenants else [],
         'timestamp': datetime.now().isoformat()
     })
 
+def listing_filters():
+    """Filter query parameters shared by the student listing and export"""
+    return {
+        'department': request.args.get('department'),
+        'risk_level': request.args.get('risk_level', type=int),
+        'mentor_id': request.args.get('mentor_id'),
+        'semester': request.args.get('semester', type=int)
+    }
+
 @app.route('/api/students', methods=['GET'])
+@conditional_get
 def get_all_students():
     """Get all students with risk predictions"""
     try:
         if not ML_AVAILABLE:
             return jsonify({'error': 'ML pipeline not available'}), 500
         
-        # Load student data
-        data_path = "../ml/final_clean_students_14k.csv"
-        students_df = pd.read_csv(data_path)
-        
-        # Get query parameters for filtering
-        department = request.args.get('department')
-        risk_level = request.args.get('risk_level')
+        filters = listing_filters()
         limit = request.args.get('limit', 100, type=int)
+        offset = request.args.get('offset', 0, type=int)
         
-        # Apply filters
-        if department:
-            students_df = students_df[students_df['Department'] == department]
+        # Filters and paging run on the indexed store; predictions are already cached
+        predictor, store = g.tenant.predictor, g.tenant.store
+        page, matched = store.query(filters, limit, offset)
         
-        # Calculate risk levels for all students
         students_list = []
-        for _, student in students_df.head(limit).iterrows():
+        for _, student in page.iterrows():
             try:
-                prediction = predictor.predict_dropout_risk(student)
-                recommendations = predictor.generate_recommendations(student, prediction)
-                
-                # Filter by risk level if specified
-                if risk_level and str(prediction['risk_score']) != str(risk_level):
-                    continue
+                prediction = {
+                    'risk_score': int(student['risk_score']),
+                    'risk_level': student['risk_level'],
+                    'confidence': float(student['confidence'])
+                }
+                with metrics.time('recommendations'):
+                    recommendations = predictor.generate_recommendations(student, prediction)
                 
                 student_data = {
                     'Student_ID': student['Student_ID'],
@@ -113,11 +366,139 @@ def get_all_students():
                 students_list.append(student_data)
             except Exception as e:
                 print(f"Error processing student {student['Student_ID']}: {e}")
+                metrics.inc('processing_errors_total', stage='students')
                 continue
         
         return jsonify({
             'data': students_list,
             'total': len(students_list),
+            'matched': matched,
+            'offset': offset,
+            'timestamp': datetime.now().isoformat()
+        })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+metrics.describe('export_rows_total', 'counter', 'Student rows streamed by /api/students/export')
+
+# Same fields as the listing, one row per student
+EXPORT_COLUMNS = [
+    'Student_ID', 'Name', 'Roll_No', 'Department', 'Semester', 'Mentor_ID',
+    'Attendance_Percentage', 'Avg_Test_Score', 'Fee_Status', 'Fee_Due_Days',
+    'Subjects_Failed', 'Total_Risk_Flags', 'dropout_risk', 'risk_level', 'confidence'
+]
+EXPORT_MIMETYPES = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
+EXPORT_CHUNK_ROWS = 5000
+
+def export_chunk(predictor, frame, risk, ids, top_n):
+    """One chunk of export rows joined from the roster and the cached risk table"""
+    return export_rows(predictor, frame.loc[ids].join(risk[['risk_score', 'risk_level', 'confidence']]).reset_index(), top_n)
+
+def export_rows(predictor, joined, top_n):
+    """Listing fields, plus the top_n recommendations, of student rows joined with their predictions"""
+    chunk = joined.rename(columns={'risk_score': 'dropout_risk'}).reindex(columns=EXPORT_COLUMNS)
+    if top_n:
+        recommendations = []
+        for student in chunk.to_dict('records'):
+            prediction = {'risk_score': student['dropout_risk'], 'risk_level': student['risk_level'],
+                          'confidence': student['confidence']}
+            recommendations.append(predictor.generate_recommendations(student, prediction)[:top_n])
+        chunk['top_recommendations'] = recommendations
+    return chunk
+
+@app.route('/api/students/export', methods=['GET'])
+def export_students():
+    """Stream the filtered, scored roster as CSV or NDJSON, a chunk of rows at a time"""
+    try:
+        if not ML_AVAILABLE:
+            return jsonify({'error': 'ML pipeline not available'}), 500
+        
+        export_format = request.args.get('format', 'csv')
+        if export_format not in EXPORT_MIMETYPES:
+            return jsonify({'error': f"format must be one of: {', '.join(EXPORT_MIMETYPES)}"}), 400
+        top_n = min(max(request.args.get('recommendations', 0, type=int), 0), 10)
+        
+        # The roster and predictions as of now: upserts during the download swap in new
+        # frames, so every chunk comes from the same version of the data
+        predictor, store = g.tenant.predictor, g.tenant.store
+        ids, frame, risk = store.snapshot(listing_filters())
+        
+        def generate():
+            if not len(ids):
+                if export_format == 'csv':
+                    yield pd.DataFrame(columns=EXPORT_COLUMNS).to_csv(index=False)
+                return
+            for start in range(0, len(ids), EXPORT_CHUNK_ROWS):
+                chunk = export_chunk(predictor, frame, risk, ids[start:start + EXPORT_CHUNK_ROWS], top_n)
+                if export_format == 'csv':
+                    if top_n:
+                        chunk['top_recommendations'] = ['; '.join(f"[{r['priority']}] {r['action']}" for r in recs)
+                                                        for recs in chunk['top_recommendations']]
+                    yield chunk.to_csv(index=False, header=start == 0)
+                else:
+                    yield chunk.to_json(orient='records', lines=True)
+                metrics.inc('export_rows_total', len(chunk), format=export_format)
+        
+        response = Response(stream_with_context(generate()), mimetype=EXPORT_MIMETYPES[export_format])
+        response.headers['Content-Disposition'] = f'attachment; filename="students.{export_format}"'
+        return response
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+metrics.describe('sync_rows_total', 'counter', 'Rows sent by /api/students/sync, by kind: changed or removed')
+
+@app.route('/api/students/sync', methods=['GET'])
+@conditional_get
+def sync_students():
+    """Students inserted, updated or removed since the client's version, so a refresh only moves the changes"""
+    try:
+        if not ML_AVAILABLE:
+            return jsonify({'error': 'ML pipeline not available'}), 500
+        
+        since = request.args.get('since', 0, type=int)
+        top_n = min(max(request.args.get('recommendations', 0, type=int), 0), 10)
+        
+        # A client from another epoch (restart, tenant reload) or too far behind gets everything
+        predictor, store = g.tenant.predictor, g.tenant.store
+        version, full, rows, removed = store.changes_since(since, request.args.get('epoch'))
+        rows = export_rows(predictor, rows, top_n)
+        metrics.inc('sync_rows_total', len(rows), kind='changed')
+        metrics.inc('sync_rows_total', len(removed), kind='removed')
+        
+        return jsonify({
+            'epoch': store.epoch,
+            'since': since,
+            'version': version,
+            'full': full,
+            'changed': rows.astype(object).where(rows.notna(), None).to_dict('records'),
+            'removed': removed,
+            'timestamp': datetime.now().isoformat()
+        })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/students/search', methods=['GET'])
+@conditional_get
+def search_students():
+    """Type-ahead search by name or roll-number prefix, or exact Student_ID"""
+    try:
+        if not ML_AVAILABLE:
+            return jsonify({'error': 'ML pipeline not available'}), 500
+        
+        query = request.args.get('q', '')
+        limit = min(max(request.args.get('limit', search_index.DEFAULT_LIMIT, type=int), 1), search_index.MAX_LIMIT)
+        store = g.tenant.store
+        # Built on the first search after each data change, then shared by every request
+        index = store.memoized('search_index', lambda: search_index.SearchIndex(store.frame, store.risk))
+        results = index.search(query, limit)
+        
+        return jsonify({
+            'query': query,
+            'results': results,
+            'count': len(results),
             'timestamp': datetime.now().isoformat()
         })
     
@@ -125,27 +506,26 @@ def get_all_students():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/student/<student_id>/predict', methods=['GET'])
+@conditional_get
 def predict_student(student_id):
     """Get detailed prediction for specific student"""
     try:
         if not ML_AVAILABLE:
             return jsonify({'error': 'ML pipeline not available'}), 500
         
-        # Load student data
-        data_path = "../ml/final_clean_students_14k.csv"
-        students_df = pd.read_csv(data_path)
-        
         # Find specific student
-        student_row = students_df[students_df['Student_ID'] == student_id]
-        if student_row.empty:
+        predictor, store = g.tenant.predictor, g.tenant.store
+        if student_id not in store.frame.index:
             return jsonify({'error': 'Student not found'}), 404
         
-        student = student_row.iloc[0]
+        student = store.students([student_id]).iloc[0]
         
         # Generate prediction
-        prediction = predictor.predict_dropout_risk(student)
-        recommendations = predictor.generate_recommendations(student, prediction)
-        explanation = predictor.explain_prediction(student, prediction)
+        with metrics.time('prediction'):
+            prediction = g.tenant.batcher.predict(student)
+        with metrics.time('recommendations'):
+            recommendations = predictor.generate_recommendations(student, prediction)
+        explanation = predictor.explain_prediction(student, prediction, store.contributions(student_id))
         
         return jsonify({
             'student_id': student_id,
@@ -167,6 +547,7 @@ def predict_student(student_id):
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/priority-students', methods=['GET'])
+@conditional_get
 def get_priority_students():
     """Get priority students needing immediate attention"""
     try:
@@ -174,11 +555,10 @@ def get_priority_students():
             return jsonify({'error': 'ML pipeline not available'}), 500
         
         # Load student data
-        data_path = "../ml/final_clean_students_14k.csv"
-        students_df = pd.read_csv(data_path)
+        students_df = g.tenant.store.students()
         
         # Get priority students
-        priority_students = ews.get_priority_students(students_df, top_n=20)
+        priority_students = g.tenant.ews.get_priority_students(students_df, top_n=20)
         
         return jsonify({
             'priority_students': priority_students.to_dict('records'),
@@ -190,6 +570,7 @@ def get_priority_students():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/analytics/dashboard', methods=['GET'])
+@conditional_get
 def get_dashboard_analytics():
     """Get analytics data for dashboard"""
     try:
@@ -197,8 +578,8 @@ def get_dashboard_analytics():
             return jsonify({'error': 'ML pipeline not available'}), 500
         
         # Load student data
-        data_path = "../ml/final_clean_students_14k.csv"
-        students_df = pd.read_csv(data_path)
+        store = g.tenant.store
+        students_df = store.students()
         
         # Calculate analytics
         total_students = len(students_df)
@@ -228,6 +609,9 @@ def get_dashboard_analytics():
         # Fee status
         fee_stats = students_df['Fee_Status'].value_counts().to_dict()
         
+        # Model predictions, maintained incrementally by the dataset store
+        predicted_risk_distribution = store.summary()['risk_distribution']
+        
         return jsonify({
             'total_students': total_students,
             'department_distribution': dept_distribution,
@@ -235,46 +619,92 @@ def get_dashboard_analytics():
             'attendance_stats': attendance_stats,
             'academic_stats': academic_stats,
             'fee_stats': fee_stats,
+            'predicted_risk_distribution': predicted_risk_distribution,
             'timestamp': datetime.now().isoformat()
         })
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/analytics/distributions', methods=['GET'])
+@conditional_get
+def get_distributions():
+    """Histograms and quantiles for charts, optionally per department, semester or mentor"""
+    try:
+        if not ML_AVAILABLE:
+            return jsonify({'error': 'ML pipeline not available'}), 500
+        
+        by = request.args.get('by')
+        if by is not None and by not in GROUP_COLUMNS:
+            return jsonify({'error': f"by must be one of: {', '.join(GROUP_COLUMNS)}"}), 400
+        bins = min(max(request.args.get('bins', DEFAULT_BINS, type=int), 1), MAX_BINS)
+        requested = request.args.get('metrics')
+        metric_names = requested.split(',') if requested else list(DISTRIBUTION_METRICS)
+        unknown = [name for name in metric_names if name not in DISTRIBUTION_METRICS]
+        if unknown:
+            return jsonify({'error': f"Unknown metrics: {', '.join(unknown)}"}), 400
+        
+        store = g.tenant.store
+        
+        def compute():
+            frame = store.frame
+            if 'risk_probability' in metric_names:
+                frame = frame.join(store.risk_probabilities())
+            return build_distributions(frame, metric_names, by, bins)
+        
+        # Binned once per data version; repeated chart loads reuse the result
+        with metrics.time('distributions'):
+            distributions = store.memoized(('distributions', by, bins, tuple(metric_names)), compute)
+        
+        return jsonify(dict(distributions, timestamp=datetime.now().isoformat()))
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/upload-data', methods=['POST'])
 def upload_student_data():
     """Process uploaded CSV data"""
     try:
-        if not request.json:
+        with metrics.time('request_parsing'):
+            payload = request.get_json(silent=True)
+        if not payload:
             return jsonify({'error': 'No data provided'}), 400
         
-        students_data = request.json.get('data', [])
+        students_data = payload.get('data', [])
         if not students_data:
             return jsonify({'error': 'Empty data array'}), 400
         
-        # Process each student if ML is available
+        # ?mode=upsert merges the batch into the dataset store by Student_ID
+        mode = request.args.get('mode') or payload.get('mode', 'full')
+        if mode == 'upsert':
+            return upsert_student_data(students_data)
+        
+        # Validate the whole batch at once; only valid rows are scored
         if ML_AVAILABLE:
-            processed_students = []
-            for student in students_data:
-                try:
-                    # Convert to DataFrame row for prediction
-                    student_df = pd.DataFrame([student])
-                    prediction = predictor.predict_dropout_risk(student_df.iloc[0])
-                    
-                    # Add ML predictions to student data
-                    student['dropout_risk'] = prediction['risk_score']
-                    student['risk_level'] = prediction['risk_level']
-                    student['confidence'] = prediction['confidence']
-                    
-                    processed_students.append(student)
-                except Exception as e:
-                    print(f"Error processing student: {e}")
-                    processed_students.append(student)
+            tenant = g.tenant
+            with metrics.time('validation'):
+                validation = validate_students(pd.DataFrame(students_data), tenant.predictor)
+            if validation.missing_columns:
+                return jsonify({'error': f"Missing columns: {', '.join(validation.missing_columns)}"}), 400
             
+            processed = validation.valid
+            tenant.store.observe_batch(processed)
+            if len(processed):
+                with metrics.time('prediction'):
+                    predictions = tenant.predictor.predict_batch(processed)
+                processed = processed.assign(
+                    dropout_risk=predictions['risk_score'].to_numpy(),
+                    risk_level=predictions['risk_level'].to_numpy(),
+                    confidence=predictions['confidence'].to_numpy()
+                )
+            
+            # Full mode only scores the batch; the roster (and its risk events) change through upsert
             return jsonify({
                 'message': 'Data processed successfully',
-                'processed_count': len(processed_students),
-                'data': processed_students
+                'processed_count': len(processed),
+                'validation': validation.report(),
+                # Keys absent from some records come back as null, not NaN
+                'data': processed.astype(object).where(processed.notna(), None).to_dict('records')
             })
         else:
             return jsonify({
@@ -286,6 +716,189 @@ def upload_student_data():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+metrics.describe('bulk_predict_rows_total', 'counter', 'Rows scored by /api/predict/bulk')
+
+@app.route('/api/predict/bulk', methods=['POST'])
+def predict_bulk():
+    """Score columnar input (JSON arrays, .npz or Arrow) in one batch and answer in columns"""
+    try:
+        if not ML_AVAILABLE:
+            return jsonify({'error': 'ML pipeline not available'}), 500
+        
+        # Also caps bodies sent without a Content-Length (per-request limits need Flask 3.1)
+        request.max_content_length = int(BULK_PREDICT_MAX_MB * 2**20)
+        with metrics.time('request_parsing'):
+            columns = bulk_predict.read_columns(request.get_data(), request.content_type)
+        n_rows = len(next(iter(columns.values())))
+        if n_rows > BULK_PREDICT_MAX_ROWS:
+            return jsonify({'error': f"{n_rows} rows exceeds the limit of {BULK_PREDICT_MAX_ROWS} per request"}), 413
+        
+        # Arrays go into the frame as they are; no per-student records are built
+        predictor = g.tenant.predictor
+        with metrics.time('validation'):
+            validation = validate_students(bulk_predict.columns_frame(columns), predictor)
+        if validation.missing_columns:
+            return jsonify({'error': f"Missing columns: {', '.join(validation.missing_columns)}"}), 400
+        
+        predictions = pd.DataFrame(columns=bulk_predict.OUTPUT_COLUMNS)
+        if len(validation.valid):
+            with metrics.time('prediction'):
+                predictions = predictor.predict_batch(validation.valid)
+        metrics.inc('bulk_predict_rows_total', len(predictions))
+        g.tenant.store.observe_batch(validation.valid)
+        
+        output = bulk_predict.prediction_columns(predictions, n_rows)
+        if 'Student_ID' in columns:
+            output = {'Student_ID': columns['Student_ID'], **output}
+        
+        accepted = request.accept_mimetypes.best_match([bulk_predict.JSON_MIMETYPE, bulk_predict.NPZ_MIMETYPE])
+        if accepted == bulk_predict.NPZ_MIMETYPE:
+            response = Response(bulk_predict.write_npz(output), mimetype=bulk_predict.NPZ_MIMETYPE)
+            response.headers['X-Rejected-Count'] = str(validation.rejected_count)
+            return response
+        return jsonify({
+            'count': n_rows,
+            'scored_count': len(predictions),
+            'columns': bulk_predict.json_columns(output),
+            'validation': validation.report(),
+            'timestamp': datetime.now().isoformat()
+        })
+    
+    except bulk_predict.PayloadError as e:
+        return jsonify({'error': str(e)}), 400
+    except RequestEntityTooLarge:
+        return jsonify({'error': f"Request body exceeds the limit of {BULK_PREDICT_MAX_MB:g} MB"}), 413
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/simulate', methods=['POST'])
+def simulate_interventions():
+    """What-if: each student's and the cohort's risk change if interventions were applied"""
+    try:
+        if not ML_AVAILABLE:
+            return jsonify({'error': 'ML pipeline not available'}), 500
+        
+        payload = request.get_json(silent=True) or {}
+        tenant = g.tenant
+        predictor, store = tenant.predictor, tenant.store
+        interventions = simulation.parse_interventions(payload.get('interventions'), predictor)
+        limit = simulation.parse_limit(payload.get('limit'))
+        student_ids = simulation.parse_student_ids(payload.get('student_ids'))
+        
+        # Explicit students, or everyone matching the listing filters in the query string
+        unknown_ids = []
+        if student_ids is not None:
+            requested = pd.Index(student_ids).drop_duplicates()
+            known = requested.isin(store.frame.index)
+            ids, unknown_ids = requested[known], requested[~known].tolist()
+        else:
+            ids = store.matching_ids(listing_filters())
+        if len(ids) * (len(interventions) + 1) > simulation.MAX_SIMULATED_ROWS:
+            return jsonify({'error': f"{len(ids)} students x {len(interventions)} interventions is too many: "
+                                     f"narrow the filters (limit {simulation.MAX_SIMULATED_ROWS} simulated rows)"}), 413
+        
+        students = store.frame.loc[ids]
+        with metrics.time('prediction'):
+            baseline, outcomes = simulation.simulate(predictor, students, interventions)
+        labels = predictor.RISK_LABELS
+        
+        return jsonify({
+            'students': len(ids),
+            'unknown_ids': unknown_ids,
+            'interventions': {name: simulation.summarize(baseline, outcome, labels) for name, outcome in outcomes.items()},
+            'results': simulation.student_results(ids.tolist(), students['Name'].tolist(), baseline, outcomes, labels, limit),
+            'truncated': len(ids) > limit,
+            'timestamp': datetime.now().isoformat()
+        })
+    
+    except simulation.SimulationError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/model/reload', methods=['POST'])
+def reload_model():
+    """Reload the saved model and publish the risk changes it causes"""
+    try:
+        if not ML_AVAILABLE:
+            return jsonify({'error': 'ML pipeline not available'}), 500
+        
+        tenant = g.tenant
+        store = tenant.store
+        # Loaded into a new predictor: the batcher and in-flight requests keep a whole model
+        # (model, scaler and feature columns together) until the swap
+        predictor = DropoutPredictor()
+        predictor.load_model(tenant.model_path)
+        model_version = store.storage.register_model_version(tenant.model_path, predictor) if store.storage else None
+        old_risk = tenant.use_predictor(predictor, model_version)
+        risk_events = publish_risk_changes(tenant, old_risk, store.risk.index, 'model_reload')
+        
+        return jsonify({
+            'message': 'Model reloaded successfully',
+            'risk_events': risk_events,
+            'timestamp': datetime.now().isoformat()
+        })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/model/drift', methods=['GET'])
+def model_drift():
+    """PSI / KS drift of the roster or of recent uploads against the model's training data"""
+    try:
+        if not ML_AVAILABLE:
+            return jsonify({'error': 'ML pipeline not available'}), 500
+        
+        window = request.args.get('window', 'roster')
+        if window not in drift.WINDOWS:
+            return jsonify({'error': f"window must be one of: {', '.join(drift.WINDOWS)}"}), 400
+        
+        tenant = g.tenant
+        profile = tenant.predictor.training_profile
+        if profile is None:
+            return jsonify({'error': 'The loaded model has no training profile - retrain it to enable drift checks'}), 404
+        counts, rows = tenant.store.drift_counts(window)
+        if not rows:
+            return jsonify({'error': f"No rows in the {window} window yet"}), 404
+        
+        report = drift.drift_report(profile, counts, rows, tenant=tenant.tenant_id, window=window)
+        return jsonify(dict(report, window=window, timestamp=datetime.now().isoformat()))
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Request and stage metrics in Prometheus text format"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/notifications/stream', methods=['GET'])
+def stream_risk_events():
+    """Server-sent event stream of risk transitions, grouped by mentor"""
+    if not ML_AVAILABLE:
+        return jsonify({'error': 'ML pipeline not available'}), 500
+    event_log = g.tenant.event_log
+    # EventSource sends Last-Event-ID on reconnect; the query param covers first connects
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    cursor = int(last_event_id) if last_event_id and last_event_id.isdigit() else event_log.last_id
+    mentor_id = request.args.get('mentor_id')
+    
+    def generate(cursor):
+        yield "retry: 5000\n\n"
+        while True:
+            for event in event_log.since(cursor):
+                cursor = event['id']
+                if not mentor_id or event.get('mentor_id') in (None, mentor_id):
+                    yield format_sse(event)
+            # Evicted tenant: end the stream; EventSource reconnects to the reloaded tenant
+            if event_log.closed:
+                return
+            if not event_log.wait(cursor, timeout=15):
+                yield ": keep-alive\n\n"
+    
+    return Response(stream_with_context(generate(cursor)), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 # ================================================================
 # Main Application
 # ================================================================
@@ -298,4 +911,7 @@ if __name__ == '__main__':
     print(f"📡 Server: Starting on http://localhost:5000")
     print("=" * 60)
     
+    # With the debug reloader only the child process serves, so only it loads the model
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        init_ml()
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -0,0 +1,238 @@
+# ================================================================
+# ASGI Serving Mode
+# Runs the Flask app behind an event loop with a bounded worker pool
+# ================================================================
+#
+#   uvicorn asgi:application --host 0.0.0.0 --port 5000
+#
+# Connections, request bodies and streamed responses are handled on the
+# event loop; each Flask request (scoring, aggregation, CSV parsing) runs
+# in a fixed-size thread pool. Requests beyond the pool plus a short queue
+# are rejected with 429 instead of piling up. Server-sent event streams,
+# which idle between events, get their own pool and limit.
+
+import asyncio
+import contextvars
+import io
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from app import app as flask_app, init_ml
+
+ASGI_MAX_WORKERS = int(os.environ.get('ASGI_MAX_WORKERS', min(32, (os.cpu_count() or 1) + 4)))
+ASGI_MAX_QUEUE = int(os.environ.get('ASGI_MAX_QUEUE', ASGI_MAX_WORKERS * 2))
+# Open SSE connections; each holds one stream thread while it waits for events
+ASGI_MAX_STREAMS = int(os.environ.get('ASGI_MAX_STREAMS', 100))
+
+# Cheap endpoints answered directly on the event loop so they never queue behind scoring
+INLINE_PATHS = {'/api/health'}
+
+_STREAM_END = object()
+
+
+def build_environ(scope, body):
+    """PEP 3333 environ for one ASGI HTTP scope"""
+    server_name, server_port = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf8').decode('latin1'),
+        'PATH_INFO': scope['path'].encode('utf8').decode('latin1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin1'),
+        'SERVER_NAME': server_name,
+        'SERVER_PORT': str(server_port),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'REMOTE_PORT': str(client[1]),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    for raw_name, raw_value in scope.get('headers', []):
+        name = raw_name.decode('latin1').upper().replace('-', '_')
+        value = raw_value.decode('latin1')
+        if name == 'CONTENT_TYPE' or name == 'CONTENT_LENGTH':
+            environ[name] = value
+            continue
+        key = f'HTTP_{name}'
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+def is_event_stream(headers):
+    return any(name == b'content-type' and value.startswith(b'text/event-stream') for name, value in headers)
+
+
+def close_stream(stream):
+    iterable, _ = stream
+    if hasattr(iterable, 'close'):
+        iterable.close()
+
+
+def call_wsgi(wsgi_app, environ):
+    """Run the WSGI app; returns (status, headers, body chunks, stream) where stream is set for unsized bodies"""
+    response = {}
+    written = []
+
+    def start_response(status, headers, exc_info=None):
+        if exc_info and response:
+            raise exc_info[1].with_traceback(exc_info[2])
+        response['status'] = int(status.split(' ', 1)[0])
+        response['headers'] = [(name.lower().encode('latin1'), value.encode('latin1')) for name, value in headers]
+        return written.append
+
+    iterable = wsgi_app(environ, start_response)
+    iterator = iter(iterable)
+    # Generators only call start_response once iteration begins
+    first = next(iterator, _STREAM_END)
+    chunks = written + ([] if first is _STREAM_END else [first])
+    sized = any(name == b'content-length' for name, _ in response['headers'])
+    if first is not _STREAM_END and not sized:
+        # No length: an open-ended stream (SSE) that is pulled chunk by chunk later
+        return response['status'], response['headers'], chunks, (iterable, iterator)
+
+    try:
+        chunks.extend(iterator)
+    finally:
+        if hasattr(iterable, 'close'):
+            iterable.close()
+    return response['status'], response['headers'], chunks, None
+
+
+class AsgiBridge:
+    """ASGI 3 application wrapping a WSGI app with a concurrency limit and 429 backpressure"""
+
+    def __init__(self, wsgi_app, max_workers=ASGI_MAX_WORKERS, max_queue=ASGI_MAX_QUEUE, max_streams=ASGI_MAX_STREAMS):
+        self.wsgi_app = wsgi_app
+        self.max_workers = max_workers
+        self.max_pending = max_workers + max_queue
+        self.pending = 0
+        self.max_streams = max_streams
+        self.open_streams = 0
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='asgi-worker')
+        # Event streams block for seconds between events, so they are iterated in a pool of
+        # their own, sized to the stream limit: they can neither starve nor be starved by requests
+        self.stream_executor = ThreadPoolExecutor(max_workers=max_streams, thread_name_prefix='asgi-stream')
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self.handle_http(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                # Load the model before accepting traffic, off the event loop
+                await asyncio.get_running_loop().run_in_executor(self.executor, init_ml)
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.executor.shutdown(wait=False, cancel_futures=True)
+                self.stream_executor.shutdown(wait=False, cancel_futures=True)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def read_body(self, receive):
+        chunks = []
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return None
+            chunks.append(message.get('body', b''))
+            if not message.get('more_body'):
+                return b''.join(chunks)
+
+    async def handle_http(self, scope, receive, send):
+        body = await self.read_body(receive)
+        if body is None:
+            return
+        environ = build_environ(scope, body)
+
+        if scope['path'] in INLINE_PATHS:
+            context = contextvars.Context()
+            await self.send_response(send, receive, *context.run(call_wsgi, self.wsgi_app, environ), context)
+            return
+
+        if self.pending >= self.max_pending:
+            await self.send_busy(send)
+            return
+
+        # Flask keeps request state in context variables; a streamed response must
+        # resume in the same context even though each step may run on another thread
+        context = contextvars.Context()
+        loop = asyncio.get_running_loop()
+        self.pending += 1
+        try:
+            status, headers, chunks, stream = await loop.run_in_executor(
+                self.executor, context.run, call_wsgi, self.wsgi_app, environ)
+            if stream is None or not is_event_stream(headers):
+                # Downloads (e.g. CSV export) keep their request slot until the last chunk
+                await self.send_response(send, receive, status, headers, chunks, stream, context, self.executor)
+                return
+        finally:
+            self.pending -= 1
+
+        if self.open_streams >= self.max_streams:
+            await loop.run_in_executor(self.executor, context.run, close_stream, stream)
+            await self.send_busy(send)
+            return
+        self.open_streams += 1
+        try:
+            await self.send_response(send, receive, status, headers, chunks, stream, context, self.stream_executor)
+        finally:
+            self.open_streams -= 1
+
+    async def send_busy(self, send):
+        body = json.dumps({'error': 'Server busy, retry shortly'}).encode()
+        await send({'type': 'http.response.start', 'status': 429, 'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode()),
+            (b'retry-after', b'1'),
+        ]})
+        await send({'type': 'http.response.body', 'body': body})
+
+    async def send_response(self, send, receive, status, headers, chunks, stream, context, executor=None):
+        """Send a response; a streamed body is pulled chunk by chunk on executor"""
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        if stream is None:
+            await send({'type': 'http.response.body', 'body': b''.join(chunks)})
+            return
+
+        iterable, iterator = stream
+        loop = asyncio.get_running_loop()
+        disconnected = asyncio.ensure_future(self.wait_disconnect(receive))
+        try:
+            for chunk in chunks:
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            while not disconnected.done():
+                chunk = await loop.run_in_executor(executor, context.run, next, iterator, _STREAM_END)
+                if chunk is _STREAM_END:
+                    break
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            await send({'type': 'http.response.body', 'body': b''})
+        finally:
+            disconnected.cancel()
+            if hasattr(iterable, 'close'):
+                await loop.run_in_executor(executor, context.run, iterable.close)
+
+    async def wait_disconnect(self, receive):
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+
+
+application = AsgiBridge(flask_app)
+
+
+if __name__ == "__main__":
+    try:
+        import uvicorn
+    except ImportError:
+        sys.exit("❌ uvicorn is not installed - run `pip install uvicorn` to use the ASGI server")
+    uvicorn.run(application, host='0.0.0.0', port=int(os.environ.get('PORT', 5000)))
@@ -0,0 +1,130 @@
+# ================================================================
+# Micro-Batching Prediction Dispatcher
+# Coalesces concurrent single-student predictions into one model call
+# ================================================================
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import pandas as pd
+
+from metrics import metrics
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+_STOP = object()
+
+metrics.describe('prediction_batch_size', 'histogram', 'Students scored per micro-batch', BATCH_SIZE_BUCKETS)
+metrics.describe('prediction_queue_delay_seconds', 'histogram', 'Time a prediction waited before its batch ran')
+
+
+def prediction_dict(row):
+    """One predict_batch row in the predict_dropout_risk response shape"""
+    return {
+        'risk_level': row['risk_level'],
+        'risk_score': int(row['risk_score']),
+        'confidence': float(row['confidence']),
+        'probabilities': {
+            'low_risk': float(row['prob_low_risk']),
+            'medium_risk': float(row['prob_medium_risk']),
+            'high_risk': float(row['prob_high_risk'])
+        }
+    }
+
+
+class MicroBatcher:
+    """Collects predictions for up to max_wait_ms or max_batch_size items, then scores them together"""
+
+    def __init__(self, predictor, max_batch_size=64, max_wait_ms=2.0):
+        self.predictor = predictor
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000
+        self.required_columns = list(predictor.NUMERIC_FEATURES) + ['Department', 'Fee_Status']
+        self._queue = queue.Queue()
+        self._thread = None
+        self._closed = False
+        self._start_lock = threading.Lock()
+
+    def submit(self, student):
+        """Queue one student (dict or Series of raw columns); returns a Future of its prediction dict"""
+        future = Future()
+        student = dict(student)
+        # Missing columns would silently become NaN once rows are stacked into one frame
+        missing = [column for column in self.required_columns if column not in student]
+        if missing:
+            future.set_exception(KeyError(f"Missing feature columns: {', '.join(missing)}"))
+            return future
+        with self._start_lock:
+            if not self._closed:
+                self._ensure_worker()
+                self._queue.put((student, future, time.perf_counter()))
+                return future
+        # Closed (e.g. evicted tenant): finish stragglers inline instead of restarting the thread
+        try:
+            future.set_result(prediction_dict(self.predictor.predict_batch(pd.DataFrame([student])).iloc[0]))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def predict(self, student):
+        """Blocking single prediction through the batcher"""
+        return self.submit(student).result()
+
+    def close(self):
+        """Stop the dispatcher thread once queued predictions are done"""
+        with self._start_lock:
+            self._closed = True
+            if self._thread is not None:
+                self._queue.put((_STOP, None, None))
+
+    def _ensure_worker(self):
+        """Start the dispatcher thread on first use (caller holds _start_lock)"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='prediction-batcher', daemon=True)
+            self._thread.start()
+
+    def _collect(self):
+        """Block for the first item, then keep taking items until the batch is full or the wait expires"""
+        batch = [self._queue.get()]
+        if batch[0][0] is _STOP:
+            return None
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item[0] is _STOP:
+                self._queue.put(item)  # finish this batch, stop on the next collect
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            started = time.perf_counter()
+            for _, _, queued_at in batch:
+                metrics.observe('prediction_queue_delay_seconds', started - queued_at)
+            metrics.observe('prediction_batch_size', len(batch))
+            # One model per batch, even if a reload swaps it meanwhile
+            predictor = self.predictor
+
+            try:
+                with metrics.time('prediction_batch'):
+                    results = predictor.predict_batch(pd.DataFrame([student for student, _, _ in batch]))
+                for (_, future, _), row in zip(batch, results.to_dict('records')):
+                    future.set_result(prediction_dict(row))
+            except Exception:
+                # One malformed row must not fail its neighbours: retry each on its own
+                for student, future, _ in batch:
+                    if future.done():
+                        continue
+                    try:
+                        future.set_result(prediction_dict(predictor.predict_batch(pd.DataFrame([student])).iloc[0]))
+                    except Exception as e:
+                        future.set_exception(e)
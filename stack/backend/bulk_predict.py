@@ -0,0 +1,121 @@
+# ================================================================
+# Bulk Prediction
+# Columnar request and response payloads for scoring many students at once
+# ================================================================
+
+import io
+import json
+
+import numpy as np
+import pandas as pd
+
+JSON_MIMETYPE = 'application/json'
+NPZ_MIMETYPE = 'application/x-npz'
+ARROW_MIMETYPE = 'application/vnd.apache.arrow.stream'
+
+# Prediction columns returned for every input row, null (NaN / '') where a row was rejected
+OUTPUT_COLUMNS = ['risk_score', 'risk_level', 'confidence', 'prob_low_risk', 'prob_medium_risk', 'prob_high_risk']
+INTEGER_COLUMNS = {'risk_score'}
+
+
+class PayloadError(ValueError):
+    """A request body that cannot be read as a set of equal-length columns"""
+
+
+def read_columns(body, content_type):
+    """{column: array} from a columnar JSON, .npz or Arrow IPC stream body"""
+    mimetype = (content_type or JSON_MIMETYPE).split(';')[0].strip().lower()
+    if mimetype == NPZ_MIMETYPE:
+        try:
+            with np.load(io.BytesIO(body), allow_pickle=False) as archive:
+                columns = {name: archive[name] for name in archive.files}
+        except (OSError, ValueError) as e:
+            raise PayloadError(f"Unreadable .npz payload: {e}")
+    elif mimetype == ARROW_MIMETYPE:
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise PayloadError("Arrow payloads need pyarrow installed - send .npz or JSON instead")
+        try:
+            table = pa.ipc.open_stream(body).read_all()
+        except pa.ArrowInvalid as e:
+            raise PayloadError(f"Unreadable Arrow payload: {e}")
+        columns = {name: table.column(name).to_numpy(zero_copy_only=False) for name in table.column_names}
+    elif mimetype == JSON_MIMETYPE:
+        try:
+            payload = json.loads(body)
+        except ValueError as e:
+            raise PayloadError(f"Invalid JSON: {e}")
+        columns = payload.get('columns') if isinstance(payload, dict) else None
+        if not isinstance(columns, dict) or not all(isinstance(v, list) for v in columns.values()):
+            raise PayloadError('Expected {"columns": {"<column>": [values...], ...}}')
+        columns = {name: json_array(values) for name, values in columns.items()}
+    else:
+        raise PayloadError(f"Unsupported Content-Type {mimetype}: use {JSON_MIMETYPE}, {NPZ_MIMETYPE} or {ARROW_MIMETYPE}")
+
+    if not columns:
+        raise PayloadError('No columns provided')
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        raise PayloadError(f"Columns have different lengths: {sorted(lengths)}")
+    return columns
+
+
+def json_array(values):
+    """Numbers (null as NaN) as one float array; anything else, e.g. IDs and categories, as objects"""
+    try:
+        return np.array(values, dtype=float)
+    except (TypeError, ValueError):
+        return np.array(values, dtype=object)
+
+
+def columns_frame(columns):
+    """A DataFrame over the column arrays; text columns keep object dtype instead of being converted"""
+    return pd.DataFrame({
+        name: pd.Series(values, dtype=object) if values.dtype.kind in 'OUS' else values
+        for name, values in columns.items()
+    }, copy=False)
+
+
+def prediction_columns(predictions, n_rows):
+    """Input-aligned output arrays; rows without a prediction are NaN, or '' for risk_level"""
+    positions = predictions.index.to_numpy()
+    output = {'valid': np.zeros(n_rows, dtype=bool)}
+    output['valid'][positions] = True
+    for name in OUTPUT_COLUMNS:
+        values = predictions[name].to_numpy()
+        if name == 'risk_level':
+            column = np.full(n_rows, '', dtype=values.astype(str).dtype)
+        else:
+            column = np.full(n_rows, np.nan)
+        column[positions] = values
+        output[name] = column
+    return output
+
+
+def write_npz(columns):
+    """Column arrays as an uncompressed .npz; object columns (echoed IDs) as strings, null as ''"""
+    arrays = {}
+    for name, values in columns.items():
+        if values.dtype.kind == 'O':
+            values = np.array(['' if pd.isna(v) else str(v) for v in values.tolist()])
+        arrays[name] = values
+    buffer = io.BytesIO()
+    np.savez(buffer, **arrays)
+    return buffer.getvalue()
+
+
+def json_columns(columns):
+    """Column arrays as JSON-ready lists, NaN and '' placeholders as null"""
+    result = {}
+    for name, values in columns.items():
+        if values.dtype.kind in 'fU':
+            missing = np.isnan(values) if values.dtype.kind == 'f' else values == ''
+            column = values.astype(object)
+            if name in INTEGER_COLUMNS:
+                column[~missing] = values[~missing].astype(int).tolist()
+            column[missing] = None
+            result[name] = column.tolist()
+        else:
+            result[name] = values.tolist()
+    return result
@@ -0,0 +1,438 @@
+# ================================================================
+# Dataset Store
+# In-memory system of record for student rows and their risk scores
+# ================================================================
+
+import threading
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_integer_dtype, is_numeric_dtype
+
+from metrics import metrics
+from risk_events import RISK_PROBABILITY, RISK_TABLE_COLUMNS, build_risk_table
+from storage import PREDICTION_COLUMNS
+
+CONTRIBUTION_PREFIX = 'contrib_'
+# Removed Student_IDs remembered for delta sync; older removals force a full resync
+MAX_TOMBSTONES = 100000
+
+
+class DatasetStore:
+    """Holds the roster keyed by Student_ID with cached predictions and aggregates"""
+
+    def __init__(self, predictor, storage=None, model_version=None):
+        self.predictor = predictor
+        self.storage = storage
+        self.model_version = model_version
+        self.frame = None          # student rows, indexed by Student_ID
+        self.feature_hashes = None # uint64 hash of each row's model inputs
+        self.risk = None           # risk table, indexed by Student_ID
+        self.aggregates = {}
+        self.version = 0
+        self.modified_at = time.time()
+        # Delta sync: versions are only comparable within one epoch (one process / store)
+        self.epoch = uuid.uuid4().hex[:12]
+        self.row_versions = pd.Series(dtype='int64')  # Student_ID -> version it last changed at
+        self.tombstones = pd.Series(dtype='int64')    # removed Student_ID -> version it was removed at
+        self.sync_floor = 0                           # oldest version a delta can still start from
+        # Upserted rows that exist only in memory (no storage backend): losing the store loses them
+        self.unsaved_changes = False
+        self.seconds_per_row = None  # measured on full-roster scoring, see _score()
+        self._memo = {}            # key -> (version, value), see memoized()
+        self._lock = threading.RLock()
+
+    @property
+    def feature_columns(self):
+        return self.predictor.NUMERIC_FEATURES + ['Department', 'Fee_Status']
+
+    def hash_features(self, students_df):
+        """Hash the model input columns so unchanged rows can be skipped"""
+        features = students_df[self.feature_columns].copy()
+        for col in self.predictor.NUMERIC_FEATURES:
+            features[col] = pd.to_numeric(features[col], errors='coerce').astype('float64')
+        for col in ['Department', 'Fee_Status']:
+            features[col] = features[col].astype(str)
+        return pd.util.hash_pandas_object(features, index=False)
+
+    def students(self, ids=None):
+        """Student rows with Student_ID back as a column, as the CSV had them"""
+        frame = self.frame if ids is None else self.frame.loc[ids]
+        return frame.reset_index()
+
+    def bootstrap(self, csv_path):
+        """Restore the roster from storage, importing the CSV only on first run"""
+        from param_ml_pipeline import compact_dtypes, intern_ids, load_student_frame
+        
+        students_df = self.storage.load_students() if self.storage else None
+        if students_df is None:
+            return self.load(load_student_frame(csv_path))
+        
+        students_df = intern_ids(compact_dtypes(students_df))
+        print(f"💾 Restored {len(students_df)} students from storage")
+        stored_risk = self.storage.load_predictions(self.model_version)
+        return self.load(students_df, risk=stored_risk, persist=False)
+
+    def load(self, students_df, risk=None, persist=True):
+        """Replace the whole dataset, scoring every row unless valid predictions are given"""
+        with self._lock:
+            frame = students_df.drop_duplicates('Student_ID', keep='last').set_index('Student_ID')
+            removed_ids = self.frame.index.difference(frame.index) if self.frame is not None else frame.index[:0]
+            self.frame = frame
+            self.feature_hashes = self.hash_features(frame).set_axis(frame.index)
+            if persist and self.storage:
+                self.storage.save_students(self.students())
+            
+            if risk is not None and frame.index.isin(risk.index).all():
+                self.risk = frame[['Name', 'Department', 'Mentor_ID']].join(risk[PREDICTION_COLUMNS])[RISK_TABLE_COLUMNS]
+            else:
+                self.risk = self._score(frame.index, measure=True)
+                self._save_predictions(self.risk)
+            self._rebuild_aggregates()
+            self._touch(frame.index, removed_ids)
+        return self
+
+    def rescore(self, predictor=None, model_version=None):
+        """Re-score every row after a model change, returning the previous risk table
+
+        A new predictor replaces the store's only if it scores the whole roster.
+        """
+        with self._lock:
+            old_risk = self.risk
+            previous = self.predictor, self.model_version
+            if predictor is not None:
+                self.predictor, self.model_version = predictor, model_version
+            try:
+                self.risk = self._score(self.frame.index, measure=True)
+            except Exception:
+                self.predictor, self.model_version = previous
+                raise
+            self._save_predictions(self.risk)
+            self._rebuild_aggregates()
+            # Only students whose prediction moved are sent to syncing clients again
+            self._touch(self._predictions_changed(old_risk, self.risk.index))
+        return old_risk
+
+    def _touch(self, changed_ids=None, removed_ids=None):
+        """Bump the data version and modification time that cache validators key on
+
+        changed_ids / removed_ids are stamped with the new version for delta sync.
+        """
+        self.version += 1
+        self.modified_at = time.time()
+        if changed_ids is not None and len(changed_ids):
+            self.row_versions = pd.concat([
+                self.row_versions.drop(changed_ids, errors='ignore'),
+                pd.Series(self.version, index=changed_ids, dtype='int64')
+            ])
+            self.tombstones = self.tombstones.drop(changed_ids, errors='ignore')
+        if removed_ids is not None and len(removed_ids):
+            self.row_versions = self.row_versions.drop(removed_ids, errors='ignore')
+            self.tombstones = pd.concat([
+                self.tombstones.drop(removed_ids, errors='ignore'),
+                pd.Series(self.version, index=removed_ids, dtype='int64')
+            ])
+            if len(self.tombstones) > MAX_TOMBSTONES:
+                # Forget the oldest removals; clients from before them must resync in full
+                self.tombstones = self.tombstones.sort_values(kind='stable')
+                self.sync_floor = int(self.tombstones.iloc[-MAX_TOMBSTONES - 1])
+                self.tombstones = self.tombstones.iloc[-MAX_TOMBSTONES:]
+
+    def _predictions_changed(self, old_risk, ids):
+        """ids whose cached predictions differ from (or are missing in) old_risk"""
+        if old_risk is None or not len(ids):
+            return ids
+        new = self.risk.loc[ids, PREDICTION_COLUMNS]
+        old = old_risk.reindex(ids)[PREDICTION_COLUMNS]
+        differs = (new.to_numpy() != old.to_numpy()).any(axis=1)
+        return ids[differs]
+
+    def changes_since(self, since, epoch=None):
+        """Rows inserted or updated and Student_IDs removed after version since
+
+        A client from another epoch, ahead of this store or older than the retained
+        tombstones gets a full snapshot instead (full=True, removed empty).
+        Returns (version, full, changed rows with predictions, removed Student_IDs).
+        """
+        with self._lock:
+            full = (since is None or since <= 0 or epoch != self.epoch
+                    or since > self.version or since < self.sync_floor)
+            if full:
+                ids = self.frame.index
+                removed = []
+            else:
+                ids = self.row_versions.index[(self.row_versions > since).to_numpy()]
+                removed = self.tombstones.index[(self.tombstones > since).to_numpy()].tolist()
+            ids = ids if ids.is_monotonic_increasing else ids.sort_values()
+            rows = self.frame.loc[ids].rename_axis(self.frame.index.name).join(self.risk[PREDICTION_COLUMNS])
+            return self.version, full, rows.reset_index(), removed
+
+    def upsert(self, students_df):
+        """Apply only inserted and changed rows, re-scoring just those rows"""
+        with self._lock:
+            incoming = students_df.drop_duplicates('Student_ID', keep='last').set_index('Student_ID')
+            incoming_hashes = self.hash_features(incoming).set_axis(incoming.index)
+
+            known = incoming.index.isin(self.frame.index)
+            inserted_ids = incoming.index[~known]
+            matched_ids = incoming.index[known]
+
+            # Model inputs changed -> re-score; other columns changed -> update in place only
+            features_changed = incoming_hashes[matched_ids] != self.feature_hashes[matched_ids]
+            details_changed = self._details_changed(incoming.loc[matched_ids])
+            updated_ids = matched_ids[(features_changed | details_changed).to_numpy()]
+            rescore_ids = inserted_ids.append(matched_ids[features_changed.to_numpy()])
+
+            old_risk = self.risk
+            changed_ids = inserted_ids.append(updated_ids)
+            frame, risk = self.frame, self.risk
+            columns = [c for c in incoming.columns if c in self.frame.columns]
+
+            # Build the new roster and risk table aside: if scoring fails the store is left as it
+            # was, and readers holding the old frame (a streaming export) never see it change
+            if len(changed_ids):
+                frame = self.frame.copy()
+                rows = self._conform(frame, incoming.loc[changed_ids, columns])
+                if len(updated_ids):
+                    frame.loc[updated_ids, columns] = rows.loc[updated_ids]
+                if len(inserted_ids):
+                    frame = pd.concat([frame, rows.loc[inserted_ids]])
+
+            # Re-score only the rows whose model inputs are new or different
+            start = time.perf_counter()
+            if len(rescore_ids):
+                risk = pd.concat([self.risk.drop(rescore_ids, errors='ignore'), self._score(rescore_ids, frame=frame)])
+            scoring_seconds = time.perf_counter() - start
+            if len(updated_ids):
+                # Name/mentor edits without feature changes still refresh the risk table labels
+                risk = risk.copy() if risk is self.risk else risk
+                risk.loc[updated_ids, ['Name', 'Department', 'Mentor_ID']] = \
+                    frame.loc[updated_ids, ['Name', 'Department', 'Mentor_ID']].to_numpy()
+
+            if self.storage and len(changed_ids):
+                self.storage.save_students(frame.loc[changed_ids].reset_index())
+                self._save_predictions(risk.loc[rescore_ids])
+            elif len(changed_ids):
+                self.unsaved_changes = True
+
+            # Everything scored: swap in the new rows, hashes and aggregates together
+            self._update_aggregates(updated_ids, -1)
+            self.frame, self.risk = frame, risk
+            self.feature_hashes = pd.concat([
+                self.feature_hashes.drop(rescore_ids, errors='ignore'), incoming_hashes[rescore_ids]
+            ])
+            self._update_aggregates(changed_ids, +1)
+            if len(changed_ids):
+                self._touch(changed_ids)
+
+            skipped = len(incoming) - len(rescore_ids)
+            return {
+                'inserted': len(inserted_ids),
+                'updated': len(updated_ids),
+                'unchanged': len(matched_ids) - len(updated_ids),
+                'rescored': len(rescore_ids),
+                'scoring_seconds': round(scoring_seconds, 4),
+                # Unknown (None) until the whole roster has been scored in this process
+                'time_saved_seconds': (round(skipped * self.seconds_per_row, 4)
+                                       if self.seconds_per_row is not None else None),
+                'changed_ids': changed_ids,
+                'old_risk': old_risk
+            }
+
+    def contributions(self, student_id):
+        """Per-feature model contributions for one student, filled in on first use when not cached"""
+        features = self.predictor.CONTRIBUTION_FEATURES
+        columns = [CONTRIBUTION_PREFIX + feature for feature in features]
+        with self._lock:
+            # Rows restored from storage or merged from uploads are not scored here yet
+            for column in columns:
+                if column not in self.risk.columns:
+                    self.risk[column] = np.float32(np.nan)
+            cached = self.risk.loc[student_id, columns]
+            if cached.isna().any():
+                computed = self.predictor.feature_contributions(self.students([student_id])).iloc[0]
+                self.risk.loc[student_id, columns] = computed.astype('float32').to_numpy()
+                return computed
+            return cached.astype(float).set_axis(features)
+
+    def risk_probabilities(self):
+        """P(medium or high risk) for every stored student, scoring rows that lack it"""
+        with self._lock:
+            if RISK_PROBABILITY not in self.risk.columns:
+                self.risk[RISK_PROBABILITY] = np.float32(np.nan)
+            # Uploads can merge risk rows for students the roster does not hold; those stay empty
+            missing = self.risk.index[self.risk[RISK_PROBABILITY].isna()].intersection(self.frame.index)
+            if len(missing):
+                predictions = self.predictor.predict_batch(self.students(missing))
+                self.risk.loc[missing, RISK_PROBABILITY] = (1 - predictions['prob_low_risk']).to_numpy(np.float32)
+            return self.risk[RISK_PROBABILITY]
+
+    def memoized(self, key, compute):
+        """compute() once per data version; results for older versions are dropped"""
+        with self._lock:
+            version, value = self._memo.get(key, (None, None))
+            if version != self.version:
+                value = compute()
+                self._memo = {k: v for k, v in self._memo.items() if v[0] == self.version}
+                self._memo[key] = (self.version, value)
+            return value
+
+    def query(self, filters, limit, offset):
+        """One filtered page of students with predictions, plus the total match count"""
+        if self.storage:
+            return self.storage.query_students(filters, limit, offset)
+        
+        matched = self.matching_ids(filters)
+        page = self.frame.loc[matched[offset:offset + limit]].join(self.risk[PREDICTION_COLUMNS])
+        return page.reset_index(), len(matched)
+
+    def snapshot(self, filters):
+        """(Student_IDs, roster, predictions) matching the listing filters, as of one moment
+
+        Upserts and reloads swap in new frames rather than writing into these,
+        so a reader can keep using them after the lock is released.
+        """
+        with self._lock:
+            return self.matching_ids(filters), self.frame, self.risk[['risk_score', 'risk_level', 'confidence']]
+
+    def matching_ids(self, filters):
+        """Student_IDs passing the listing filters, in Student_ID order"""
+        mask = np.ones(len(self.frame), dtype=bool)
+        for key, column in [('department', 'Department'), ('mentor_id', 'Mentor_ID'),
+                            ('semester', 'Semester'), ('risk_level', 'risk_score')]:
+            if filters.get(key) is not None:
+                values = self.risk[column].reindex(self.frame.index) if column == 'risk_score' else self.frame[column]
+                mask &= (values == filters[key]).to_numpy()
+        ids = self.frame.index[mask]
+        return ids if ids.is_monotonic_increasing else ids.sort_values()
+
+    def _save_predictions(self, risk):
+        if self.storage and len(risk):
+            self.storage.save_predictions(risk, self.model_version)
+
+    def _details_changed(self, incoming):
+        """Flag matched rows whose non-feature columns differ from the stored values"""
+        changed = pd.Series(False, index=incoming.index)
+        stored = self.frame.loc[incoming.index]
+        for col in incoming.columns.difference(self.feature_columns).intersection(stored.columns):
+            new_values = incoming[col]
+            if is_numeric_dtype(stored[col]):
+                new_values = pd.to_numeric(new_values, errors='coerce')
+            else:
+                new_values = new_values.astype(str)
+                stored_values = stored[col].astype(str)
+                changed |= new_values.ne(stored_values)
+                continue
+            changed |= ~(new_values.eq(stored[col]) | (new_values.isna() & stored[col].isna()))
+        return changed
+
+    def _conform(self, frame, rows):
+        """Cast incoming values to frame's dtypes, widening its compact columns when needed"""
+        rows = rows.copy()
+        for col in rows.columns:
+            dtype = frame[col].dtype
+            if isinstance(dtype, pd.CategoricalDtype):
+                new_categories = pd.Index(rows[col].dropna().unique()).difference(dtype.categories)
+                if len(new_categories):
+                    frame[col] = frame[col].cat.add_categories(new_categories)
+                rows[col] = rows[col].astype(frame[col].dtype)
+            elif is_numeric_dtype(dtype):
+                values = pd.to_numeric(rows[col], errors='coerce')
+                if is_integer_dtype(values):
+                    values = pd.to_numeric(values, downcast='integer')
+                common = np.result_type(dtype, values.dtype)
+                if common != dtype:
+                    frame[col] = frame[col].astype(common)
+                rows[col] = values.astype(common)
+        return rows
+
+    def _score(self, ids, measure=False, frame=None):
+        """Score a subset of stored rows (of frame, default the store's) in one batch
+
+        measure=True (whole-roster scores, where fixed overhead is spread over
+        every row) records the per-row cost upsert's time_saved_seconds uses.
+        """
+        start = time.perf_counter()
+        students = self.students(ids) if frame is None else frame.loc[ids].reset_index()
+        with metrics.time('prediction'):
+            risk = build_risk_table(self.predictor, students)
+        # Model drivers are cached next to the scores so explanations cost nothing per request
+        with metrics.time('attribution'):
+            contributions = self.predictor.feature_contributions(students)
+        risk = risk.join(contributions.astype('float32').set_axis(risk.index).add_prefix(CONTRIBUTION_PREFIX))
+        if measure and len(ids):
+            self.seconds_per_row = (time.perf_counter() - start) / len(ids)
+        return risk
+
+    def _rebuild_aggregates(self):
+        self.aggregates = {
+            'total_students': 0,
+            'risk_counts': pd.Series(dtype='int64'),
+            'department_counts': pd.Series(dtype='int64'),
+            'attendance_sum': 0.0,
+            'score_sum': 0.0,
+            # Drift histograms on the model's training bins: the roster, and batches scored since load
+            'feature_counts': self._feature_counts(self.frame.iloc[:0]),
+            'upload_counts': self._feature_counts(self.frame.iloc[:0]),
+            'upload_rows': 0
+        }
+        self._update_aggregates(self.frame.index, +1)
+
+    def _update_aggregates(self, ids, sign):
+        """Add (sign=+1) or remove (sign=-1) the contribution of some rows"""
+        if not len(ids):
+            return
+        rows = self.frame.loc[ids]
+        agg = self.aggregates
+        agg['total_students'] += sign * len(ids)
+        agg['risk_counts'] = agg['risk_counts'].add(
+            self.risk.loc[ids, 'risk_score'].value_counts() * sign, fill_value=0).astype('int64')
+        agg['department_counts'] = agg['department_counts'].add(
+            rows['Department'].astype(str).value_counts() * sign, fill_value=0).astype('int64')
+        agg['attendance_sum'] += sign * float(pd.to_numeric(rows['Attendance_Percentage'], errors='coerce').sum())
+        agg['score_sum'] += sign * float(pd.to_numeric(rows['Avg_Test_Score'], errors='coerce').sum())
+        if agg['feature_counts'] is not None:
+            for name, counts in self._feature_counts(rows).items():
+                agg['feature_counts'][name] += sign * counts
+
+    def _feature_counts(self, students_df):
+        """Drift histogram counts of some rows, or None when the model has no training profile"""
+        if self.predictor.training_profile is None:
+            return None
+        return self.predictor.profile_counts(self.predictor.encode_features(students_df))
+
+    def observe_batch(self, students_df):
+        """Add an uploaded or bulk-scored batch to the running drift histograms, in O(batch)"""
+        counts = self._feature_counts(students_df)
+        if counts is None or not len(students_df):
+            return
+        with self._lock:
+            agg = self.aggregates
+            for name, batch_counts in counts.items():
+                agg['upload_counts'][name] += batch_counts
+            agg['upload_rows'] += len(students_df)
+
+    def drift_counts(self, window):
+        """(counts, rows) of the 'roster' or 'uploads' drift window, or (None, 0) without a profile"""
+        with self._lock:
+            agg = self.aggregates
+            if window == 'uploads':
+                return agg['upload_counts'], agg['upload_rows']
+            return agg['feature_counts'], agg['total_students']
+
+    def summary(self):
+        """Dashboard figures maintained incrementally across upserts"""
+        agg = self.aggregates
+        total = agg['total_students']
+        return {
+            'total_students': int(total),
+            'risk_distribution': {
+                label: int(agg['risk_counts'].get(score, 0))
+                for score, label in enumerate(['low_risk', 'medium_risk', 'high_risk'])
+            },
+            'department_distribution': {k: int(v) for k, v in agg['department_counts'].items() if v},
+            'average_attendance': agg['attendance_sum'] / total if total else 0.0,
+            'average_score': agg['score_sum'] / total if total else 0.0
+        }
@@ -0,0 +1,96 @@
+# ================================================================
+# Distributions
+# Histograms and quantiles for charts, per group, in one vectorized pass
+# ================================================================
+
+import numpy as np
+import pandas as pd
+
+# metric -> (column, fixed (low, high) range or None to span the data)
+DISTRIBUTION_METRICS = {
+    'attendance': ('Attendance_Percentage', (0, 100)),
+    'avg_score': ('Avg_Test_Score', (0, 100)),
+    'fee_due_days': ('Fee_Due_Days', None),
+    'risk_probability': ('risk_probability', (0, 1)),
+}
+GROUP_COLUMNS = {'department': 'Department', 'semester': 'Semester', 'mentor': 'Mentor_ID'}
+QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+DEFAULT_BINS = 20
+MAX_BINS = 100
+
+
+def bin_edges(values, value_range, bins):
+    low, high = value_range if value_range else (0, float(np.nanmax(values)) if len(values) else 1)
+    return np.linspace(low, high if high > low else low + 1, bins + 1)
+
+
+def grouped_quantiles(values, codes, n_groups):
+    """Linear-interpolated QUANTILES for every group; values must already be sorted"""
+    result = np.full((n_groups, len(QUANTILES)), np.nan)
+    counts = np.bincount(codes, minlength=n_groups)
+    has_rows = counts > 0
+    if not has_rows.any():
+        return result
+
+    # A stable sort on the small group codes (radix sort) keeps each group's values in order
+    sorted_values = values[np.argsort(codes.astype(np.min_scalar_type(n_groups)), kind='stable')]
+    starts = (np.cumsum(counts) - counts)[has_rows, None]
+    last = starts + counts[has_rows, None] - 1
+    position = starts + np.array(QUANTILES) * (last - starts)
+    lower = np.floor(position).astype(int)
+    upper = np.minimum(lower + 1, last)
+    fraction = position - lower
+    result[has_rows] = sorted_values[lower] * (1 - fraction) + sorted_values[upper] * fraction
+    return result
+
+
+def summarize(counts, total, value_sum, quantiles, decimals):
+    return {
+        'count': int(total),
+        'mean': round(value_sum / total, decimals) if total else None,
+        'quantiles': {f"p{int(q * 100)}": (None if np.isnan(v) else round(float(v), decimals))
+                      for q, v in zip(QUANTILES, quantiles)},
+        'counts': counts.tolist()
+    }
+
+
+def build_distributions(frame, metrics, by=None, bins=DEFAULT_BINS):
+    """{metric: {edges, overall, groups}} for the requested metrics, optionally split by a group column"""
+    if by is not None:
+        codes, labels = pd.factorize(frame[GROUP_COLUMNS[by]], sort=True)
+    else:
+        codes, labels = np.zeros(len(frame), dtype=np.intp), pd.Index(['all'])
+    n_groups = len(labels)
+
+    result = {}
+    for name in metrics:
+        column, value_range = DISTRIBUTION_METRICS[name]
+        values = pd.to_numeric(frame[column], errors='coerce').to_numpy(dtype=float)
+        present = ~np.isnan(values)
+        order = np.argsort(values[present])
+        values, group_codes = values[present][order], codes[present][order]
+        edges = bin_edges(values, value_range, bins)
+        decimals = 4 if value_range == (0, 1) else 2
+
+        # One bincount over (group, bin) pairs gives every group's histogram; rows
+        # without a group (code -1) only count towards the overall distribution
+        bin_index = np.clip(np.searchsorted(edges, values, side='right') - 1, 0, bins - 1)
+        in_group = group_codes >= 0
+        histograms = np.bincount(group_codes[in_group] * bins + bin_index[in_group],
+                                 minlength=n_groups * bins).reshape(n_groups, bins)
+        sums = np.bincount(group_codes[in_group], weights=values[in_group], minlength=n_groups)
+        quantiles = grouped_quantiles(values[in_group], group_codes[in_group], n_groups)
+
+        entry = {
+            'column': column,
+            'edges': [round(float(edge), decimals) for edge in edges],
+            'overall': summarize(np.bincount(bin_index, minlength=bins), len(values), values.sum(),
+                                 grouped_quantiles(values, np.zeros(len(values), dtype=np.intp), 1)[0], decimals)
+        }
+        if by is not None:
+            entry['groups'] = {
+                str(label): summarize(histograms[i], histograms[i].sum(), sums[i], quantiles[i], decimals)
+                for i, label in enumerate(labels)
+            }
+        result[name] = entry
+    return {'by': by, 'bins': bins, 'metrics': result}
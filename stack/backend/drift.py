@@ -0,0 +1,89 @@
+# ================================================================
+# Drift Monitoring
+# PSI / KS scores of served data against the training histograms saved with the model
+# ================================================================
+
+import numpy as np
+
+from metrics import metrics
+
+metrics.describe('feature_drift_psi', 'gauge', 'Population stability index of a feature against training, last computed')
+
+# PSI below the first value is stable, below the second moderate, otherwise significant
+PSI_THRESHOLDS = (0.1, 0.25)
+# Floor for empty bins so PSI stays finite
+MIN_FRACTION = 1e-4
+# Below this many rows sampling noise alone pushes PSI past the thresholds (about
+# bins / rows for a sample of the training distribution), so nothing is flagged
+MIN_ROWS = 200
+WINDOWS = ('roster', 'uploads')
+
+
+def fractions(counts):
+    total = counts.sum()
+    return counts / total if total else np.zeros(len(counts))
+
+
+def psi(expected, actual):
+    """Population stability index between two histograms over the same bins"""
+    e = np.maximum(fractions(expected), MIN_FRACTION)
+    a = np.maximum(fractions(actual), MIN_FRACTION)
+    return float(np.sum((a - e) * np.log(a / e)))
+
+
+def binned_ks(expected, actual):
+    """Largest gap between the two CDFs at the bin edges (a lower bound on the exact KS statistic)"""
+    return float(np.max(np.abs(np.cumsum(fractions(expected)) - np.cumsum(fractions(actual)))))
+
+
+def drift_status(value):
+    low, high = PSI_THRESHOLDS
+    return 'stable' if value < low else 'moderate' if value < high else 'significant'
+
+
+def bin_labels(cuts):
+    """'<a', 'a-b', ..., '>=z' for the intervals between cuts, then 'missing'"""
+    cuts = [f"{cut:g}" for cut in cuts]
+    if not cuts:
+        return ['all', 'missing']
+    return [f"<{cuts[0]}", *[f"{lo}-{hi}" for lo, hi in zip(cuts, cuts[1:])], f">={cuts[-1]}", 'missing']
+
+
+def drift_report(profile, counts, rows, **labels):
+    """Per-feature PSI (and binned KS for numeric features) of counts against the training profile
+
+    labels (tenant, window) are attached to the feature_drift_psi gauge. With fewer than
+    MIN_ROWS rows the scores are still reported but every status is 'insufficient_data'.
+    """
+    sufficient = rows >= MIN_ROWS
+    features = {}
+    for name, reference in profile['counts'].items():
+        current = counts[name]
+        value = psi(reference, current)
+        if name in profile['cuts']:
+            bins = bin_labels(profile['cuts'][name])
+            # The missing-value bin has no place on the number line, so KS leaves it out
+            entry = {'type': 'numeric', 'psi': round(value, 4), 'ks': round(binned_ks(reference[:-1], current[:-1]), 4)}
+        else:
+            bins = [*profile['categories'][name], 'unseen']
+            entry = {'type': 'categorical', 'psi': round(value, 4)}
+        entry['status'] = drift_status(value) if sufficient else 'insufficient_data'
+        entry['bins'] = bins
+        entry['training'] = [round(float(f), 4) for f in fractions(reference)]
+        entry['current'] = [round(float(f), 4) for f in fractions(current)]
+        features[name] = entry
+        if sufficient:
+            metrics.set('feature_drift_psi', value, feature=name, **labels)
+
+    drifted = sorted((name for name, entry in features.items() if entry['status'] == 'significant'),
+                     key=lambda name: -features[name]['psi'])
+    return {
+        'rows': int(rows),
+        'training_rows': int(profile['rows']),
+        'min_rows': MIN_ROWS,
+        'insufficient_data': not sufficient,
+        'thresholds': {'moderate': PSI_THRESHOLDS[0], 'significant': PSI_THRESHOLDS[1]},
+        'features': features,
+        'drifted_features': drifted,
+        'retrain_recommended': bool(drifted)
+    }
@@ -0,0 +1,108 @@
+# ================================================================
+# In-Process Metrics
+# Counters and histograms rendered in Prometheus text format
+# ================================================================
+
+import bisect
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels, extra=None):
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in pairs) + '}'
+
+
+class MetricsRegistry:
+    """Thread-safe counters and fixed-bucket histograms, labelled like Prometheus metrics"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._meta = {}  # name -> (kind, help, buckets)
+        self._counters = defaultdict(float)
+        self._gauges = {}
+        self._histograms = {}
+
+    def describe(self, name, kind, help_text, buckets=LATENCY_BUCKETS):
+        self._meta[name] = (kind, help_text, tuple(buckets))
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] += amount
+
+    def set(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._gauges[key] = value
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        buckets = self._meta[name][2]
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = {'buckets': [0] * len(buckets), 'sum': 0.0, 'count': 0}
+            index = bisect.bisect_left(buckets, value)
+            if index < len(buckets):
+                hist['buckets'][index] += 1
+            hist['sum'] += value
+            hist['count'] += 1
+
+    @contextmanager
+    def time(self, stage):
+        """Record how long the enclosed block takes as one stage observation"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe('stage_duration_seconds', time.perf_counter() - start, stage=stage)
+
+    def render(self):
+        """Prometheus text exposition (format 0.0.4) of everything recorded so far"""
+        with self._lock:
+            counters = dict(self._counters)
+            counters.update(self._gauges)
+            histograms = {key: dict(hist, buckets=list(hist['buckets'])) for key, hist in self._histograms.items()}
+
+        lines = []
+        for name, (kind, help_text, buckets) in sorted(self._meta.items()):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            if kind in ('counter', 'gauge'):
+                for (metric, labels), value in sorted(counters.items()):
+                    if metric == name:
+                        lines.append(f'{name}{_format_labels(labels)} {value:g}')
+                continue
+
+            for (metric, labels), hist in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(buckets, hist['buckets']):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{_format_labels(labels, ("le", f"{bound:g}"))} {cumulative}')
+                lines.append(f'{name}_bucket{_format_labels(labels, ("le", "+Inf"))} {hist["count"]}')
+                lines.append(f'{name}_sum{_format_labels(labels)} {hist["sum"]:.6f}')
+                lines.append(f'{name}_count{_format_labels(labels)} {hist["count"]}')
+        return '\n'.join(lines) + '\n'
+
+
+metrics = MetricsRegistry()
+metrics.describe('http_requests_total', 'counter', 'Requests served, by endpoint and status code')
+metrics.describe('http_request_errors_total', 'counter', 'Requests that ended in a 5xx response')
+metrics.describe('http_request_duration_seconds', 'histogram', 'Request latency by endpoint')
+metrics.describe('http_response_size_bytes', 'histogram', 'Response body size by endpoint', SIZE_BUCKETS)
+metrics.describe('stage_duration_seconds', 'histogram', 'Time spent in internal stages (data load, prediction, ...)')
+metrics.describe('processing_errors_total', 'counter', 'Per-record failures that were skipped instead of failing the request')
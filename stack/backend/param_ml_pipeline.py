@@ -4,25 +4,258 @@
 
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import classification_report, confusion_matrix
-from sklearn.preprocessing import StandardScaler
+# sklearn is imported where models are trained: serving a saved model only
+# loads the estimator modules its pickle refers to
+import hashlib
+import importlib.metadata
+import importlib.util
+import inspect
+import itertools
+import json
+import os
 import pickle
+import re
+import sys
+import time
 import warnings
 warnings.filterwarnings('ignore')
 
+# Parquet when pyarrow is installed; found without importing it, so importing
+# the pipeline stays cheap and pandas loads pyarrow on the first cache read or write
+CACHE_FORMAT = 'parquet' if importlib.util.find_spec('pyarrow') else 'pkl'
+
+# ================================================================
+# Columnar Data Cache
+# ================================================================
+
+CATEGORICAL_COLUMNS = ['Department', 'Fee_Status', 'Mentor_ID', 'Scholarship_Eligibility']
+ID_COLUMNS = ['Student_ID', 'Roll_No']
+
+def compact_dtypes(df):
+    """Categoricals for repeated strings, smallest lossless numeric dtypes"""
+    for col in df.columns:
+        is_text = pd.api.types.is_object_dtype(df[col]) or pd.api.types.is_string_dtype(df[col])
+        if col in CATEGORICAL_COLUMNS or (is_text and col not in ID_COLUMNS
+                                          and df[col].nunique() < len(df) // 2):
+            df[col] = df[col].astype('category')
+        elif pd.api.types.is_integer_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], downcast='integer')
+        elif pd.api.types.is_float_dtype(df[col]):
+            # float32 would turn 72.2 into 72.19999, so only downcast when nothing changes
+            as_float32 = df[col].astype('float32')
+            if (as_float32.astype('float64') == df[col]).all():
+                df[col] = as_float32
+    return df
+
+def intern_ids(df):
+    """Share one string object per ID so lookups compare by identity"""
+    for col in ID_COLUMNS:
+        if col in df.columns:
+            df[col] = [sys.intern(v) if isinstance(v, str) else v for v in df[col].tolist()]
+    return df
+
+def columnar_cache_path(filepath):
+    """(CSV content hash, path of its typed cache) for a student CSV"""
+    with open(filepath, 'rb') as f:
+        source_hash = hashlib.sha256(f.read()).hexdigest()[:16]
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(filepath)), '.cache')
+    stem = os.path.splitext(os.path.basename(filepath))[0]
+    return source_hash, os.path.join(cache_dir, f"{stem}.{source_hash}.{CACHE_FORMAT}")
+
+def load_student_frame(filepath, use_cache=True):
+    """Load the student CSV through a typed binary cache validated by the CSV's hash"""
+    source_hash, cache_path = columnar_cache_path(filepath)
+    cache_dir = os.path.dirname(cache_path)
+    stem = os.path.splitext(os.path.basename(filepath))[0]
+    
+    start = time.perf_counter()
+    if use_cache and os.path.exists(cache_path):
+        df = pd.read_parquet(cache_path) if CACHE_FORMAT == 'parquet' else pd.read_pickle(cache_path)
+        df = intern_ids(df)
+        print(f"📦 Loaded {os.path.basename(cache_path)} in {time.perf_counter() - start:.3f}s")
+        return df
+    
+    df = pd.read_csv(filepath)
+    parse_seconds = time.perf_counter() - start
+    if not use_cache:
+        return df
+    
+    memory_before = df.memory_usage(deep=True).sum()
+    df = intern_ids(compact_dtypes(df))
+    memory_after = df.memory_usage(deep=True).sum()
+    print(f"🗜️ Memory: {memory_before / 1e6:.1f} MB → {memory_after / 1e6:.1f} MB "
+          f"(CSV parsed in {parse_seconds:.3f}s)")
+    
+    # Replace caches of older versions of this CSV; only exact <stem>.<hash>.<format>
+    # names, so students.v2.csv's cache survives a reload of students.csv
+    os.makedirs(cache_dir, exist_ok=True)
+    own_cache = re.compile(rf"{re.escape(stem)}\.[0-9a-f]{{16}}\.(parquet|pkl)")
+    for name in os.listdir(cache_dir):
+        if own_cache.fullmatch(name) and name != os.path.basename(cache_path):
+            os.remove(os.path.join(cache_dir, name))
+    # Write aside and rename, so a concurrent reader never sees a half-written cache
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        if CACHE_FORMAT == 'parquet':
+            df.to_parquet(tmp_path, index=False)
+        else:
+            df.to_pickle(tmp_path)
+        os.replace(tmp_path, cache_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    print(f"📦 Cached typed copy at {cache_path}")
+    return df
+
+# ================================================================
+# Cached Training Stages
+# ================================================================
+
+def fingerprint(*parts):
+    """Short sha256 of JSON-serialisable stage inputs and config"""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+def source_fingerprint(fn):
+    """Changes whenever the stage's code does, so edited stages are recomputed"""
+    try:
+        return hashlib.sha256(inspect.getsource(fn).encode()).hexdigest()[:16]
+    except (OSError, TypeError):
+        return fn.__qualname__
+
+def sklearn_version():
+    """Installed scikit-learn version, read from package metadata without importing it"""
+    try:
+        return importlib.metadata.version('scikit-learn')
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+class StageCache:
+    """Pickled stage outputs under <data dir>/.cache/stages, plus a run report"""
+    
+    ENTRIES_PER_STAGE = 4
+    
+    def __init__(self, cache_dir, enabled=True):
+        self.cache_dir = cache_dir
+        self.enabled = enabled
+        self.report = []
+    
+    def run(self, stage, key, compute):
+        """Return the cached output for (stage, key) or compute and store it"""
+        path = os.path.join(self.cache_dir, f"{stage}-{key}.pkl")
+        start = time.perf_counter()
+        if self.enabled and os.path.exists(path):
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+            seconds = time.perf_counter() - start
+            self.record(stage, key, 'hit', seconds, max(entry['compute_seconds'] - seconds, 0.0))
+            return entry['output']
+        
+        output = compute()
+        seconds = time.perf_counter() - start
+        if self.enabled:
+            # Keep the few newest entries per stage (e.g. alternating hyperparameters)
+            os.makedirs(self.cache_dir, exist_ok=True)
+            older = sorted((os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)
+                            if name.startswith(f"{stage}-")), key=os.path.getmtime)
+            for stale in older[:max(len(older) - self.ENTRIES_PER_STAGE + 1, 0)]:
+                os.remove(stale)
+            with open(path, 'wb') as f:
+                pickle.dump({'output': output, 'compute_seconds': seconds}, f)
+        self.record(stage, key, 'miss', seconds, 0.0)
+        return output
+    
+    def record(self, stage, key, status, seconds, saved_seconds):
+        self.report.append({'stage': stage, 'key': key, 'status': status,
+                            'seconds': round(seconds, 4), 'saved_seconds': round(saved_seconds, 4)})
+    
+    def summary(self):
+        """Print the run report and save it as last_run.json next to the cached stages"""
+        print("\n🧾 Training run report:")
+        for entry in self.report:
+            saved = f"saved {entry['saved_seconds']:.3f}s" if entry['saved_seconds'] else ''
+            print(f"   {entry['stage']:<10} {entry['status']:<8} {entry['seconds']:>8.3f}s  {saved}")
+        total_saved = sum(entry['saved_seconds'] for entry in self.report)
+        print(f"   ⏱️ Time saved by cached stages: {total_saved:.3f}s")
+        
+        report = {'stages': self.report, 'saved_seconds': round(total_saved, 4)}
+        if self.enabled:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(os.path.join(self.cache_dir, 'last_run.json'), 'w') as f:
+                json.dump(report, f, indent=2)
+        return report
+
+# ================================================================
+# Hyperparameter Search
+# ================================================================
+
+def search_candidates(space):
+    """[(family, params)] for every combination in a {family: {param: [values]}} grid"""
+    return [(family, dict(zip(grid, values))) for family, grid in space.items()
+            for values in itertools.product(*grid.values())]
+
+def halving_schedule(n_candidates, n_rows, eta, min_rows):
+    """Rows per successive-halving rung: the last uses all n_rows, each earlier one 1/eta of the next"""
+    if eta < 2:
+        raise ValueError("eta must be at least 2")
+    rungs = 1
+    while eta ** rungs < n_candidates and n_rows // eta ** rungs >= min_rows:
+        rungs += 1
+    return [n_rows // eta ** (rungs - 1 - rung) for rung in range(rungs)]
+
+def _fit_fold(family, params, X, y, fit_rows, score_rows):
+    """(accuracy, seconds) of one configuration on one CV fold, scaled the way train_model() scales"""
+    from sklearn.preprocessing import StandardScaler
+    start = time.perf_counter()
+    scaler = StandardScaler().fit(X[fit_rows])
+    model = DropoutPredictor.build_estimator(family, params).fit(scaler.transform(X[fit_rows]), y[fit_rows])
+    return model.score(scaler.transform(X[score_rows]), y[score_rows]), time.perf_counter() - start
+
 class DropoutPredictor:
+    # Numeric columns fed to the model as-is
+    NUMERIC_FEATURES = [
+        'Attendance_Percentage', 'Monthly_Attendance',
+        'Avg_Test_Score', 'Last_Test_Score', 
+        'Subjects_Failed', 'Attempts_Exhausted',
+        'Fee_Due_Days', 'Semester'
+    ]
+    RISK_LABELS = ['Low Risk', 'Medium Risk', 'High Risk']
+    MODEL_PARAMS = {
+        'random_forest': {'n_estimators': 100, 'max_depth': 10, 'random_state': 42},
+        'logistic_regression': {'max_iter': 1000, 'random_state': 42}
+    }
+    SPLIT_PARAMS = {'test_size': 0.2, 'random_state': 42}
+    # Model families train_model() and tune() can fit: (display name, sklearn module, class)
+    MODEL_FAMILIES = {
+        'random_forest': ('Random Forest', 'sklearn.ensemble', 'RandomForestClassifier'),
+        'extra_trees': ('Extra Trees', 'sklearn.ensemble', 'ExtraTreesClassifier'),
+        'logistic_regression': ('Logistic Regression', 'sklearn.linear_model', 'LogisticRegression')
+    }
+    # Grid tune() searches, per family (each value list is crossed with the others)
+    SEARCH_SPACE = {
+        'random_forest': {'n_estimators': [50, 100, 200], 'max_depth': [6, 10, 16, None], 'min_samples_leaf': [1, 5]},
+        'extra_trees': {'n_estimators': [100, 200], 'max_depth': [10, 16, None], 'min_samples_leaf': [1, 5]},
+        'logistic_regression': {'C': [0.01, 0.1, 1.0, 10.0], 'max_iter': [1000]}
+    }
+    # Smallest subsample a successive-halving rung trains on
+    MIN_SEARCH_ROWS = 500
+    # Categorical inputs and the prefix of their one-hot feature columns
+    ONE_HOT_PREFIXES = {'Department': 'Dept_', 'Fee_Status': 'Fee_'}
+    # Training quantiles used as bin cuts of each numeric feature's drift histogram
+    PROFILE_QUANTILES = [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9]
+    # Raw inputs that per-student contributions are reported against
+    CONTRIBUTION_FEATURES = NUMERIC_FEATURES + ['Department', 'Fee_Status']
+    
     def __init__(self):
         self.model = None
-        self.scaler = StandardScaler()
+        self.scaler = None  # fitted by train_model() or restored by load_model()
         self.feature_columns = None
+        self.training_profile = None  # training histograms for drift checks, see build_training_profile()
+        self._path_deltas = None  # (model, sparse node->feature delta table) for tree attributions
         
-    def load_data(self, filepath="final_clean_students_14k.csv"):
+    def load_data(self, filepath="final_clean_students_14k.csv", use_cache=True):
         """Load processed data from Harshita & Shweta"""
         print("📊 Loading processed dataset...")
-        self.data = pd.read_csv(filepath)
+        self.data = load_student_frame(filepath, use_cache)
         print(f"✅ Loaded {len(self.data)} student records")
         return self.data
     
@@ -62,12 +295,7 @@ class DropoutPredictor:
         print("🔧 Preparing features...")
         
         # Select relevant features
-        feature_cols = [
-            'Attendance_Percentage', 'Monthly_Attendance',
-            'Avg_Test_Score', 'Last_Test_Score', 
-            'Subjects_Failed', 'Attempts_Exhausted',
-            'Fee_Due_Days', 'Semester'
-        ]
+        feature_cols = self.NUMERIC_FEATURES
         
         # Add categorical features
         dept_encoded = pd.get_dummies(self.data['Department'], prefix='Dept')
@@ -87,48 +315,49 @@ class DropoutPredictor:
         
         return X, y
     
-    def train_model(self, X, y):
-        """Train dropout prediction model"""
+    def train_model(self, X, y, split=None, params=None, families=None):
+        """Train dropout prediction model
+        
+        params override MODEL_PARAMS per family; families (default: MODEL_PARAMS)
+        limits which are fitted, e.g. to the one tune() picked.
+        """
+        from sklearn.metrics import classification_report
+        from sklearn.model_selection import train_test_split
+        from sklearn.preprocessing import StandardScaler
+        
         print("🚀 Training ML models...")
+        params = params or {}
         
-        # Split data
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=0.2, random_state=42, stratify=y
-        )
+        # Split data (a precomputed (train_idx, test_idx) pair skips the re-split)
+        if split is None:
+            X_train, X_test, y_train, y_test = train_test_split(
+                X, y, stratify=y, **self.SPLIT_PARAMS
+            )
+        else:
+            train_idx, test_idx = split
+            X, y = np.asarray(X), np.asarray(y)
+            X_train, X_test, y_train, y_test = X[train_idx], X[test_idx], y[train_idx], y[test_idx]
+        
+        # Reference distribution the served data is compared against
+        self.build_training_profile(X_train)
         
         # Scale features
+        self.scaler = StandardScaler()
         X_train_scaled = self.scaler.fit_transform(X_train)
         X_test_scaled = self.scaler.transform(X_test)
         
-        # Train Random Forest
-        rf_model = RandomForestClassifier(
-            n_estimators=100, 
-            max_depth=10, 
-            random_state=42
-        )
-        rf_model.fit(X_train_scaled, y_train)
+        # Train and evaluate each model family
+        models, scores = {}, {}
+        for family in families or self.MODEL_PARAMS:
+            models[family] = self.build_estimator(family, params.get(family))
+            models[family].fit(X_train_scaled, y_train)
+            scores[family] = models[family].score(X_test_scaled, y_test)
+            print(f"{self.MODEL_FAMILIES[family][0]} Accuracy: {scores[family]:.3f}")
         
-        # Train Logistic Regression
-        lr_model = LogisticRegression(
-            max_iter=1000, 
-            random_state=42
-        )
-        lr_model.fit(X_train_scaled, y_train)
-        
-        # Evaluate models
-        rf_score = rf_model.score(X_test_scaled, y_test)
-        lr_score = lr_model.score(X_test_scaled, y_test)
-        
-        print(f"Random Forest Accuracy: {rf_score:.3f}")
-        print(f"Logistic Regression Accuracy: {lr_score:.3f}")
-        
-        # Select best model
-        if rf_score >= lr_score:
-            self.model = rf_model
-            print("✅ Selected Random Forest as final model")
-        else:
-            self.model = lr_model
-            print("✅ Selected Logistic Regression as final model")
+        # Select best model (ties go to the first family, Random Forest by default)
+        best = max(scores, key=scores.get)
+        self.model = models[best]
+        print(f"✅ Selected {self.MODEL_FAMILIES[best][0]} as final model")
         
         # Detailed evaluation
         y_pred = self.model.predict(X_test_scaled)
@@ -138,6 +367,224 @@ class DropoutPredictor:
         
         return self.model
     
+    @classmethod
+    def build_estimator(cls, family, params=None):
+        """Unfitted estimator of a MODEL_FAMILIES family: MODEL_PARAMS defaults, then params"""
+        import importlib
+        _, module, name = cls.MODEL_FAMILIES[family]
+        estimator = getattr(importlib.import_module(module), name)
+        return estimator(**{'random_state': 42, **cls.MODEL_PARAMS.get(family, {}), **(params or {})})
+    
+    def train_pipeline(self, filepath="final_clean_students_14k.csv", params=None, use_cache=True):
+        """load -> labels -> features -> split -> train, skipping stages whose inputs are unchanged
+        
+        Returns the run report (per stage: hit/miss/skipped, seconds, seconds saved).
+        """
+        cache, X, y, feature_columns, split, keys = self._pipeline_stages(filepath, use_cache)
+        
+        # Everything the fitted model and its saved profile depend on, including the library
+        train_key = fingerprint(keys['features'], keys['split'], self.MODEL_PARAMS, self.MODEL_FAMILIES, params,
+                                [source_fingerprint(fn) for fn in (DropoutPredictor.train_model,
+                                                                   DropoutPredictor.build_estimator,
+                                                                   DropoutPredictor.build_training_profile,
+                                                                   DropoutPredictor.profile_counts)],
+                                sklearn_version())
+        
+        def compute_model():
+            self.feature_columns = feature_columns
+            self.train_model(X, y, split=split, params=params)
+            return {'model': self.model, 'scaler': self.scaler, 'feature_columns': feature_columns,
+                    'training_profile': self.training_profile}
+        trained = cache.run('train', train_key, compute_model)
+        self.model, self.scaler, self.feature_columns = trained['model'], trained['scaler'], trained['feature_columns']
+        self.training_profile = trained['training_profile']
+        
+        self._record_skipped_load(cache, keys['source'])
+        return cache.summary()
+    
+    def _pipeline_stages(self, filepath, use_cache):
+        """Cached load/labels/features/split stages: (cache, X, y, feature_columns, split, keys)"""
+        source_hash, columnar_path = columnar_cache_path(filepath)
+        cache = StageCache(os.path.join(os.path.dirname(columnar_path), 'stages'), enabled=use_cache)
+        
+        def frame():
+            # Loaded only if a stage below actually needs the rows
+            if getattr(self, '_pipeline_source', None) != source_hash:
+                cached = os.path.exists(columnar_path)
+                start = time.perf_counter()
+                self.load_data(filepath, use_cache)
+                cache.record('load', source_hash, 'hit' if cached and use_cache else 'miss',
+                             time.perf_counter() - start, 0.0)
+                self._pipeline_source = source_hash
+            return self.data
+        
+        labels_key = fingerprint(source_hash, source_fingerprint(DropoutPredictor.create_dropout_labels))
+        
+        def compute_labels():
+            frame()
+            return self.create_dropout_labels().to_numpy(np.int8)
+        y = cache.run('labels', labels_key, compute_labels)
+        
+        features_key = fingerprint(labels_key, self.NUMERIC_FEATURES,
+                                   source_fingerprint(DropoutPredictor.prepare_features))
+        
+        def compute_features():
+            frame()['dropout_risk'] = y
+            X, _ = self.prepare_features()
+            return X.to_numpy(dtype=float), self.feature_columns
+        X, feature_columns = cache.run('features', features_key, compute_features)
+        
+        split_key = fingerprint(labels_key, self.SPLIT_PARAMS)
+        
+        def compute_split():
+            from sklearn.model_selection import train_test_split
+            return tuple(train_test_split(np.arange(len(y)), stratify=y, **self.SPLIT_PARAMS))
+        split = cache.run('split', split_key, compute_split)
+        
+        keys = {'source': source_hash, 'labels': labels_key, 'features': features_key, 'split': split_key}
+        return cache, X, y, feature_columns, split, keys
+    
+    def tune(self, filepath="final_clean_students_14k.csv", search_space=None, cv=3, eta=3,
+             min_rows=None, n_jobs=-1, use_cache=True):
+        """Cross-validated successive-halving search over model families and hyperparameters
+        
+        Every candidate of search_space (default SEARCH_SPACE) is scored on a stratified
+        subsample of the training split; the best 1/eta move on to eta times more rows until
+        the survivors use the whole split. The folds of a rung run in parallel (n_jobs, -1 =
+        all cores) on the stage-cached encoded matrix, which joblib memory-maps into workers.
+        The winner is refitted on the training split as self.model.
+        
+        Returns the report: best configuration, seconds spent and the trial table.
+        """
+        from joblib import Parallel, delayed, effective_n_jobs
+        from sklearn.model_selection import StratifiedKFold, train_test_split
+        
+        start = time.perf_counter()
+        search_space = search_space or self.SEARCH_SPACE
+        cache, X, y, feature_columns, split, keys = self._pipeline_stages(filepath, use_cache)
+        train_idx, test_idx = split
+        candidates = search_candidates(search_space)
+        schedule = halving_schedule(len(candidates), len(train_idx), eta, min_rows or self.MIN_SEARCH_ROWS)
+        n_jobs = effective_n_jobs(n_jobs)
+        print(f"🔍 Searching {len(candidates)} configurations in {len(schedule)} rungs "
+              f"({cv}-fold CV, {n_jobs} parallel jobs)...")
+        
+        search_key = fingerprint(keys['features'], keys['split'], search_space, cv, eta, schedule,
+                                 source_fingerprint(DropoutPredictor.tune), source_fingerprint(_fit_fold),
+                                 source_fingerprint(DropoutPredictor.build_estimator), sklearn_version())
+        
+        def compute_search():
+            survivors = list(range(len(candidates)))
+            trials = []
+            with Parallel(n_jobs=n_jobs) as parallel:
+                for rung, rows in enumerate(schedule):
+                    sample = train_idx if rows >= len(train_idx) else train_test_split(
+                        train_idx, train_size=rows, stratify=y[train_idx], random_state=42)[0]
+                    folds = [(sample[fit], sample[score]) for fit, score in
+                             StratifiedKFold(cv, shuffle=True, random_state=42).split(sample, y[sample])]
+                    results = parallel(delayed(_fit_fold)(*candidates[c], X, y, fit_rows, score_rows)
+                                       for c in survivors for fit_rows, score_rows in folds)
+                    
+                    rung_trials = []
+                    for position, c in enumerate(survivors):
+                        scores, seconds = zip(*results[position * cv:(position + 1) * cv])
+                        rung_trials.append({'rung': rung, 'rows': len(sample), 'candidate': c,
+                                            'family': candidates[c][0], 'params': candidates[c][1],
+                                            'mean_score': round(float(np.mean(scores)), 4),
+                                            'std_score': round(float(np.std(scores)), 4),
+                                            'fit_seconds': round(sum(seconds), 3)})
+                    # Stable sort: equal scores keep grid order
+                    rung_trials.sort(key=lambda trial: -trial['mean_score'])
+                    keep = -(-len(survivors) // eta) if rung < len(schedule) - 1 else 1
+                    for position, trial in enumerate(rung_trials):
+                        trial['promoted'] = position < keep
+                    survivors = [trial['candidate'] for trial in rung_trials[:keep]]
+                    trials.extend(rung_trials)
+                    print(f"   rung {rung}: {len(rung_trials)} configurations × {len(sample):,} rows, "
+                          f"best CV accuracy {rung_trials[0]['mean_score']:.3f}")
+            return trials
+        trials = cache.run('search', search_key, compute_search)
+        
+        best = next(trial for trial in trials if trial['rung'] == len(schedule) - 1)
+        print(f"🏆 Refitting {self.MODEL_FAMILIES[best['family']][0]} {best['params']} on the training split...")
+        self.feature_columns = feature_columns
+        self.train_model(X, y, split=split, params={best['family']: best['params']}, families=[best['family']])
+        test_score = self.model.score(self.scaler.transform(X[test_idx]), y[test_idx])
+        
+        self._record_skipped_load(cache, keys['source'])
+        stages = cache.summary()
+        report = {
+            'best': {'family': best['family'], 'params': best['params'],
+                     'cv_score': best['mean_score'], 'test_score': round(float(test_score), 4)},
+            # Reusable as train_pipeline(params=...)
+            'best_params': {best['family']: best['params']},
+            'candidates': len(candidates),
+            'rungs': [{'rung': rung, 'rows': len(train_idx) if rows >= len(train_idx) else rows,
+                       'configurations': sum(1 for trial in trials if trial['rung'] == rung)}
+                      for rung, rows in enumerate(schedule)],
+            'cv': cv,
+            'eta': eta,
+            'n_jobs': n_jobs,
+            'seconds': round(time.perf_counter() - start, 3),
+            'search_fit_seconds': round(sum(trial['fit_seconds'] for trial in trials), 3),
+            'stages': stages['stages'],
+            'trials': trials
+        }
+        
+        print(f"\n{'rung':>4}{'rows':>9}  {'family':<21}{'CV accuracy':>13}{'fit s':>9}  params")
+        for trial in sorted(trials, key=lambda trial: (-trial['rung'], -trial['mean_score'])):
+            marker = '✅' if trial['promoted'] else '  '
+            print(f"{trial['rung']:>4}{trial['rows']:>9,}  {trial['family']:<21}"
+                  f"{trial['mean_score']:>7.3f} ±{trial['std_score']:.3f}{trial['fit_seconds']:>8.2f} {marker} {trial['params']}")
+        print(f"\n✅ Best: {best['family']} {best['params']} (CV {best['mean_score']:.3f}, "
+              f"holdout {test_score:.3f}) in {report['seconds']:.1f}s")
+        
+        if use_cache:
+            with open(os.path.join(cache.cache_dir, 'last_search.json'), 'w') as f:
+                json.dump(report, f, indent=2)
+        return report
+    
+    @staticmethod
+    def _record_skipped_load(cache, source_hash):
+        if not any(entry['stage'] == 'load' for entry in cache.report):
+            cache.record('load', source_hash, 'skipped', 0.0, 0.0)
+            cache.report.insert(0, cache.report.pop())
+    
+    def build_training_profile(self, X):
+        """Compact per-feature histograms of the (unscaled) training matrix, saved with the model"""
+        X = np.asarray(X, dtype=float)
+        cuts = {}
+        for i, name in enumerate(self.feature_columns):
+            if name in self.NUMERIC_FEATURES:
+                values = X[~np.isnan(X[:, i]), i]
+                cuts[name] = np.unique(np.quantile(values, self.PROFILE_QUANTILES)) if len(values) else np.array([])
+        categories = {column: [category for _, category in encoded]
+                      for column, encoded in self.one_hot_columns().items()}
+        self.training_profile = {'rows': len(X), 'cuts': cuts, 'categories': categories}
+        self.training_profile['counts'] = self.profile_counts(X)
+        return self.training_profile
+    
+    def profile_counts(self, X):
+        """{feature: bin counts} of an encoded matrix on the training profile's bins
+        
+        Numeric features get one bin per interval between cuts plus a last bin for
+        missing values; categorical inputs one bin per trained category plus a last
+        bin for unseen or missing values. Counts add up across batches.
+        """
+        cuts = self.training_profile['cuts']
+        counts = {}
+        for i, name in enumerate(self.feature_columns):
+            if name in cuts:
+                column = X[:, i]
+                missing = np.isnan(column)
+                bins = np.searchsorted(cuts[name], column[~missing], side='right')
+                counts[name] = np.append(np.bincount(bins, minlength=len(cuts[name]) + 1), missing.sum())
+        for column, encoded in self.one_hot_columns().items():
+            positions = [i for i, _ in encoded]
+            matched = X[:, positions].sum(axis=0).astype(np.int64)
+            counts[column] = np.append(matched, len(X) - matched.sum())
+        return counts
+    
     def get_feature_importance(self):
         """Get feature importance for explainability"""
         if hasattr(self.model, 'feature_importances_'):
@@ -153,32 +600,205 @@ class DropoutPredictor:
             print("Model doesn't support feature importance")
             return None
     
+    def one_hot_columns(self):
+        """{raw column: [(feature position, category)]} of the trained one-hot features
+        
+        Numeric features are never part of a group, even when they share its
+        prefix (Fee_Due_Days and the Fee_ columns of Fee_Status).
+        """
+        groups = {column: [] for column in self.ONE_HOT_PREFIXES}
+        for i, name in enumerate(self.feature_columns):
+            if name in self.NUMERIC_FEATURES:
+                continue
+            for column, prefix in self.ONE_HOT_PREFIXES.items():
+                if name.startswith(prefix):
+                    groups[column].append((i, name[len(prefix):]))
+        return groups
+    
+    def encode_features(self, students_df):
+        """Encode raw student columns into the trained feature layout
+        
+        Takes a DataFrame or any mapping of column -> array, so columnar
+        payloads reach the model without being turned into rows first.
+        """
+        # Column-major, so each feature is written as one contiguous block
+        X = np.zeros((len(students_df[self.NUMERIC_FEATURES[0]]), len(self.feature_columns)), order='F')
+        for i, name in enumerate(self.feature_columns):
+            if name in self.NUMERIC_FEATURES:
+                X[:, i] = np.asarray(students_df[name], dtype=float)
+        
+        # Unseen categories (and nulls) match no column and stay all-zero
+        for column, encoded in self.one_hot_columns().items():
+            if not encoded:
+                continue
+            positions, categories = map(np.array, zip(*encoded))
+            known = pd.Index(categories, dtype=object)
+            values = students_df[column]
+            if isinstance(getattr(values, 'dtype', None), pd.CategoricalDtype):
+                # Look up each distinct category once; code -1 (null) stays unmatched
+                codes = np.append(known.get_indexer(values.cat.categories.astype(object)), -1)[values.cat.codes]
+            else:
+                codes = known.get_indexer(np.asarray(values, dtype=object))
+            rows = np.flatnonzero(codes >= 0)
+            X[rows, positions[codes[rows]]] = 1
+        return X
+    
+    def predict_batch(self, students_df):
+        """Predict dropout risk for a DataFrame of students in one model call"""
+        if self.model is None:
+            raise ValueError("Model not trained yet!")
+        
+        risk_score, proba = self.predict_encoded(self.encode_features(students_df))
+        
+        return pd.DataFrame({
+            'risk_score': risk_score,
+            'risk_level': np.array(self.RISK_LABELS)[risk_score],
+            'confidence': proba.max(axis=1),
+            'prob_low_risk': proba[:, 0],
+            'prob_medium_risk': proba[:, 1],
+            'prob_high_risk': proba[:, 2]
+        }, index=students_df.index)
+    
+    def predict_encoded(self, X):
+        """(risk_score, low/medium/high probabilities) for an already encoded feature matrix"""
+        risk_proba = self.model.predict_proba(self.scaler.transform(X))
+        
+        # Map model classes onto the fixed low/medium/high columns
+        proba = np.zeros((len(X), len(self.RISK_LABELS)))
+        proba[:, self.model.classes_.astype(int)] = risk_proba
+        risk_score = self.model.classes_[risk_proba.argmax(axis=1)].astype(int)
+        return risk_score, proba
+    
     def predict_dropout_risk(self, student_data):
         """Predict dropout risk for new students"""
         if self.model is None:
             raise ValueError("Model not trained yet!")
         
         # Prepare features
-        features = student_data[self.feature_columns]
-        features_scaled = self.scaler.transform(features.values.reshape(1, -1))
+        features = self.encode_features(student_data.to_frame().T)
+        features_scaled = self.scaler.transform(features)
         
         # Make prediction
-        risk_level = self.model.predict(features_scaled)[0]
+        risk_level = int(self.model.predict(features_scaled)[0])
         risk_proba = self.model.predict_proba(features_scaled)[0]
         
-        risk_labels = ['Low Risk', 'Medium Risk', 'High Risk']
+        risk_labels = self.RISK_LABELS
         
         return {
             'risk_level': risk_labels[risk_level],
             'risk_score': risk_level,
-            'confidence': max(risk_proba),
+            'confidence': float(max(risk_proba)),
             'probabilities': {
-                'low_risk': risk_proba[0],
-                'medium_risk': risk_proba[1] if len(risk_proba) > 1 else 0,
-                'high_risk': risk_proba[2] if len(risk_proba) > 2 else risk_proba[1] if len(risk_proba) > 1 else 0
+                'low_risk': float(risk_proba[0]),
+                'medium_risk': float(risk_proba[1]) if len(risk_proba) > 1 else 0,
+                'high_risk': float(risk_proba[2] if len(risk_proba) > 2 else risk_proba[1] if len(risk_proba) > 1 else 0)
             }
         }
     
+    def feature_contributions(self, students_df):
+        """Per-student contribution of each raw input to the predicted class score
+        
+        Forests use the tree-path (Saabas) decomposition, so bias + contributions equals
+        the predicted probability; logistic regression uses coefficient x scaled value (log-odds).
+        """
+        if self.model is None:
+            raise ValueError("Model not trained yet!")
+        
+        X = self.scaler.transform(self.encode_features(students_df))
+        if self._trees():
+            bias, contributions = self._tree_contributions(X)
+        else:
+            bias, contributions = self._linear_contributions(X)
+        
+        predicted = (bias + contributions.sum(axis=1)).argmax(axis=1)
+        picked = contributions[np.arange(len(X)), :, predicted]
+        return pd.DataFrame(picked @ self._feature_groups(), index=students_df.index,
+                            columns=self.CONTRIBUTION_FEATURES)
+    
+    def top_drivers(self, contributions, top_n=5):
+        """Largest contributions of one student as [{'feature', 'contribution'}], strongest first"""
+        ranked = contributions.reindex(contributions.abs().sort_values(ascending=False).index)
+        return [{'feature': feature, 'contribution': round(float(value), 4)}
+                for feature, value in ranked.head(top_n).items() if value != 0]
+    
+    def _feature_groups(self):
+        """Matrix folding encoded columns (Dept_*, Fee_*) back onto their raw feature"""
+        groups = np.zeros((len(self.feature_columns), len(self.CONTRIBUTION_FEATURES)))
+        raw = list(self.feature_columns)
+        for column, encoded in self.one_hot_columns().items():
+            for i, _ in encoded:
+                raw[i] = column
+        for i, column in enumerate(raw):
+            groups[i, self.CONTRIBUTION_FEATURES.index(column)] = 1
+        return groups
+    
+    def _trees(self):
+        """Fitted trees of a forest or single (e.g. distilled) tree model, else None"""
+        if hasattr(self.model, 'estimators_'):
+            return self.model.estimators_
+        if hasattr(self.model, 'tree_'):
+            return [self.model]
+        return None
+    
+    def _tree_contributions(self, X):
+        """Average over trees of the class-probability change at each split on the decision path"""
+        if self._path_deltas is None or self._path_deltas[0] is not self.model:
+            self._path_deltas = (self.model, self._build_leaf_table(X.shape[1]))
+        _, (bias, leaf_rows, table) = self._path_deltas
+        
+        n_trees = len(self._trees())
+        contributions = np.zeros((len(X), table.shape[1]))
+        for start in range(0, len(X), 16384):
+            # Leaf reached in every tree -> row of that leaf's summed path deltas
+            nodes = self.model.apply(X[start:start + 16384]).reshape(-1, n_trees)
+            rows = leaf_rows[nodes, np.arange(n_trees)]
+            chunk = contributions[start:start + 16384]
+            for tree in range(n_trees):
+                chunk += table[rows[:, tree]]
+        n_classes = len(self.model.classes_)
+        return bias / n_trees, (contributions / n_trees).reshape(len(X), X.shape[1], n_classes)
+    
+    def _build_leaf_table(self, n_features):
+        """Per leaf of every tree, the path's value[child] - value[parent] deltas summed by split feature
+        
+        Returns (root value sum, node x tree -> table row lookup, leaves x (features * classes) table).
+        """
+        n_classes = len(self.model.classes_)
+        trees = self._trees()
+        max_nodes = max(estimator.tree_.node_count for estimator in trees)
+        leaf_rows = np.zeros((max_nodes, len(trees)), dtype=np.int64)
+        blocks, bias, offset = [], np.zeros(n_classes), 0
+        for t, estimator in enumerate(trees):
+            tree = estimator.tree_
+            value = tree.value[:, 0, :]
+            value = value / value.sum(axis=1, keepdims=True)
+            bias += value[0]
+            
+            # Walk the tree level by level, carrying each node's accumulated deltas to its children
+            cumulative = np.zeros((tree.node_count, n_features, n_classes))
+            frontier = np.array([0])
+            while len(frontier):
+                frontier = frontier[tree.children_left[frontier] != -1]
+                for children in (tree.children_left[frontier], tree.children_right[frontier]):
+                    cumulative[children] = cumulative[frontier]
+                    cumulative[children, tree.feature[frontier]] += value[children] - value[frontier]
+                frontier = np.concatenate([tree.children_left[frontier], tree.children_right[frontier]])
+            
+            leaves = np.flatnonzero(tree.children_left == -1)
+            leaf_rows[leaves, t] = offset + np.arange(len(leaves))
+            blocks.append(cumulative[leaves].reshape(len(leaves), -1).astype(np.float32))
+            offset += len(leaves)
+        return bias, leaf_rows, np.vstack(blocks)
+    
+    def _linear_contributions(self, X):
+        """Coefficient x scaled value per class, in log-odds"""
+        coef, intercept = self.model.coef_, self.model.intercept_
+        if coef.shape[0] == 1:
+            # Binary models only score the positive class
+            coef = np.vstack([np.zeros_like(coef), coef])
+            intercept = np.concatenate([[0.0], intercept])
+        return intercept, X[:, :, None] * coef.T[None, :, :]
+    
     def generate_recommendations(self, student_data, prediction):
         """Generate actionable recommendations"""
         recommendations = []
@@ -242,7 +862,7 @@ class DropoutPredictor:
         
         return recommendations
     
-    def explain_prediction(self, student_data, prediction):
+    def explain_prediction(self, student_data, prediction, contributions=None):
         """Explain why a student was flagged"""
         explanations = []
         
@@ -259,9 +879,15 @@ class DropoutPredictor:
         if student_data['Fee_Due_Days'] > 0:
             explanations.append(f"Overdue fees: {student_data['Fee_Due_Days']} days")
         
+        # What the trained model actually relied on for this student
+        if contributions is None:
+            contributions = self.feature_contributions(student_data.to_frame().T).iloc[0]
+        
         return {
             'prediction': prediction,
             'main_factors': explanations,
+            'model_drivers': self.top_drivers(contributions),
+            'driver_method': 'tree_path' if self._trees() else 'linear',
             'explanation': f"Student flagged as {prediction['risk_level']} due to: {', '.join(explanations)}"
         }
     
@@ -270,7 +896,8 @@ class DropoutPredictor:
         model_data = {
             'model': self.model,
             'scaler': self.scaler, 
-            'feature_columns': self.feature_columns
+            'feature_columns': self.feature_columns,
+            'training_profile': self.training_profile
         }
         with open(filename, 'wb') as f:
             pickle.dump(model_data, f)
@@ -284,6 +911,8 @@ class DropoutPredictor:
         self.model = model_data['model']
         self.scaler = model_data['scaler']
         self.feature_columns = model_data['feature_columns']
+        # Models saved before drift profiles existed have none until retrained
+        self.training_profile = model_data.get('training_profile')
         print(f"✅ Model loaded from {filename}")
 
 # ================================================================
@@ -345,16 +974,10 @@ if __name__ == "__main__":
     # Initialize predictor
     predictor = DropoutPredictor()
     
-    # Load data
+    # Load, label, encode, split and train (unchanged stages come from the stage cache)
+    report = predictor.train_pipeline("final_clean_students_14k.csv")
     data = predictor.load_data("final_clean_students_14k.csv")
     
-    # Create labels
-    labels = predictor.create_dropout_labels()
-    
-    # Prepare features and train
-    X, y = predictor.prepare_features()
-    model = predictor.train_model(X, y)
-    
     # Get feature importance
     importance = predictor.get_feature_importance()
     
@@ -0,0 +1,118 @@
+# ================================================================
+# Risk Transition Events
+# Diffs old/new risk tables and buffers the changes for SSE clients
+# ================================================================
+
+import json
+import threading
+from collections import deque
+from datetime import datetime
+
+import pandas as pd
+
+RISK_TABLE_COLUMNS = ['Name', 'Department', 'Mentor_ID', 'risk_score', 'risk_level', 'confidence']
+# P(medium or high risk); rows restored from storage or merged from uploads get it lazily
+RISK_PROBABILITY = 'risk_probability'
+
+
+def build_risk_table(predictor, students_df):
+    """Score every student once and keep the fields notifications and charts need"""
+    predictions = predictor.predict_batch(students_df)
+    table = pd.concat([students_df[['Student_ID', 'Name', 'Department', 'Mentor_ID']], predictions], axis=1)
+    table[RISK_PROBABILITY] = (1 - table['prob_low_risk']).astype('float32')
+    return table.set_index('Student_ID')[RISK_TABLE_COLUMNS + [RISK_PROBABILITY]]
+
+
+def diff_risk_tables(old_table, new_table):
+    """Compare two risk tables and group the risk transitions by mentor"""
+    merged = new_table.join(old_table[['risk_score', 'risk_level']], rsuffix='_old', how='left')
+
+    # Existing students whose level moved, plus new students arriving at Medium/High
+    is_new = merged['risk_score_old'].isna()
+    changed = merged[(~is_new & (merged['risk_score'] != merged['risk_score_old'])) |
+                     (is_new & (merged['risk_score'] > 0))]
+
+    groups = []
+    for mentor_id, rows in changed.groupby('Mentor_ID', sort=True, observed=True):
+        transitions = []
+        for student_id, row in rows.iterrows():
+            name = row['Name'] if isinstance(row['Name'], str) else student_id
+            previous = None if pd.isna(row['risk_level_old']) else row['risk_level_old']
+            transitions.append({
+                'student_id': student_id,
+                'name': name,
+                'department': row['Department'] if isinstance(row['Department'], str) else None,
+                'from': previous,
+                'to': row['risk_level'],
+                'direction': 'up' if previous is None or row['risk_score'] > row['risk_score_old'] else 'down',
+                'message': f"{name} moved {previous or 'New'} → {row['risk_level']}"
+            })
+        groups.append({
+            'mentor_id': mentor_id,
+            'escalations': sum(t['direction'] == 'up' for t in transitions),
+            'transitions': transitions
+        })
+    return groups
+
+
+def format_sse(event):
+    """Serialize one buffered event in text/event-stream framing"""
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
+
+
+class RiskEventLog:
+    """Bounded, thread-safe log of risk events with monotonically increasing ids"""
+
+    def __init__(self, maxlen=1000):
+        self._events = deque(maxlen=maxlen)
+        self._last_id = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    @property
+    def last_id(self):
+        return self._last_id
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def close(self):
+        """Wake every waiting stream so it can end; clients reconnect to the tenant's next log"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def publish(self, groups, reason):
+        """Append one event per mentor group and wake up waiting streams"""
+        timestamp = datetime.now().isoformat()
+        with self._cond:
+            for group in groups:
+                self._last_id += 1
+                self._events.append({
+                    'id': self._last_id,
+                    'type': 'risk_change',
+                    'mentor_id': group['mentor_id'],
+                    'data': dict(group, reason=reason, timestamp=timestamp)
+                })
+            self._cond.notify_all()
+        return len(groups)
+
+    def since(self, last_id):
+        """Events after last_id, led by a reset marker if some can't be replayed"""
+        with self._cond:
+            oldest_id = self._events[0]['id'] if self._events else self._last_id + 1
+            # Ids from before a server restart are unknown here, replay the whole buffer
+            cursor = 0 if last_id > self._last_id else last_id
+            events = [e for e in self._events if e['id'] > cursor]
+
+        if cursor != last_id or cursor < oldest_id - 1:
+            reset = {'id': cursor, 'type': 'reset',
+                     'data': {'reason': 'missed events, refetch students', 'oldest_id': oldest_id}}
+            events.insert(0, reset)
+        return events
+
+    def wait(self, last_id, timeout):
+        """Block until an event newer than last_id exists, the log is closed or the timeout passes"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._last_id > last_id or self._closed, timeout)
@@ -0,0 +1,102 @@
+# ================================================================
+# Search Index
+# Type-ahead over names and roll numbers, exact Student_ID lookup
+# ================================================================
+
+import bisect
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+_PREFIX_END = '\U0010ffff'
+
+
+class PrefixIndex:
+    """Sorted distinct keys, each key's row positions stored contiguously in key order"""
+
+    def __init__(self, keys, rows):
+        # Sort only the distinct keys (names repeat a lot), then order rows by key rank
+        codes, uniques = pd.factorize(np.array(keys, dtype=object))
+        order = sorted(range(len(uniques)), key=uniques.__getitem__)
+        ranks = np.empty(len(uniques), dtype=np.int64)
+        ranks[order] = np.arange(len(uniques))
+
+        key_ranks = ranks[codes]
+
+        self.keys = [uniques[i] for i in order]
+        self.rows = np.asarray(rows, dtype=np.int32)[np.argsort(key_ranks, kind='stable')]
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(key_ranks, minlength=len(self.keys)))])
+
+    def prefix(self, prefix):
+        """Row positions of every key starting with prefix, in key order"""
+        lo = bisect.bisect_left(self.keys, prefix)
+        hi = bisect.bisect_left(self.keys, prefix + _PREFIX_END, lo)
+        return self.rows[self.offsets[lo]:self.offsets[hi]]
+
+
+def word_suffixes(values):
+    """("priya reddy", row), ("reddy", row), ... so a query can start at any word"""
+    keys, rows = [], []
+    for row, value in enumerate(values):
+        value = value.lower().strip() if isinstance(value, str) else ''
+        start = 0
+        while True:
+            keys.append(value[start:])
+            rows.append(row)
+            start = value.find(' ', start) + 1
+            if not start:
+                break
+    return keys, rows
+
+
+class SearchIndex:
+    """Snapshot of the roster for type-ahead; rebuilt when the dataset version changes"""
+
+    def __init__(self, frame, risk):
+        self.ids = frame.index.to_numpy(object)
+        self.names = frame['Name'].to_numpy(object)
+        self.roll_numbers = frame['Roll_No'].to_numpy(object)
+        self.departments = frame['Department'].astype(object).to_numpy()
+        risk = risk.reindex(frame.index)
+        self.risk_scores = risk['risk_score'].to_numpy()
+        self.risk_levels = risk['risk_level'].to_numpy(object)
+        self.confidences = risk['confidence'].to_numpy()
+
+        self.by_id = dict(zip([str(student_id).lower() for student_id in self.ids], range(len(self.ids))))
+        self.by_roll = PrefixIndex([str(roll).lower() for roll in self.roll_numbers], np.arange(len(self.ids)))
+        self.by_name = PrefixIndex(*word_suffixes(self.names))
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        """Exact Student_ID first, then roll-number and name prefix matches, without repeats"""
+        query = ' '.join(query.lower().split())
+        if not query:
+            return []
+
+        matches, seen = [], set()
+        exact = self.by_id.get(query)
+        if exact is not None:
+            matches.append((exact, 'student_id'))
+            seen.add(exact)
+        for matched_on, index in (('roll_no', self.by_roll), ('name', self.by_name)):
+            for row in index.prefix(query):
+                if len(matches) >= limit:
+                    break
+                if row not in seen:
+                    seen.add(row)
+                    matches.append((row, matched_on))
+        return [self.result(row, matched_on) for row, matched_on in matches[:limit]]
+
+    def result(self, row, matched_on):
+        risk_score = self.risk_scores[row]
+        return {
+            'Student_ID': self.ids[row],
+            'Name': self.names[row],
+            'Roll_No': self.roll_numbers[row],
+            'Department': self.departments[row],
+            'dropout_risk': None if pd.isna(risk_score) else int(risk_score),
+            'risk_level': None if pd.isna(risk_score) else self.risk_levels[row],
+            'confidence': None if pd.isna(risk_score) else float(self.confidences[row]),
+            'matched_on': matched_on
+        }
@@ -0,0 +1,207 @@
+# ================================================================
+# What-If Simulation
+# Counterfactual risk for a cohort under one or more interventions, scored in one batch
+# ================================================================
+
+import math
+
+import numpy as np
+
+from validation import VALUE_RANGES
+
+# How an intervention changes a feature: override, shift, or raise/lower to a bound
+OPERATIONS = ('set', 'add', 'at_least', 'at_most')
+MAX_INTERVENTIONS = 10
+# Baseline plus counterfactual rows one request may score
+MAX_SIMULATED_ROWS = 2000000
+# Students listed individually in a response; the aggregate always covers everyone
+DEFAULT_STUDENT_LIMIT = 100
+MAX_STUDENT_LIMIT = 1000
+
+
+class SimulationError(ValueError):
+    """An intervention that names an unknown feature, operation or category"""
+
+
+class Intervention:
+    """A named set of feature changes applied to every selected student"""
+
+    def __init__(self, name, changes):
+        self.name = name
+        self.changes = changes  # [(operation, feature, value)]
+
+    def apply(self, X, predictor):
+        """Counterfactual copy of an encoded matrix (unscaled, in the trained layout)"""
+        X = X.copy(order='K')
+        for operation, feature, value in self.changes:
+            if feature in predictor.ONE_HOT_PREFIXES:
+                # Categorical override: switch the whole one-hot group to the new category
+                group = dict((category, i) for i, category in predictor.one_hot_columns()[feature])
+                X[:, list(group.values())] = 0
+                X[:, group[value]] = 1
+                continue
+
+            i = predictor.feature_columns.index(feature)
+            if operation == 'set':
+                X[:, i] = value
+            elif operation == 'add':
+                X[:, i] += value
+            elif operation == 'at_least':
+                X[:, i] = np.fmax(X[:, i], value)
+            else:
+                X[:, i] = np.fmin(X[:, i], value)
+            # Keep counterfactuals inside what an upload could contain (e.g. attendance <= 100)
+            low, high = VALUE_RANGES.get(feature, (None, None))
+            if low is not None or high is not None:
+                X[:, i] = np.clip(X[:, i], low, high)
+        return X
+
+
+def parse_interventions(specs, predictor):
+    """Interventions from [{"name": ..., "set": {...}, "add": {...}, ...}], checked against the model"""
+    if not isinstance(specs, list) or not specs:
+        raise SimulationError('Provide "interventions": [{"name": ..., "set" | "add" | "at_least" | "at_most": {...}}]')
+    if len(specs) > MAX_INTERVENTIONS:
+        raise SimulationError(f"At most {MAX_INTERVENTIONS} interventions per request")
+
+    interventions = []
+    for position, spec in enumerate(specs):
+        if not isinstance(spec, dict):
+            raise SimulationError(f"Intervention {position} must be an object")
+        name = str(spec.get('name') or f"intervention_{position + 1}")
+        changes = []
+        for operation in OPERATIONS:
+            features = spec.get(operation) or {}
+            if not isinstance(features, dict):
+                raise SimulationError(f"Intervention {name}: {operation} must map features to values")
+            for feature, value in features.items():
+                changes.append((operation, feature, check_change(operation, feature, value, predictor)))
+        if not changes:
+            raise SimulationError(f"Intervention {name} changes nothing: use one of {', '.join(OPERATIONS)}")
+        interventions.append(Intervention(name, changes))
+
+    names = [intervention.name for intervention in interventions]
+    if len(set(names)) < len(names):
+        raise SimulationError('Intervention names must be unique')
+    return interventions
+
+
+def parse_limit(value):
+    """Students to list individually, clamped to [0, MAX_STUDENT_LIMIT]"""
+    if value is None:
+        return DEFAULT_STUDENT_LIMIT
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise SimulationError('"limit" must be an integer')
+    return min(max(value, 0), MAX_STUDENT_LIMIT)
+
+
+def parse_student_ids(value):
+    """Requested student IDs, or None to select by the listing filters"""
+    if value is None:
+        return None
+    if not isinstance(value, list) or any(isinstance(v, bool) or not isinstance(v, (str, int)) for v in value):
+        raise SimulationError('"student_ids" must be a list of student IDs')
+    return value
+
+
+def check_change(operation, feature, value, predictor):
+    if feature in predictor.ONE_HOT_PREFIXES:
+        known = [category for _, category in predictor.one_hot_columns()[feature]]
+        if operation != 'set':
+            raise SimulationError(f"{feature} is categorical: only 'set' applies")
+        if value not in known:
+            raise SimulationError(f"Unknown {feature} '{value}': expected one of {', '.join(known)}")
+        return value
+    if feature not in predictor.NUMERIC_FEATURES:
+        raise SimulationError(f"Unknown feature {feature}")
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise SimulationError(f"{operation} {feature} needs a finite number")
+    return float(value)
+
+
+def simulate(predictor, students_df, interventions):
+    """Baseline and counterfactual risk of every student under each intervention
+
+    All counterfactual matrices are stacked and scored in one model call; rows an
+    intervention leaves unchanged reuse the baseline instead of being re-scored.
+    Returns (baseline, {name: outcome}) with risk_score and risk_probability arrays.
+    """
+    if not len(students_df):
+        empty = {'risk_score': np.array([], dtype=int), 'risk_probability': np.array([])}
+        return empty, {i.name: dict(empty, changed_inputs=np.array([], dtype=bool)) for i in interventions}
+
+    X = predictor.encode_features(students_df)
+    counterfactuals = [intervention.apply(X, predictor) for intervention in interventions]
+    changed = [np.any(X_k != X, axis=1) for X_k in counterfactuals]
+
+    risk_score, proba = predictor.predict_encoded(np.vstack([X, *[X_k[c] for X_k, c in zip(counterfactuals, changed)]]))
+    risk_probability = 1 - proba[:, 0]
+
+    n = len(X)
+    baseline = {'risk_score': risk_score[:n], 'risk_probability': risk_probability[:n]}
+    outcomes = {}
+    start = n
+    for intervention, rows in zip(interventions, changed):
+        end = start + int(rows.sum())
+        outcome = {name: values.copy() for name, values in baseline.items()}
+        outcome['risk_score'][rows] = risk_score[start:end]
+        outcome['risk_probability'][rows] = risk_probability[start:end]
+        outcome['changed_inputs'] = rows
+        outcomes[intervention.name] = outcome
+        start = end
+    return baseline, outcomes
+
+
+def risk_distribution(risk_score, labels):
+    counts = np.bincount(risk_score, minlength=len(labels))
+    return {label.lower().replace(' ', '_'): int(count) for label, count in zip(labels, counts)}
+
+
+def summarize(baseline, outcome, labels):
+    """Cohort-wide effect of one intervention"""
+    before, after = baseline['risk_score'], outcome['risk_score']
+    change = outcome['risk_probability'] - baseline['risk_probability']
+    moved = before != after
+    transitions = {}
+    if moved.any():
+        pairs, counts = np.unique(np.stack([before[moved], after[moved]]), axis=1, return_counts=True)
+        transitions = {f"{labels[a]} -> {labels[b]}": int(count) for (a, b), count in zip(pairs.T, counts)}
+    return {
+        'students': int(len(before)),
+        'changed_inputs': int(outcome['changed_inputs'].sum()),
+        'mean_risk_probability': {
+            'before': round(float(baseline['risk_probability'].mean()), 4) if len(before) else None,
+            'after': round(float(outcome['risk_probability'].mean()), 4) if len(before) else None
+        },
+        'mean_change': round(float(change.mean()), 4) if len(before) else None,
+        'improved': int((after < before).sum()),
+        'worsened': int((after > before).sum()),
+        'risk_distribution': {
+            'before': risk_distribution(before, labels),
+            'after': risk_distribution(after, labels)
+        },
+        'transitions': transitions
+    }
+
+
+def student_results(ids, names, baseline, outcomes, labels, limit):
+    """Per-student before/after, largest risk drop under any intervention first"""
+    if not outcomes:
+        return []
+    changes = np.stack([outcome['risk_probability'] - baseline['risk_probability'] for outcome in outcomes.values()])
+    order = np.argsort(changes.min(axis=0), kind='stable')[:limit]
+    results = []
+    for row in order.tolist():
+        results.append({
+            'Student_ID': ids[row],
+            'Name': names[row],
+            'baseline': {'risk_level': labels[baseline['risk_score'][row]],
+                         'risk_probability': round(float(baseline['risk_probability'][row]), 4)},
+            'interventions': {
+                name: {'risk_level': labels[outcome['risk_score'][row]],
+                       'risk_probability': round(float(outcome['risk_probability'][row]), 4),
+                       'change': round(float(outcome['risk_probability'][row] - baseline['risk_probability'][row]), 4)}
+                for name, outcome in outcomes.items()
+            }
+        })
+    return results
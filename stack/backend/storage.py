@@ -0,0 +1,203 @@
+# ================================================================
+# Storage Backends
+# Persistence for students, predictions and model versions
+# ================================================================
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+# Column layout of final_clean_students_14k.csv
+STUDENT_SCHEMA = [
+    ('Student_ID', 'TEXT PRIMARY KEY'),
+    ('Name', 'TEXT'),
+    ('Roll_No', 'TEXT'),
+    ('Department', 'TEXT'),
+    ('Semester', 'INTEGER'),
+    ('Mentor_ID', 'TEXT'),
+    ('Attendance_Percentage', 'REAL'),
+    ('Monthly_Attendance', 'REAL'),
+    ('Avg_Test_Score', 'REAL'),
+    ('Last_Test_Score', 'REAL'),
+    ('Subjects_Failed', 'INTEGER'),
+    ('Attempts_Exhausted', 'INTEGER'),
+    ('Fee_Total', 'INTEGER'),
+    ('Fee_Paid', 'INTEGER'),
+    ('Fee_Due_Amount', 'INTEGER'),
+    ('Fee_Status', 'TEXT'),
+    ('Fee_Due_Days', 'INTEGER'),
+    ('Scholarship_Eligibility', 'TEXT'),
+    ('Attendance_Flag', 'INTEGER'),
+    ('Score_Flag', 'INTEGER'),
+    ('Attempts_Flag', 'INTEGER'),
+    ('Fee_Flag', 'INTEGER'),
+    ('Total_Risk_Flags', 'INTEGER')
+]
+STUDENT_COLUMNS = [name for name, _ in STUDENT_SCHEMA]
+PREDICTION_COLUMNS = ['risk_score', 'risk_level', 'confidence']
+
+# Filters accepted by query_students, mapped to their indexed column
+QUERY_FILTERS = {
+    'department': 's.Department',
+    'mentor_id': 's.Mentor_ID',
+    'semester': 's.Semester',
+    'risk_level': 'p.risk_score'
+}
+
+
+def open_storage(url):
+    """Build the storage backend named by a STORAGE_URL (sqlite:///path or none)"""
+    if not url or url == 'none':
+        return None
+    if url.startswith('sqlite:///'):
+        return SQLiteStorage(url[len('sqlite:///'):])
+    raise ValueError(f"Unsupported storage url: {url}")
+
+
+def _records(df, columns):
+    """Rows as plain Python values, with NaN turned into NULL"""
+    df = df.reindex(columns=columns).astype(object)
+    return df.where(df.notna(), None).values.tolist()
+
+
+class StorageBackend:
+    """Interface the dataset store persists through"""
+
+    def load_students(self):
+        raise NotImplementedError
+
+    def save_students(self, students_df):
+        raise NotImplementedError
+
+    def load_predictions(self, model_version):
+        raise NotImplementedError
+
+    def save_predictions(self, risk_df, model_version):
+        raise NotImplementedError
+
+    def register_model_version(self, model_path, predictor=None):
+        raise NotImplementedError
+
+    def query_students(self, filters, limit, offset):
+        raise NotImplementedError
+
+
+class SQLiteStorage(StorageBackend):
+    """Embedded SQLite store in WAL mode, indexed for the dashboard's filters"""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._create_schema()
+
+    @property
+    def conn(self):
+        # sqlite3 connections are per thread; WAL lets readers run alongside the writer
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _create_schema(self):
+        columns = ', '.join(f'"{name}" {sql_type}' for name, sql_type in STUDENT_SCHEMA)
+        with self.conn:
+            self.conn.executescript(f'''
+                CREATE TABLE IF NOT EXISTS students ({columns});
+                CREATE TABLE IF NOT EXISTS predictions (
+                    Student_ID TEXT PRIMARY KEY,
+                    model_version INTEGER,
+                    risk_score INTEGER,
+                    risk_level TEXT,
+                    confidence REAL
+                );
+                CREATE TABLE IF NOT EXISTS model_versions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    fingerprint TEXT UNIQUE,
+                    model_path TEXT,
+                    model_type TEXT,
+                    feature_columns TEXT,
+                    created_at TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_students_department ON students(Department);
+                CREATE INDEX IF NOT EXISTS idx_students_mentor ON students(Mentor_ID);
+                CREATE INDEX IF NOT EXISTS idx_students_semester ON students(Semester);
+                CREATE INDEX IF NOT EXISTS idx_predictions_risk ON predictions(risk_score);
+            ''')
+
+    def load_students(self):
+        """All stored students, or None when nothing has been saved yet"""
+        students = pd.read_sql_query('SELECT * FROM students', self.conn)
+        return students if len(students) else None
+
+    def save_students(self, students_df):
+        """Bulk upsert student rows in a single transaction"""
+        placeholders = ', '.join('?' for _ in STUDENT_COLUMNS)
+        updates = ', '.join(f'"{c}" = excluded."{c}"' for c in STUDENT_COLUMNS[1:])
+        with self.conn:
+            self.conn.executemany(
+                f'INSERT INTO students VALUES ({placeholders}) '
+                f'ON CONFLICT(Student_ID) DO UPDATE SET {updates}',
+                _records(students_df, STUDENT_COLUMNS)
+            )
+
+    def load_predictions(self, model_version):
+        """Stored predictions made by the given model version, indexed by Student_ID"""
+        return pd.read_sql_query(
+            'SELECT Student_ID, risk_score, risk_level, confidence FROM predictions WHERE model_version = ?',
+            self.conn, params=(model_version,), index_col='Student_ID'
+        )
+
+    def save_predictions(self, risk_df, model_version):
+        """Bulk upsert prediction rows (risk table indexed by Student_ID)"""
+        rows = _records(risk_df.reset_index(), ['Student_ID'] + PREDICTION_COLUMNS)
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?, ?)',
+                [[row[0], model_version] + row[1:] for row in rows]
+            )
+
+    def register_model_version(self, model_path, predictor=None):
+        """Id of the model file's version, registering it the first time it is seen"""
+        with open(model_path, 'rb') as f:
+            fingerprint = hashlib.sha256(f.read()).hexdigest()
+
+        row = self.conn.execute('SELECT id FROM model_versions WHERE fingerprint = ?', (fingerprint,)).fetchone()
+        if row:
+            return row[0]
+
+        with self.conn:
+            cursor = self.conn.execute(
+                'INSERT INTO model_versions (fingerprint, model_path, model_type, feature_columns, created_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (fingerprint, os.path.abspath(model_path),
+                 type(predictor.model).__name__ if predictor else None,
+                 json.dumps(predictor.feature_columns) if predictor else None,
+                 datetime.now().isoformat())
+            )
+        return cursor.lastrowid
+
+    def query_students(self, filters, limit, offset):
+        """One filtered page of students joined with their predictions, plus the match count"""
+        clauses, params = [], []
+        for key, value in filters.items():
+            if value is not None and key in QUERY_FILTERS:
+                clauses.append(f'{QUERY_FILTERS[key]} = ?')
+                params.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        join = 'FROM students s JOIN predictions p ON p.Student_ID = s.Student_ID'
+
+        total = self.conn.execute(f'SELECT COUNT(*) {join} {where}', params).fetchone()[0]
+        page = pd.read_sql_query(
+            f'SELECT s.*, p.risk_score, p.risk_level, p.confidence {join} {where} '
+            f'ORDER BY s.Student_ID LIMIT ? OFFSET ?',
+            self.conn, params=params + [limit, offset]
+        )
+        return page, total
@@ -0,0 +1,157 @@
+# ================================================================
+# Tenant Registry
+# Per-institution models and datasets, loaded lazily with LRU eviction
+# ================================================================
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from metrics import metrics
+
+metrics.describe('tenant_loads_total', 'counter', 'Tenant models and datasets loaded into memory')
+metrics.describe('tenant_evictions_total', 'counter', 'Tenants evicted to stay within the memory budget')
+metrics.describe('tenant_load_duration_seconds', 'histogram', 'Time to load one tenant (model, data, scoring)')
+metrics.describe('tenant_requests_total', 'counter', 'Requests served per tenant')
+metrics.describe('tenant_memory_bytes', 'gauge', 'Estimated memory held by each loaded tenant')
+metrics.describe('tenant_eviction_blocked_total', 'counter',
+                 'Evictions skipped because the tenant holds changes that exist only in memory')
+
+
+class Tenant:
+    """Everything one institution's requests need: model, roster store and event stream"""
+
+    def __init__(self, tenant_id, predictor, ews, store, batcher, event_log, model_path, model_variant):
+        self.tenant_id = tenant_id
+        self.predictor = predictor
+        self.ews = ews
+        self.store = store
+        self.batcher = batcher
+        self.event_log = event_log
+        self.model_path = model_path
+        self.model_variant = model_variant
+        self.memory_bytes = 0
+        self._reload_lock = threading.Lock()
+
+    def estimate_memory(self):
+        """Roster frame + risk table (deep) + pickled model size, in bytes"""
+        size = os.path.getsize(self.model_path) if os.path.exists(self.model_path) else 0
+        for frame in (self.store.frame, self.store.risk):
+            if frame is not None:
+                size += int(frame.memory_usage(deep=True).sum())
+        self.memory_bytes = size
+        return size
+
+    def use_predictor(self, predictor, model_version=None):
+        """Serve a newly loaded model, returning the previous risk table
+
+        The old predictor is never modified: requests already holding it finish on it,
+        and the roster is re-scored with the new one before anything else switches.
+        """
+        with self._reload_lock:
+            old_risk = self.store.rescore(predictor, model_version)
+            self.ews.predictor = predictor
+            self.batcher.predictor = predictor
+            self.predictor = predictor
+            return old_risk
+
+    @property
+    def evictable(self):
+        """False once uploads changed a roster that has no storage to reload it from"""
+        return not self.store.unsaved_changes
+
+    def close(self):
+        self.batcher.close()
+        self.event_log.close()
+
+
+def load_tenant_configs(path):
+    """{tenant_id: {data_path, model_path, storage_url, model_variant}} with paths relative to the file"""
+    with open(path) as f:
+        configs = json.load(f)
+    base = os.path.dirname(os.path.abspath(path))
+    for config in configs.values():
+        for key in ('data_path', 'model_path'):
+            if key in config:
+                config[key] = os.path.join(base, config[key])
+        url = config.get('storage_url', 'none')
+        if url.startswith('sqlite:///') and not os.path.isabs(url[len('sqlite:///'):]):
+            url = 'sqlite:///' + os.path.join(base, url[len('sqlite:///'):])
+        config['storage_url'] = url
+    return configs
+
+
+class TenantRegistry:
+    """Loads tenants on first use and evicts the least recently used ones beyond a memory budget"""
+
+    def __init__(self, configs, loader, memory_budget_bytes):
+        self.configs = configs
+        self.loader = loader  # (tenant_id, config) -> Tenant
+        self.memory_budget = memory_budget_bytes
+        self._loaded = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks = {}
+
+    def loaded(self):
+        with self._lock:
+            return list(self._loaded)
+
+    def peek(self, tenant_id):
+        """A loaded tenant without loading or touching its LRU position"""
+        with self._lock:
+            return self._loaded.get(tenant_id)
+
+    def get(self, tenant_id):
+        """The tenant's state, loading it (and evicting others) if needed; KeyError if unknown"""
+        with self._lock:
+            tenant = self._loaded.get(tenant_id)
+            if tenant is None:
+                if tenant_id not in self.configs:
+                    raise KeyError(tenant_id)
+                load_lock = self._load_locks.setdefault(tenant_id, threading.Lock())
+            else:
+                self._loaded.move_to_end(tenant_id)
+
+        if tenant is None:
+            # One loader per tenant; requests for other tenants keep flowing meanwhile
+            with load_lock:
+                tenant = self.peek(tenant_id)
+                if tenant is None:
+                    tenant = self._load(tenant_id)
+
+        metrics.inc('tenant_requests_total', tenant=tenant_id)
+        return tenant
+
+    def _load(self, tenant_id):
+        start = time.perf_counter()
+        tenant = self.loader(tenant_id, self.configs[tenant_id])
+        metrics.observe('tenant_load_duration_seconds', time.perf_counter() - start, tenant=tenant_id)
+        metrics.inc('tenant_loads_total', tenant=tenant_id)
+        metrics.set('tenant_memory_bytes', tenant.estimate_memory(), tenant=tenant_id)
+        print(f"🏫 Loaded tenant {tenant_id} ({tenant.memory_bytes / 2**20:.1f} MB)")
+
+        with self._lock:
+            self._loaded[tenant_id] = tenant
+            self._evict_over_budget(keep=tenant_id)
+        return tenant
+
+    def _evict_over_budget(self, keep):
+        """Drop least recently used tenants until the estimate fits (the newest one always stays)
+
+        Tenants with in-memory-only changes are never dropped, even if that leaves
+        the registry over budget; give them a storage_url to make them evictable.
+        """
+        while sum(t.memory_bytes for t in self._loaded.values()) > self.memory_budget:
+            candidates = [tid for tid in self._loaded if tid != keep]
+            victim_id = next((tid for tid in candidates if self._loaded[tid].evictable), None)
+            if victim_id is None:
+                for tid in candidates:
+                    metrics.inc('tenant_eviction_blocked_total', tenant=tid)
+                return
+            victim = self._loaded.pop(victim_id)
+            victim.close()
+            metrics.inc('tenant_evictions_total', tenant=victim_id)
+            metrics.set('tenant_memory_bytes', 0, tenant=victim_id)
+            print(f"♻️ Evicted tenant {victim_id} to stay within the memory budget")
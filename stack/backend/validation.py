@@ -0,0 +1,127 @@
+# ================================================================
+# Upload Validation
+# Whole-batch schema checks and coercion before anything is scored
+# ================================================================
+
+import numpy as np
+import pandas as pd
+
+from metrics import metrics
+
+metrics.describe('validation_rejected_rows_total', 'counter', 'Uploaded rows rejected by schema validation')
+
+# Inclusive (low, high) bounds; None leaves that side open
+VALUE_RANGES = {
+    'Attendance_Percentage': (0, 100),
+    'Monthly_Attendance': (0, 100),
+    'Avg_Test_Score': (0, 100),
+    'Last_Test_Score': (0, 100),
+    'Subjects_Failed': (0, None),
+    'Attempts_Exhausted': (0, None),
+    'Fee_Due_Days': (0, None),
+    'Semester': (1, None),
+}
+
+# Counts and ordinals: a fractional value is as wrong as an out-of-range one
+INTEGER_COLUMNS = ('Subjects_Failed', 'Attempts_Exhausted', 'Fee_Due_Days', 'Semester')
+
+# Rows listed individually in a report; the per-check summary always covers every row
+MAX_REPORTED_ROWS = 1000
+
+
+class ValidationResult:
+    """Coerced valid rows plus a compact report of the rejected ones"""
+
+    def __init__(self, valid, missing_columns=(), errors=(), summary=None, rejected_count=0):
+        self.valid = valid
+        self.missing_columns = list(missing_columns)
+        self.errors = list(errors)
+        self.summary = summary or {}
+        self.rejected_count = rejected_count
+
+    def report(self):
+        return {
+            'rejected_count': self.rejected_count,
+            'summary': self.summary,
+            'errors': self.errors,
+            'truncated': self.rejected_count > len(self.errors)
+        }
+
+
+def known_categories(predictor):
+    """{column: categories} the trained model has a one-hot column for"""
+    return {col: [category for _, category in encoded] for col, encoded in predictor.one_hot_columns().items()}
+
+
+def validate_students(students_df, predictor, required=()):
+    """Check a whole upload at once: required columns, numeric coercion, ranges and known categories"""
+    numeric_columns = list(predictor.NUMERIC_FEATURES)
+    categories = known_categories(predictor)
+    missing = [c for c in [*required, *numeric_columns, *categories] if c not in students_df.columns]
+    if missing:
+        return ValidationResult(students_df.iloc[:0], missing_columns=missing)
+
+    coerced = {}
+    checks = []   # (column, problem) per column of the failure matrix
+    failures = []
+    for col in required:
+        checks.append((col, 'missing'))
+        failures.append(students_df[col].isna().to_numpy())
+
+    for col in numeric_columns:
+        raw = students_df[col]
+        values = pd.to_numeric(raw, errors='coerce')
+        absent = raw.isna().to_numpy()
+        # '1e999' parses to infinity, which no model input can hold
+        finite = np.isfinite(values.to_numpy(dtype='float64', na_value=np.nan))
+        unparsed = ~finite & ~absent
+        low, high = VALUE_RANGES.get(col, (None, None))
+        out_of_range = np.zeros(len(values), dtype=bool)
+        if low is not None:
+            out_of_range |= (values < low).to_numpy() & finite
+        if high is not None:
+            out_of_range |= (values > high).to_numpy() & finite
+        checks += [(col, 'missing'), (col, 'not_numeric'), (col, 'out_of_range')]
+        failures += [absent, unparsed, out_of_range]
+        if col in INTEGER_COLUMNS:
+            checks.append((col, 'not_integer'))
+            failures.append(finite & (values % 1 != 0).to_numpy())
+        coerced[col] = values
+
+    for col, known in categories.items():
+        # One hash pass; only rows that miss the known set are checked for nulls
+        raw = students_df[col]
+        unknown = ~raw.isin(known).to_numpy()
+        absent = np.zeros(len(raw), dtype=bool)
+        absent[unknown] = raw[unknown].isna().to_numpy()
+        checks += [(col, 'missing'), (col, 'unknown_category')]
+        failures += [absent, unknown & ~absent]
+
+    invalid = np.zeros(len(students_df), dtype=bool)
+    summary = {}
+    for (col, problem), failed in zip(checks, failures):
+        count = int(np.count_nonzero(failed))
+        if count:
+            invalid |= failed
+            summary.setdefault(col, {})[problem] = count
+
+    # Only the first rejected rows are spelled out, as {column: problem}
+    reported = np.flatnonzero(invalid)[:MAX_REPORTED_ROWS]
+    if 'Student_ID' in students_df.columns:
+        ids = students_df['Student_ID'].iloc[reported].tolist()
+    else:
+        ids = [None] * len(reported)
+    matrix = np.column_stack([failed[reported] for failed in failures])
+    errors = []
+    for row, student_id, failed in zip(reported.tolist(), ids, matrix.tolist()):
+        entry = {'row': row}
+        if not pd.isna(student_id):
+            entry['Student_ID'] = student_id
+        entry['errors'] = {checks[i][0]: checks[i][1] for i, bad in enumerate(failed) if bad}
+        errors.append(entry)
+
+    rejected_count = int(invalid.sum())
+    if rejected_count:
+        metrics.inc('validation_rejected_rows_total', rejected_count)
+    valid = students_df[~invalid].assign(**{col: values[~invalid] for col, values in coerced.items()})
+    return ValidationResult(valid, errors=errors, summary=summary, rejected_count=rejected_count)
@@ -0,0 +1,102 @@
+# ================================================================
+# Bulk Prediction Benchmark
+# Rows/sec of /api/predict/bulk per payload format, against row-wise uploads
+# ================================================================
+
+import argparse
+import importlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+from datetime import datetime
+
+import numpy as np
+
+from bench_pipeline import RESULTS_DIR, git_commit, timed
+from synthetic_cohort import generate_cohort
+from param_ml_pipeline import DropoutPredictor
+
+TEXT_COLUMNS = ['Student_ID', 'Department', 'Fee_Status']
+
+
+def payloads(cohort):
+    """{name: (path, body, content type, accept)} carrying the same students"""
+    columns = DropoutPredictor.NUMERIC_FEATURES + TEXT_COLUMNS
+    npz = io.BytesIO()
+    np.savez(npz, **{col: cohort[col].to_numpy(dtype=str if col in TEXT_COLUMNS else None) for col in columns})
+    columnar_json = json.dumps({'columns': {col: cohort[col].tolist() for col in columns}}).encode()
+    records_json = json.dumps({'data': json.loads(cohort[columns].to_json(orient='records'))}).encode()
+    return {
+        'bulk json -> json': ('/api/predict/bulk', columnar_json, 'application/json', 'application/json'),
+        'bulk npz -> npz': ('/api/predict/bulk', npz.getvalue(), 'application/x-npz', 'application/x-npz'),
+        'upload-data records': ('/api/upload-data', records_json, 'application/json', 'application/json'),
+    }
+
+
+def bench_formats(client, cohort, repeats):
+    results = {}
+    for name, (path, body, content_type, accept) in payloads(cohort).items():
+        samples = []
+        for _ in range(repeats):
+            response, seconds = timed(client.post, path, data=body, content_type=content_type,
+                                      headers={'Accept': accept})
+            assert response.status_code == 200, response.data[:200]
+            samples.append(seconds)
+        seconds = float(np.median(samples))
+        results[name] = {
+            'median_seconds': seconds,
+            'rows_per_second': len(cohort) / seconds,
+            'request_bytes': len(body),
+            'response_bytes': len(response.data)
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput of columnar bulk prediction vs row-wise uploads")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000], help="rows per request")
+    parser.add_argument('--repeats', type=int, default=3, help="requests per format and size (median is reported)")
+    parser.add_argument('--out', default=None, help="results JSON (default: results/bulk-<timestamp>.json)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        # One trained model and roster serve every size; only the request payload changes
+        csv_path = os.path.join(workdir, 'cohort.csv')
+        model_path = os.path.join(workdir, 'model.pkl')
+        cohort = generate_cohort(max(args.sizes))
+        cohort.to_csv(csv_path, index=False)
+        os.environ.update(DATA_PATH=csv_path, ML_MODEL_PATH=model_path, STORAGE_URL='none',
+                          BULK_PREDICT_MAX_ROWS=str(max(args.sizes)), BULK_PREDICT_MAX_MB='1024')
+        sys.modules.pop('app', None)
+        app_module, _ = timed(importlib.import_module, 'app')
+        timed(app_module.init_ml)
+        client = app_module.app.test_client()
+
+        results = {}
+        for rows in args.sizes:
+            print(f"🧪 {rows:,} rows per request...")
+            results[str(rows)] = bench_formats(client, cohort.head(rows), args.repeats)
+            for name, stats in results[str(rows)].items():
+                print(f"   {name:<22} {stats['median_seconds'] * 1000:>10.1f} ms  {stats['rows_per_second']:>10,.0f} rows/s"
+                      f"  {stats['request_bytes'] / 2**20:>7.1f} MB in  {stats['response_bytes'] / 2**20:>7.1f} MB out")
+
+    report = {
+        'created_at': datetime.now().isoformat(),
+        'git_commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'results': results
+    }
+    out = args.out or os.path.join(RESULTS_DIR, f"bulk-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Results written to {out}")
+
+
+if __name__ == "__main__":
+    main()
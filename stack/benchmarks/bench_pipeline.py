@@ -0,0 +1,191 @@
+# ================================================================
+# End-to-End Benchmark Suite
+# Times every pipeline stage and API endpoint on synthetic cohorts
+# ================================================================
+
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+STACK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(STACK_DIR, 'ml'))
+sys.path.insert(0, os.path.join(STACK_DIR, 'backend'))
+
+from param_ml_pipeline import DropoutPredictor
+from synthetic_cohort import generate_cohort
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+
+def timed(fn, *args, **kwargs):
+    """Run fn with its progress prints silenced, returning (result, seconds)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        return result, time.perf_counter() - start
+
+
+def bench_stages(csv_path, model_path, single_rows=200):
+    """Time each DropoutPredictor stage on one cohort file"""
+    predictor = DropoutPredictor()
+    stages = {}
+
+    data, stages['load_data_csv'] = timed(predictor.load_data, csv_path, use_cache=False)
+    _, stages['load_data_cold_cache'] = timed(predictor.load_data, csv_path)
+    data, stages['load_data_cached'] = timed(predictor.load_data, csv_path)
+    _, stages['create_dropout_labels'] = timed(predictor.create_dropout_labels)
+    (X, y), stages['prepare_features'] = timed(predictor.prepare_features)
+    _, stages['train_model'] = timed(predictor.train_model, X, y)
+    _, stages['save_model'] = timed(predictor.save_model, model_path)
+    _, stages['predict_batch'] = timed(predictor.predict_batch, data)
+
+    sample = data.sample(min(single_rows, len(data)), random_state=0)
+    _, seconds = timed(lambda: [predictor.predict_dropout_risk(row) for _, row in sample.iterrows()])
+    stages['predict_single_row'] = seconds / len(sample)
+    _, seconds = timed(lambda: [predictor.generate_recommendations(row, None) for _, row in sample.iterrows()])
+    stages['generate_recommendations_row'] = seconds / len(sample)
+    return stages
+
+
+def bench_endpoints(csv_path, model_path, repeats):
+    """Time every API endpoint through Flask's test client against a fresh app"""
+    os.environ.update(DATA_PATH=csv_path, ML_MODEL_PATH=model_path, STORAGE_URL='none')
+    sys.modules.pop('app', None)
+    app_module, import_seconds = timed(importlib.import_module, 'app')
+    _, init_seconds = timed(app_module.init_ml)
+    startup_seconds = import_seconds + init_seconds
+    client = app_module.app.test_client()
+
+    store = app_module.tenants.get(app_module.DEFAULT_TENANT).store
+    student_id = store.frame.index[len(store.frame) // 2]
+    upload_rows = json.loads(store.students().head(100).to_json(orient='records'))
+
+    requests = {
+        'GET /api/health': lambda: client.get('/api/health'),
+        'GET /api/students': lambda: client.get('/api/students?limit=100'),
+        'GET /api/students (filtered)': lambda: client.get('/api/students?department=CSE&risk_level=2&limit=50'),
+        'GET /api/student/<id>/predict': lambda: client.get(f'/api/student/{student_id}/predict'),
+        'GET /api/priority-students': lambda: client.get('/api/priority-students'),
+        'GET /api/analytics/dashboard': lambda: client.get('/api/analytics/dashboard'),
+        'POST /api/upload-data (100 rows)': lambda: client.post('/api/upload-data', json={'data': upload_rows}),
+        'POST /api/upload-data?mode=upsert (100 rows)':
+            lambda: client.post('/api/upload-data?mode=upsert', json={'data': upload_rows}),
+    }
+
+    endpoints = {'app_startup': {'seconds': startup_seconds}}
+    for name, call in requests.items():
+        samples, statuses, sizes = [], set(), []
+        for _ in range(repeats):
+            response, seconds = timed(call)
+            samples.append(seconds * 1000)
+            statuses.add(response.status_code)
+            sizes.append(len(response.data))
+        endpoints[name] = {
+            'mean_ms': float(np.mean(samples)),
+            'p50_ms': float(np.percentile(samples, 50)),
+            'p95_ms': float(np.percentile(samples, 95)),
+            'response_bytes': int(np.mean(sizes)),
+            'status': sorted(statuses)
+        }
+    return endpoints
+
+
+def flatten(results):
+    """{'<rows>/<section>/<name>': seconds} for comparing two result files"""
+    flat = {}
+    for rows, sections in results.items():
+        for name, seconds in sections['stages'].items():
+            flat[f"{rows}/stages/{name}"] = seconds
+        for name, stats in sections.get('endpoints', {}).items():
+            flat[f"{rows}/endpoints/{name}"] = stats.get('mean_ms', stats.get('seconds', 0) * 1000) / 1000
+    return flat
+
+
+def compare(current, baseline_path, threshold):
+    """Print per-metric ratios against a previous run and return the regressions"""
+    with open(baseline_path) as f:
+        baseline = flatten(json.load(f)['results'])
+    regressions = []
+    print(f"\n📊 Compared with {baseline_path} (regression threshold {threshold:.0%})")
+    for key, seconds in flatten(current).items():
+        if key not in baseline or not baseline[key]:
+            continue
+        ratio = seconds / baseline[key]
+        marker = '🔴' if ratio > 1 + threshold else '🟢' if ratio < 1 - threshold else '  '
+        print(f"{marker} {key:<70} {baseline[key] * 1000:>10.2f}ms → {seconds * 1000:>10.2f}ms  x{ratio:.2f}")
+        if ratio > 1 + threshold:
+            regressions.append(key)
+    return regressions
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=STACK_DIR,
+                                       text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the dropout pipeline and API on synthetic cohorts")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000],
+                        help="cohort sizes to generate (e.g. 10000 100000 1000000)")
+    parser.add_argument('--repeats', type=int, default=20, help="requests per endpoint")
+    parser.add_argument('--skip-api', action='store_true', help="only time the pipeline stages")
+    parser.add_argument('--out', default=None, help="results JSON (default: results/pipeline-<timestamp>.json)")
+    parser.add_argument('--compare', default=None, help="previous results JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=0.2, help="relative slowdown counted as a regression")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for rows in args.sizes:
+            print(f"🧪 Benchmarking {rows:,} students...")
+            csv_path = os.path.join(workdir, f"cohort_{rows}.csv")
+            model_path = os.path.join(workdir, f"model_{rows}.pkl")
+            generate_cohort(rows).to_csv(csv_path, index=False)
+
+            results[rows] = {'stages': bench_stages(csv_path, model_path)}
+            for name, seconds in results[rows]['stages'].items():
+                print(f"   {name:<32} {seconds * 1000:>12.2f} ms")
+
+            if not args.skip_api:
+                results[rows]['endpoints'] = bench_endpoints(csv_path, model_path, args.repeats)
+                for name, stats in results[rows]['endpoints'].items():
+                    if 'mean_ms' in stats:
+                        print(f"   {name:<45} p50 {stats['p50_ms']:>9.2f} ms  p95 {stats['p95_ms']:>9.2f} ms")
+
+    report = {
+        'created_at': datetime.now().isoformat(),
+        'git_commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'results': {str(rows): sections for rows, sections in results.items()}
+    }
+    out = args.out or os.path.join(RESULTS_DIR, f"pipeline-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Results written to {out}")
+
+    if args.compare:
+        regressions = compare(report['results'], args.compare, args.threshold)
+        if regressions:
+            print(f"❌ {len(regressions)} regression(s) above threshold")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
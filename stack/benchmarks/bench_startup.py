@@ -0,0 +1,164 @@
+# ================================================================
+# Startup Benchmark
+# Import cost (-X importtime) and time to first healthy response of the API
+# ================================================================
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from datetime import datetime
+
+import numpy as np
+
+from bench_pipeline import RESULTS_DIR, STACK_DIR, git_commit, timed
+from load_test import free_port
+from param_ml_pipeline import DropoutPredictor
+from synthetic_cohort import generate_cohort
+
+BACKEND_DIR = os.path.join(STACK_DIR, 'backend')
+
+# eager: init_ml() before serving, like `python app.py` and asgi.py
+# lazy: import and serve only, like a WSGI server importing app:app
+# (trees from before init_ml() existed load during import either way)
+SERVER_COMMANDS = {
+    'eager': "import app; getattr(app, 'init_ml', lambda: None)(); app.app.run(host='127.0.0.1', port={port})",
+    'lazy': "import app; app.app.run(host='127.0.0.1', port={port})",
+}
+
+
+def import_profile(env, top=10):
+    """Total `import app` time and its slowest direct imports, from python -X importtime"""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'], cwd=BACKEND_DIR, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    wall_seconds = time.perf_counter() - start
+
+    modules = []   # (depth, name, self us, cumulative us)
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules.append((depth, name.strip(), int(self_us), int(cumulative_us)))
+
+    position = next(i for i, m in enumerate(modules) if m[1] == 'app')
+    app_entry = modules[position]
+    # A module's imports are listed right before it, indented one level deeper
+    app_children = []
+    for module in reversed(modules[:position]):
+        if module[0] <= app_entry[0]:
+            break
+        if module[0] == app_entry[0] + 1:
+            app_children.append(module)
+    return {
+        'process_seconds': wall_seconds,
+        'import_app_seconds': app_entry[3] / 1e6,
+        'app_module_body_seconds': app_entry[2] / 1e6,
+        'sklearn_modules': sum(1 for m in modules if m[1].split('.')[0] == 'sklearn'),
+        'slowest_imports': {name: cumulative / 1e6 for _, name, _, cumulative
+                            in sorted(app_children, key=lambda m: -m[3])[:top]}
+    }
+
+
+def wait_for(url, server, deadline):
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("API server exited during startup")
+        try:
+            with urllib.request.urlopen(url, timeout=60) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            time.sleep(0.02)
+    raise RuntimeError(f"No 200 from {url} before the timeout")
+
+
+def time_to_responses(env, mode, timeout):
+    """Seconds from process launch to the first 200 from /api/health, then from /api/students"""
+    port = free_port()
+    server = subprocess.Popen([sys.executable, '-c', SERVER_COMMANDS[mode].format(port=port)],
+                              cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    start = time.perf_counter()
+    deadline = time.time() + timeout
+    try:
+        wait_for(f"http://127.0.0.1:{port}/api/health", server, deadline)
+        healthy = time.perf_counter() - start
+        wait_for(f"http://127.0.0.1:{port}/api/students?limit=1", server, deadline)
+        return {'first_health_seconds': healthy, 'first_students_seconds': time.perf_counter() - start}
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure API import time and time to first healthy response")
+    parser.add_argument('--rows', type=int, default=14000, help="synthetic cohort size the API loads")
+    parser.add_argument('--repeats', type=int, default=5, help="process launches per measurement (median is reported)")
+    parser.add_argument('--timeout', type=float, default=300, help="seconds to wait for each server")
+    parser.add_argument('--out', default=None, help="results JSON (default: results/startup-<timestamp>.json)")
+    parser.add_argument('--compare', default=None, help="previous results JSON to compare against")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        csv_path = os.path.join(workdir, 'cohort.csv')
+        model_path = os.path.join(workdir, 'model.pkl')
+        generate_cohort(args.rows).to_csv(csv_path, index=False)
+        predictor = DropoutPredictor()
+        timed(predictor.train_pipeline, csv_path)
+        timed(predictor.save_model, model_path)
+        env = dict(os.environ, DATA_PATH=csv_path, ML_MODEL_PATH=model_path, STORAGE_URL='none')
+
+        print(f"🧪 Profiling `import app` ({args.repeats} runs)...")
+        profiles = [import_profile(env) for _ in range(args.repeats)]
+        results = {'import': dict(profiles[-1], **{
+            key: float(np.median([p[key] for p in profiles]))
+            for key in ('process_seconds', 'import_app_seconds', 'app_module_body_seconds')
+        })}
+        for mode in SERVER_COMMANDS:
+            print(f"🧪 Starting the server ({mode}, {args.repeats} runs)...")
+            runs = [time_to_responses(env, mode, args.timeout) for _ in range(args.repeats)]
+            results[mode] = {key: float(np.median([run[key] for run in runs])) for key in runs[0]}
+
+    imports = results['import']
+    print(f"\n   import app                  {imports['import_app_seconds'] * 1000:>9.1f} ms "
+          f"(module body {imports['app_module_body_seconds'] * 1000:.1f} ms, {imports['sklearn_modules']} sklearn modules)")
+    for name, seconds in imports['slowest_imports'].items():
+        print(f"     {name:<26} {seconds * 1000:>9.1f} ms")
+    for mode in SERVER_COMMANDS:
+        print(f"   {mode:<6} first /api/health     {results[mode]['first_health_seconds'] * 1000:>9.1f} ms")
+        print(f"   {mode:<6} first /api/students   {results[mode]['first_students_seconds'] * 1000:>9.1f} ms")
+
+    report = {
+        'created_at': datetime.now().isoformat(),
+        'git_commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'rows': args.rows,
+        'results': results
+    }
+    out = args.out or os.path.join(RESULTS_DIR, f"startup-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Results written to {out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        print(f"\n📊 Compared with {args.compare}")
+        for section in ('import', *SERVER_COMMANDS):
+            for key, seconds in results[section].items():
+                before = baseline.get(section, {}).get(key)
+                if isinstance(seconds, float) and before:
+                    print(f"   {section:<6} {key:<28} {before * 1000:>9.1f} ms → {seconds * 1000:>9.1f} ms  x{seconds / before:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+# ================================================================
+# Local Load Test
+# Replays a mix of API calls at fixed concurrency levels with asyncio
+# ================================================================
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from datetime import datetime
+from urllib.parse import urlsplit
+
+import numpy as np
+
+STACK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(STACK_DIR, 'ml'))
+
+from synthetic_cohort import generate_cohort
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+DEFAULT_MIX = 'students=35,predict=30,priority=10,dashboard=15,upload=5,upsert=5'
+UPLOAD_ROWS = 20
+
+
+def parse_mix(spec):
+    """'students=35,predict=30' -> {'students': 35.0, 'predict': 30.0}"""
+    mix = {}
+    for part in spec.split(','):
+        name, _, weight = part.partition('=')
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+def build_requests(cohort):
+    """Request factories for each mix entry, returning (method, path, body)"""
+    student_ids = cohort['Student_ID'].tolist()
+    departments = sorted(cohort['Department'].unique())
+    upload = json.loads(cohort.head(UPLOAD_ROWS).to_json(orient='records'))
+
+    return {
+        'students': lambda: ('GET', f"/api/students?department={random.choice(departments)}&limit=50", None),
+        'predict': lambda: ('GET', f"/api/student/{random.choice(student_ids)}/predict", None),
+        'priority': lambda: ('GET', '/api/priority-students', None),
+        'dashboard': lambda: ('GET', '/api/analytics/dashboard', None),
+        'upload': lambda: ('POST', '/api/upload-data', {'data': upload}),
+        'upsert': lambda: ('POST', '/api/upload-data?mode=upsert', {'data': upload}),
+        'health': lambda: ('GET', '/api/health', None),
+    }
+
+
+async def http_request(host, port, method, path, body=None):
+    """One HTTP/1.1 request on its own connection; returns (status, body bytes)"""
+    reader, writer = await asyncio.open_connection(host, port)
+    payload = json.dumps(body).encode() if body is not None else b''
+    head = (f"{method} {path} HTTP/1.1\r\nHost: {host}:{port}\r\nConnection: close\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n\r\n")
+    writer.write(head.encode() + payload)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    status_line, _, rest = response.partition(b'\r\n')
+    return int(status_line.split()[1]), rest.partition(b'\r\n\r\n')[2]
+
+
+async def run_level(host, port, factories, mix, concurrency, duration):
+    """Drive `concurrency` workers for `duration` seconds and collect per-request samples"""
+    names = [name for name in mix if name in factories]
+    weights = [mix[name] for name in names]
+    samples = []
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            name = random.choices(names, weights)[0]
+            method, path, body = factories[name]()
+            start = time.perf_counter()
+            try:
+                status, _ = await http_request(host, port, method, path, body)
+            except (OSError, ValueError, IndexError):
+                status = 0
+            samples.append((name, time.perf_counter() - start, status))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples, time.perf_counter() - start
+
+
+def summarize(samples, elapsed):
+    """Throughput, latency percentiles and error rate per endpoint (plus 'all')"""
+    by_endpoint = {}
+    for name, seconds, status in samples:
+        by_endpoint.setdefault(name, []).append((seconds, status))
+        by_endpoint.setdefault('all', []).append((seconds, status))
+
+    summary = {}
+    for name, rows in sorted(by_endpoint.items()):
+        latencies = np.array([seconds for seconds, _ in rows]) * 1000
+        errors = sum(1 for _, status in rows if status == 0 or status >= 400)
+        summary[name] = {
+            'requests': len(rows),
+            'throughput_rps': len(rows) / elapsed,
+            'p50_ms': float(np.percentile(latencies, 50)),
+            'p95_ms': float(np.percentile(latencies, 95)),
+            'p99_ms': float(np.percentile(latencies, 99)),
+            'error_rate': errors / len(rows)
+        }
+    return summary
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(csv_path, model_path, port, timeout, asgi=False):
+    """Launch the Flask app (threaded, no reloader, or under uvicorn) and wait for /api/health"""
+    env = dict(os.environ, DATA_PATH=csv_path, ML_MODEL_PATH=model_path, STORAGE_URL='none')
+    command = (f"import asgi, uvicorn; uvicorn.run(asgi.application, host='127.0.0.1', port={port}, log_level='warning')"
+               if asgi else f"import app; app.init_ml(); app.app.run(host='127.0.0.1', port={port}, threaded=True)")
+    server = subprocess.Popen(
+        [sys.executable, '-c', command],
+        cwd=os.path.join(STACK_DIR, 'backend'), env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("API server exited during startup")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/api/health", timeout=2) as response:
+                if json.load(response).get('ml_available'):
+                    return server
+        except OSError:
+            pass
+        time.sleep(0.5)
+    server.terminate()
+    raise RuntimeError(f"API server not healthy after {timeout}s")
+
+
+def compare(current, baseline_path):
+    """Print p95 and throughput changes per level/endpoint against a previous run"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)['levels']
+    print(f"\n📊 Compared with {baseline_path}")
+    for level, endpoints in current.items():
+        for name, stats in endpoints.items():
+            before = baseline.get(level, {}).get(name)
+            if not before:
+                continue
+            print(f"   c={level:<4} {name:<10} p95 {before['p95_ms']:>9.1f} → {stats['p95_ms']:>9.1f} ms   "
+                  f"rps {before['throughput_rps']:>8.1f} → {stats['throughput_rps']:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the dropout prediction API")
+    parser.add_argument('--rows', type=int, default=14000, help="synthetic cohort size")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('--duration', type=float, default=15, help="seconds per concurrency level")
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f"endpoint weights (default: {DEFAULT_MIX})")
+    parser.add_argument('--url', default=None, help="test an already running server instead of starting one")
+    parser.add_argument('--asgi', action='store_true', help="serve through backend/asgi.py with uvicorn")
+    parser.add_argument('--startup-timeout', type=float, default=300)
+    parser.add_argument('--out', default=None, help="results JSON (default: results/load-<timestamp>.json)")
+    parser.add_argument('--compare', default=None, help="previous results JSON to compare against")
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    cohort = generate_cohort(args.rows)
+    factories = build_requests(cohort)
+    unknown = set(mix) - set(factories)
+    if unknown:
+        parser.error(f"unknown mix entries: {', '.join(sorted(unknown))}")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        server = None
+        if args.url:
+            host, port = urlsplit(args.url).hostname, urlsplit(args.url).port or 80
+        else:
+            csv_path = os.path.join(workdir, 'cohort.csv')
+            cohort.to_csv(csv_path, index=False)
+            host, port = '127.0.0.1', free_port()
+            print(f"🚀 Starting API on port {port} with {args.rows:,} synthetic students...")
+            server = start_server(csv_path, os.path.join(workdir, 'model.pkl'), port, args.startup_timeout, args.asgi)
+
+        levels = {}
+        try:
+            for concurrency in args.concurrency:
+                samples, elapsed = asyncio.run(run_level(host, port, factories, mix, concurrency, args.duration))
+                levels[str(concurrency)] = summarize(samples, elapsed)
+                print(f"\n📈 Concurrency {concurrency}")
+                for name, stats in levels[str(concurrency)].items():
+                    print(f"   {name:<10} {stats['requests']:>6} req  {stats['throughput_rps']:>8.1f} req/s  "
+                          f"p50 {stats['p50_ms']:>8.1f}  p95 {stats['p95_ms']:>8.1f}  p99 {stats['p99_ms']:>8.1f} ms  "
+                          f"errors {stats['error_rate']:.1%}")
+        finally:
+            if server:
+                server.terminate()
+                server.wait()
+
+    report = {
+        'created_at': datetime.now().isoformat(),
+        'rows': args.rows,
+        'mix': mix,
+        'duration_seconds': args.duration,
+        'target': args.url or ('local-asgi' if args.asgi else 'local'),
+        'levels': levels
+    }
+    out = args.out or os.path.join(RESULTS_DIR, f"load-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Results written to {out}")
+
+    if args.compare:
+        compare(levels, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { Bell, Settings, Users, Calendar, TrendingUp, AlertCircle, CheckCircle, Clock, MessageSquare, Send, Phone } from 'lucide-react';
+import { api } from '../services/api_integrated';
 
 const NotificationCenter = ({ students = [] }) => {
   const [notifications, setNotifications] = useState([]);
@@ -21,6 +22,31 @@ const NotificationCenter = ({ students = [] }) => {
     generateNotifications();
   }, [students]);
 
+  // Risk transitions are pushed by the backend instead of re-polling student lists
+  useEffect(() => {
+    return api.subscribeRiskEvents((event) => {
+      if (event.reset) return;
+      const pushed = event.transitions.map(transition => ({
+        id: `change-${transition.student_id}-${event.timestamp}`,
+        type: 'risk_change',
+        priority: transition.to === 'High Risk' && transition.direction === 'up' ? 'critical' : 'medium',
+        student: transition.name,
+        studentId: transition.student_id,
+        department: transition.department,
+        mentorId: event.mentor_id,
+        message: transition.message,
+        timestamp: new Date(event.timestamp),
+        status: 'pending',
+        actionRequired: transition.direction === 'up',
+        contactInfo: {
+          phone: '+91-9876543210',
+          email: `${transition.student_id}@college.edu`
+        }
+      }));
+      setNotifications(prev => [...pushed, ...prev]);
+    });
+  }, []);
+
   const generateNotifications = () => {
     const newNotifications = [];
     const now = new Date();
@@ -120,7 +146,8 @@ const NotificationCenter = ({ students = [] }) => {
       return new Date(b.timestamp) - new Date(a.timestamp);
     });
 
-    setNotifications(newNotifications);
+    // Keep alerts pushed by the backend when the local threshold alerts are rebuilt
+    setNotifications(prev => [...prev.filter(n => n.type === 'risk_change'), ...newNotifications]);
 
   // SMS and Communication Functions
   const sendSMS = async (phone, message) => {
@@ -183,7 +210,8 @@ const NotificationCenter = ({ students = [] }) => {
       performance: <TrendingUp className="w-4 h-4" />,
       fees: <Calendar className="w-4 h-4" />,
       high_risk: <AlertCircle className="w-4 h-4" />,
-      trend: <AlertCircle className="w-4 h-4" />
+      trend: <AlertCircle className="w-4 h-4" />,
+      risk_change: <TrendingUp className="w-4 h-4" />
     };
     return icons[type] || <Bell className="w-4 h-4" />;
   };
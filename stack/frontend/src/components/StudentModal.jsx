@@ -19,6 +19,8 @@ const StudentModal = ({ student, prediction, onClose }) => {
     },
     recommendations: prediction.recommendations || [],
     explanation: prediction.explanation || { main_factors: [] },
+    modelDrivers: prediction.explanation?.model_drivers || [],
+    driverMethod: prediction.explanation?.driver_method || 'tree_path',
     key_stats: prediction.key_stats || {}
   };
 
@@ -207,6 +209,35 @@ const StudentModal = ({ student, prediction, onClose }) => {
             </div>
           )}
 
+          {/* Model Drivers */}
+          {safePrediction.modelDrivers.length > 0 && (
+            <div>
+              <h3 className="text-lg font-semibold text-gray-900 mb-4">What the Model Relied On</h3>
+              <div className="space-y-3">
+                {safePrediction.modelDrivers.map((driver, index) => {
+                  const maxAbs = Math.max(...safePrediction.modelDrivers.map(d => Math.abs(d.contribution)));
+                  const width = maxAbs > 0 ? (Math.abs(driver.contribution) / maxAbs) * 100 : 0;
+                  // Forest contributions are shares of the predicted-class probability; LR ones are log-odds
+                  const label = safePrediction.driverMethod === 'tree_path'
+                    ? `${driver.contribution > 0 ? '+' : ''}${(driver.contribution * 100).toFixed(1)} pts`
+                    : `${driver.contribution > 0 ? '+' : ''}${driver.contribution.toFixed(2)}`;
+                  return (
+                    <div key={index} className="flex items-center gap-3">
+                      <span className="w-40 text-sm text-gray-700 truncate">{driver.feature.replace(/_/g, ' ')}</span>
+                      <div className="flex-1 bg-gray-200 rounded-full h-2">
+                        <div
+                          className={`h-2 rounded-full ${driver.contribution > 0 ? 'bg-red-500' : 'bg-green-500'}`}
+                          style={{width: `${width}%`}}
+                        ></div>
+                      </div>
+                      <span className="w-20 text-right text-xs sm:text-sm font-medium">{label}</span>
+                    </div>
+                  );
+                })}
+              </div>
+            </div>
+          )}
+
           {/* Recommendations */}
           {safePrediction.recommendations && safePrediction.recommendations.length > 0 && (
             <div>
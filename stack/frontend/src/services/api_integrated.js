@@ -2,7 +2,9 @@
 import axios from 'axios';
 
 // Configuration
-const API_BASE_URL = 'http://localhost:5000/api';
+// Multi-institution deployments serve each tenant under /t/<tenant>/api (works for EventSource too)
+const TENANT_ID = process.env.REACT_APP_TENANT_ID;
+const API_BASE_URL = TENANT_ID ? `http://localhost:5000/t/${TENANT_ID}/api` : 'http://localhost:5000/api';
 const USE_ML_BACKEND = process.env.REACT_APP_USE_ML_BACKEND === 'true' || false;
 
 // Create axios instance
@@ -301,6 +303,100 @@ export const api = {
     };
   },
 
+  // Download link for the scored roster (streamed by the backend, so it works for any roster size)
+  getExportUrl({ format = 'csv', recommendations = 0, ...filters } = {}) {
+    const params = new URLSearchParams({ format });
+    if (recommendations) params.append('recommendations', recommendations);
+    Object.entries(filters).forEach(([key, value]) => {
+      if (value !== undefined && value !== null && value !== '') params.append(key, value);
+    });
+    return `${API_BASE_URL}/students/export?${params}`;
+  },
+
+  // Refresh a held roster ({ data, version, epoch } from the last call) with only the rows changed since
+  async syncStudents(state = {}, { recommendations = 0 } = {}) {
+    if (USE_ML_BACKEND) {
+      try {
+        const params = { since: state.version || 0 };
+        if (state.epoch) params.epoch = state.epoch;
+        if (recommendations) params.recommendations = recommendations;
+        const response = await apiClient.get('/students/sync', { params });
+        const { changed, removed, full, version, epoch } = response.data;
+
+        // A full sync replaces the table; a delta patches it by Student_ID
+        const byId = new Map(full ? [] : (state.data || []).map(s => [s.Student_ID, s]));
+        removed.forEach(id => byId.delete(id));
+        changed.forEach(s => byId.set(s.Student_ID, s));
+        return { data: [...byId.values()], version, epoch, full, changed: changed.length, removed: removed.length };
+      } catch (error) {
+        console.warn('Sync API failed:', error.message);
+      }
+    }
+
+    // Nothing to sync against without the backend
+    return null;
+  },
+
+  // Type-ahead over the whole roster: name or roll-number prefix, or exact Student_ID
+  async searchStudents(query, limit = 10) {
+    if (USE_ML_BACKEND) {
+      try {
+        const response = await apiClient.get('/students/search', { params: { q: query, limit } });
+        return response.data.results;
+      } catch (error) {
+        console.warn('Search API failed, searching locally:', error.message);
+      }
+    }
+
+    const queryLower = query.toLowerCase();
+    return mockStudents.filter(student =>
+      student.Name.toLowerCase().includes(queryLower) ||
+      student.Roll_No.toLowerCase().startsWith(queryLower) ||
+      student.Student_ID.toLowerCase() === queryLower
+    ).slice(0, limit);
+  },
+
+  // Histograms and quantiles for charts (attendance, avg_score, fee_due_days, risk_probability)
+  async getDistributions({ by, bins, metrics } = {}) {
+    if (USE_ML_BACKEND) {
+      try {
+        const params = new URLSearchParams();
+        if (by) params.append('by', by);
+        if (bins) params.append('bins', bins);
+        if (metrics) params.append('metrics', metrics.join(','));
+        const response = await apiClient.get(`/analytics/distributions?${params}`);
+        return response.data;
+      } catch (error) {
+        console.warn('Distributions API failed:', error.message);
+      }
+    }
+
+    // No server-side bins without the backend; charts fall back to the rows they hold
+    return null;
+  },
+
+  // What-if risk for a cohort (listing filters or explicit IDs) under proposed interventions
+  async simulateInterventions(interventions, { filters = {}, studentIds, limit } = {}) {
+    if (USE_ML_BACKEND) {
+      try {
+        const params = new URLSearchParams();
+        Object.entries(filters).forEach(([key, value]) => {
+          if (value !== undefined && value !== null && value !== '') params.append(key, value);
+        });
+        const body = { interventions };
+        if (studentIds) body.student_ids = studentIds;
+        if (limit) body.limit = limit;
+        const response = await apiClient.post(`/simulate?${params}`, body);
+        return response.data;
+      } catch (error) {
+        console.warn('Simulation API failed:', error.message);
+      }
+    }
+
+    // Counterfactuals need the model, so there is nothing to fall back to
+    return null;
+  },
+
   // Upload CSV data
   async uploadData(studentsData) {
     if (USE_ML_BACKEND) {
@@ -328,6 +424,22 @@ export const api = {
     };
   },
 
+  // Subscribe to risk transitions pushed by the backend (returns an unsubscribe function)
+  subscribeRiskEvents(onEvent, { mentorId } = {}) {
+    if (!USE_ML_BACKEND || typeof EventSource === 'undefined') {
+      return () => {};
+    }
+
+    const params = new URLSearchParams();
+    if (mentorId) params.append('mentor_id', mentorId);
+
+    // EventSource reconnects on its own and resumes from the last event id it saw
+    const source = new EventSource(`${API_BASE_URL}/notifications/stream?${params}`);
+    source.addEventListener('risk_change', (event) => onEvent(JSON.parse(event.data)));
+    source.addEventListener('reset', (event) => onEvent({ reset: true, ...JSON.parse(event.data) }));
+    return () => source.close();
+  },
+
   // Check backend status
   async getBackendStatus() {
     try {
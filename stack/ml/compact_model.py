@@ -0,0 +1,203 @@
+# ================================================================
+# Compact Model Builder
+# Shrinks the trained forest and reports size/latency vs accuracy
+# ================================================================
+
+import argparse
+import contextlib
+import copy
+import io
+import json
+import os
+import pickle
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from param_ml_pipeline import DropoutPredictor
+
+TREE_COUNTS = (5, 10, 20, 30, 50, 75)
+DEPTH_CAPS = (4, 6, 8)
+DISTILL_DEPTHS = (6, 8, 10, 12)
+
+_RSS_PROBE = """
+import os, pickle, sys
+def rss():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+import sklearn.ensemble, sklearn.tree, sklearn.linear_model, sklearn.preprocessing
+before = rss()
+with open(sys.argv[1], 'rb') as f:
+    model = pickle.load(f)
+print(rss() - before)
+"""
+
+
+def compact_model_path(model_path):
+    """dropout_prediction_model.pkl -> dropout_prediction_model.compact.pkl"""
+    return os.path.splitext(model_path)[0] + '.compact.pkl'
+
+
+def prune_trees(forest, X_val, y_val, tolerance):
+    """Keep the fewest leading trees whose averaged vote stays within tolerance of the full forest"""
+    # Each tree's probabilities once; running means give every prefix's accuracy
+    tree_proba = np.stack([tree.predict_proba(X_val) for tree in forest.estimators_])
+    prefix_proba = np.cumsum(tree_proba, axis=0)
+    full_accuracy = np.mean(forest.classes_[prefix_proba[-1].argmax(axis=1)] == y_val)
+
+    for count in TREE_COUNTS:
+        if count >= len(forest.estimators_):
+            break
+        accuracy = np.mean(forest.classes_[prefix_proba[count - 1].argmax(axis=1)] == y_val)
+        if accuracy >= full_accuracy - tolerance:
+            pruned = copy.copy(forest)
+            pruned.estimators_ = forest.estimators_[:count]
+            pruned.n_estimators = count
+            return pruned
+    return forest
+
+
+def cap_depth(forest, X_train, y_train, X_val, y_val, tolerance):
+    """Retrain the forest with the shallowest depth cap that keeps validation accuracy"""
+    from sklearn.ensemble import RandomForestClassifier
+
+    full_accuracy = forest.score(X_val, y_val)
+    for depth in DEPTH_CAPS:
+        if forest.max_depth is not None and depth >= forest.max_depth:
+            break
+        capped = RandomForestClassifier(n_estimators=forest.n_estimators, max_depth=depth, random_state=42)
+        capped.fit(X_train, y_train)
+        if capped.score(X_val, y_val) >= full_accuracy - tolerance:
+            return capped
+    return None
+
+
+def distill(teacher, X_train, X_val, y_val, tolerance):
+    """Fit one decision tree to the teacher's class probabilities (soft labels)"""
+    from sklearn.tree import DecisionTreeClassifier
+
+    full_accuracy = teacher.score(X_val, y_val)
+    soft = teacher.predict_proba(X_train)
+    n_classes = soft.shape[1]
+    # Each row appears once per class, weighted by the teacher's probability for it, so
+    # leaf values become averaged teacher probabilities rather than hard-label counts
+    X_soft = np.repeat(X_train, n_classes, axis=0)
+    y_soft = np.tile(teacher.classes_, len(X_train))
+    weights = soft.ravel()
+
+    best = None
+    for depth in DISTILL_DEPTHS:
+        student = DecisionTreeClassifier(max_depth=depth, random_state=42)
+        student.fit(X_soft[weights > 0], y_soft[weights > 0], sample_weight=weights[weights > 0])
+        best = student
+        if student.score(X_val, y_val) >= full_accuracy - tolerance:
+            break
+    return best
+
+
+def measure(name, model, predictor, X_val, y_val, workdir, single_rows=200):
+    """Artifact size, loaded RSS, latency and accuracy of one candidate"""
+    path = os.path.join(workdir, f"{name}.pkl")
+    with open(path, 'wb') as f:
+        pickle.dump({'model': model, 'scaler': predictor.scaler, 'feature_columns': predictor.feature_columns,
+                     'training_profile': predictor.training_profile}, f)
+    try:
+        rss = int(subprocess.check_output([sys.executable, '-c', _RSS_PROBE, path], text=True))
+    except (OSError, subprocess.CalledProcessError, ValueError):
+        rss = None
+
+    start = time.perf_counter()
+    model.predict_proba(X_val)
+    batch_seconds = time.perf_counter() - start
+
+    single = []
+    for row in X_val[:single_rows]:
+        start = time.perf_counter()
+        model.predict_proba(row.reshape(1, -1))
+        single.append(time.perf_counter() - start)
+
+    trees = getattr(model, 'estimators_', [model])
+    return {
+        'candidate': name,
+        'trees': len(trees),
+        'nodes': int(sum(tree.tree_.node_count for tree in trees)),
+        'artifact_bytes': os.path.getsize(path),
+        'rss_bytes': rss,
+        'batch_ms_per_1k_rows': batch_seconds * 1000 / len(X_val) * 1000,
+        'single_row_ms': float(np.median(single)) * 1000,
+        'accuracy': float(model.score(X_val, y_val)),
+        'path': path
+    }
+
+
+def build_compact_model(data_path, model_path, out_path, tolerance=0.005):
+    """Try every compaction, save the smallest candidate within tolerance, and return the report"""
+    # sklearn loads here, not on import: the API imports this module only for compact_model_path()
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.model_selection import train_test_split
+
+    predictor = DropoutPredictor()
+    with contextlib.redirect_stdout(io.StringIO()):
+        predictor.load_model(model_path)
+        predictor.load_data(data_path)
+        predictor.create_dropout_labels()
+    if not isinstance(predictor.model, RandomForestClassifier):
+        raise ValueError("Compaction needs a Random Forest model")
+
+    # Same split train_model used, so validation rows were never trained on
+    X = predictor.encode_features(predictor.data)
+    y = predictor.data['dropout_risk'].to_numpy()
+    X_train, X_val, y_train, y_val = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+    X_train = predictor.scaler.transform(X_train)
+    X_val = predictor.scaler.transform(X_val)
+
+    forest = predictor.model
+    print(f"🌲 Compacting {len(forest.estimators_)}-tree forest (tolerance {tolerance:.1%})...")
+    candidates = {'full': forest, 'pruned': prune_trees(forest, X_val, y_val, tolerance)}
+    capped = cap_depth(candidates['pruned'], X_train, y_train, X_val, y_val, tolerance)
+    if capped is not None:
+        candidates['depth_capped'] = capped
+    candidates['distilled'] = distill(forest, X_train, X_val, y_val, tolerance)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        rows = [measure(name, model, predictor, X_val, y_val, workdir) for name, model in candidates.items()]
+        full = rows[0]
+        for row in rows:
+            row['accuracy_delta'] = row['accuracy'] - full['accuracy']
+
+        eligible = [row for row in rows[1:] if row['accuracy_delta'] >= -tolerance] or [full]
+        chosen = min(eligible, key=lambda row: row['artifact_bytes'])
+        shutil.move(chosen['path'], out_path)
+        for row in rows:
+            del row['path']
+
+    print(f"\n{'candidate':<14}{'trees':>6}{'nodes':>9}{'size KB':>10}{'RSS MB':>9}"
+          f"{'batch ms/1k':>13}{'single ms':>11}{'accuracy':>10}{'Δ acc':>8}")
+    for row in rows:
+        rss = f"{row['rss_bytes'] / 2**20:.1f}" if row['rss_bytes'] is not None else 'n/a'
+        marker = '✅' if row is chosen else '  '
+        print(f"{row['candidate']:<14}{row['trees']:>6}{row['nodes']:>9}{row['artifact_bytes'] / 1024:>10.0f}"
+              f"{rss:>9}{row['batch_ms_per_1k_rows']:>13.2f}{row['single_row_ms']:>11.3f}"
+              f"{row['accuracy']:>10.3f}{row['accuracy_delta']:>+8.3f} {marker}")
+
+    report = {'source_model': model_path, 'compact_model': out_path, 'tolerance': tolerance,
+              'chosen': chosen['candidate'], 'candidates': rows}
+    with open(os.path.splitext(out_path)[0] + '.report.json', 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Saved {chosen['candidate']} model as {out_path}")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build a smaller, faster variant of the trained dropout model")
+    parser.add_argument('--data', default="final_clean_students_14k.csv")
+    parser.add_argument('--model', default="dropout_prediction_model.pkl")
+    parser.add_argument('--out', default=None, help="compact model path (default: <model>.compact.pkl)")
+    parser.add_argument('--tolerance', type=float, default=0.005, help="allowed validation accuracy drop")
+    args = parser.parse_args()
+
+    build_compact_model(args.data, args.model, args.out or compact_model_path(args.model), args.tolerance)
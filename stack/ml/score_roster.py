@@ -0,0 +1,172 @@
+# ================================================================
+# Bulk Roster Scoring CLI
+# Scores large student files in chunks across a process pool
+# ================================================================
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from param_ml_pipeline import DropoutPredictor
+
+# The upload validation the API applies, so offline scoring rejects the same rows
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+from validation import validate_students  # noqa: E402
+
+ID_COLUMNS = ['Student_ID', 'Name', 'Roll_No', 'Department', 'Semester', 'Mentor_ID']
+
+_predictor = None
+
+
+def _init_worker(model_path):
+    """Load the model once per worker process"""
+    global _predictor
+    _predictor = DropoutPredictor()
+    with contextlib.redirect_stdout(io.StringIO()):
+        _predictor.load_model(model_path)
+
+
+def score_chunk(chunk, top_n, all_columns):
+    """Validate one chunk, batch-score its valid rows and attach their top recommendations
+
+    Returns (scored rows, rejected input rows, {column: {problem: count}}).
+    """
+    chunk = chunk.reset_index(drop=True)
+    validation = validate_students(chunk, _predictor)
+    if validation.missing_columns:
+        raise ValueError(f"Missing columns: {', '.join(validation.missing_columns)}")
+    # A bad row (e.g. a NaN the model cannot take) is skipped and reported instead of failing the run
+    valid = validation.valid
+    rejected = chunk.drop(index=valid.index)
+
+    predictions = _predictor.predict_batch(valid) if len(valid) else pd.DataFrame(index=valid.index)
+    keep = valid.columns if all_columns else valid.columns.intersection(ID_COLUMNS)
+    scored = pd.concat([valid[keep], predictions], axis=1)
+
+    if top_n and len(valid):
+        recommendations = []
+        for student, prediction in zip(valid.to_dict('records'), predictions.to_dict('records')):
+            top = _predictor.generate_recommendations(student, prediction)[:top_n]
+            recommendations.append('; '.join(f"[{r['priority']}] {r['action']}" for r in top))
+        scored['top_recommendations'] = recommendations
+    return scored, rejected, validation.summary
+
+
+def read_chunks(path, chunksize):
+    """Yield DataFrames of at most chunksize rows from a CSV or Parquet file"""
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    elif path.endswith(('.pkl', '.feather')):
+        # Not streamable: the whole file is read, then handed out in slices
+        df = pd.read_pickle(path) if path.endswith('.pkl') else pd.read_feather(path)
+        for start in range(0, len(df), chunksize):
+            yield df.iloc[start:start + chunksize]
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize)
+
+
+class ChunkWriter:
+    """Append scored chunks, in order, to a CSV or Parquet file"""
+
+    def __init__(self, path):
+        self.path = path
+        self._parquet = None
+        self._first = True
+
+    def write(self, df):
+        if not len(df):
+            return
+        if self.path.endswith('.parquet'):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.path, table.schema)
+            self._parquet.write_table(table)
+        else:
+            df.to_csv(self.path, mode='w' if self._first else 'a', header=self._first, index=False)
+        self._first = False
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+def score_file(input_path, output_path, model_path, chunksize=50000, workers=None, top_n=3, all_columns=False,
+               rejected_path=None):
+    """Score input_path into output_path, keeping at most 2 chunks per worker in flight
+
+    Rows failing upload validation are skipped; they are written to rejected_path when
+    given, and counted per column and problem in the returned summary.
+    Returns (rows scored, rows rejected, {column: {problem: count}}).
+    """
+    workers = workers or os.cpu_count()
+    writer = ChunkWriter(output_path)
+    rejected_writer = ChunkWriter(rejected_path) if rejected_path else None
+    pending = deque()
+    rows_done = 0
+    rows_rejected = 0
+    problems = {}
+    start = time.perf_counter()
+
+    def drain_one():
+        nonlocal rows_done, rows_rejected
+        scored, rejected, summary = pending.popleft().result()
+        writer.write(scored)
+        if rejected_writer:
+            rejected_writer.write(rejected)
+        rows_done += len(scored)
+        rows_rejected += len(rejected)
+        for column, counts in summary.items():
+            for problem, count in counts.items():
+                problems.setdefault(column, {}).setdefault(problem, 0)
+                problems[column][problem] += count
+        elapsed = time.perf_counter() - start
+        print(f"\r⚙️  {rows_done:,} rows scored, {rows_rejected:,} rejected  ({rows_done / elapsed:,.0f} rows/s)",
+              end='', file=sys.stderr)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(model_path,)) as pool:
+        for chunk in read_chunks(input_path, chunksize):
+            pending.append(pool.submit(score_chunk, chunk, top_n, all_columns))
+            # Bounded window: memory stays flat no matter how large the input is
+            if len(pending) >= workers * 2:
+                drain_one()
+        while pending:
+            drain_one()
+    writer.close()
+    if rejected_writer:
+        rejected_writer.close()
+
+    elapsed = time.perf_counter() - start
+    print(file=sys.stderr)
+    print(f"✅ Scored {rows_done:,} students in {elapsed:.1f}s ({rows_done / max(elapsed, 1e-9):,.0f} rows/s) → {output_path}")
+    if rows_rejected:
+        print(f"⚠️ Skipped {rows_rejected:,} invalid rows" + (f" → {rejected_path}" if rejected_path else ""))
+        for column, counts in sorted(problems.items()):
+            print(f"   {column}: " + ", ".join(f"{problem} × {count:,}" for problem, count in counts.items()))
+    return rows_done, rows_rejected, problems
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score a full student roster without going through the API")
+    parser.add_argument('input', help="roster file (.csv, .parquet, .feather or .pkl)")
+    parser.add_argument('output', help="scored output file (.csv or .parquet)")
+    parser.add_argument('--model', default="dropout_prediction_model.pkl")
+    parser.add_argument('--chunksize', type=int, default=50000)
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--top-recommendations', type=int, default=3, help="0 to skip recommendations")
+    parser.add_argument('--all-columns', action='store_true', help="keep every input column, not just IDs")
+    parser.add_argument('--rejected', default=None, help="also write rows failing validation here (.csv or .parquet)")
+    args = parser.parse_args()
+
+    score_file(args.input, args.output, args.model, args.chunksize, args.workers,
+               args.top_recommendations, args.all_columns, args.rejected)
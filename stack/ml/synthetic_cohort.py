@@ -0,0 +1,85 @@
+# ================================================================
+# Synthetic Cohort Generator
+# Produces student rosters with the final_clean_students_14k.csv schema
+# ================================================================
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+DEPARTMENTS = ['CSE', 'IT', 'ECE', 'EEE', 'ME', 'CE']
+DEPARTMENT_WEIGHTS = [0.24, 0.18, 0.17, 0.14, 0.14, 0.13]
+FEE_TOTALS = [50000, 55000, 60000]
+STUDENTS_PER_MENTOR = 120
+
+FIRST_NAMES = ['Aarav', 'Ankita', 'Kavya', 'Siddharth', 'Rohan', 'Priya', 'Yash', 'Neha', 'Rahul',
+               'Sneha', 'Arjun', 'Isha', 'Vikram', 'Pooja', 'Aditya', 'Meera', 'Karan', 'Divya',
+               'Harsh', 'Riya', 'Nikhil', 'Shreya', 'Manish', 'Tanvi']
+LAST_NAMES = ['Mishra', 'Saxena', 'Banerjee', 'Yadav', 'Reddy', 'Chopra', 'Sharma', 'Kumar', 'Patel',
+              'Gupta', 'Singh', 'Verma', 'Iyer', 'Nair', 'Joshi', 'Mehta', 'Das', 'Rao']
+
+
+def generate_cohort(n_rows, seed=42):
+    """Generate n_rows students whose columns and risk flags follow the real dataset"""
+    rng = np.random.default_rng(seed)
+    ids = np.arange(1, n_rows + 1)
+
+    # One latent engagement factor drives attendance, scores and failures together
+    engagement = rng.normal(0, 1, n_rows)
+    attendance = np.clip(78 + 11 * engagement + rng.normal(0, 5, n_rows), 15, 100).round(1)
+    monthly_attendance = np.clip(attendance + rng.normal(0, 6, n_rows), 0, 100).round(1)
+    avg_score = np.clip(63 + 13 * engagement + rng.normal(0, 8, n_rows), 5, 100).round(1)
+    last_score = np.clip(avg_score + rng.normal(0, 9, n_rows), 0, 100).round(1)
+    subjects_failed = rng.poisson(np.exp(-0.9 - 1.1 * engagement).clip(0, 6))
+    attempts_exhausted = rng.poisson(np.exp(-1.6 - 0.9 * engagement).clip(0, 5))
+
+    # Fees: most students are paid up, the rest are partial or pending
+    fee_total = rng.choice(FEE_TOTALS, n_rows)
+    fee_roll = rng.random(n_rows)
+    fee_status = np.where(fee_roll < 0.72, 'Paid', np.where(fee_roll < 0.9, 'Partial', 'Pending'))
+    fee_paid = np.where(fee_status == 'Paid', fee_total,
+                        np.where(fee_status == 'Partial', (fee_total * rng.uniform(0.2, 0.9, n_rows)).astype(int), 0))
+    fee_due_days = np.where(fee_status == 'Paid', 0, rng.integers(5, 180, n_rows))
+
+    n_mentors = max(1, n_rows // STUDENTS_PER_MENTOR)
+    df = pd.DataFrame({
+        'Student_ID': [f"S{i:05d}" for i in ids],
+        'Name': np.char.add(np.char.add(rng.choice(FIRST_NAMES, n_rows), ' '), rng.choice(LAST_NAMES, n_rows)),
+        'Roll_No': [f"R{i:06d}" for i in ids],
+        'Department': rng.choice(DEPARTMENTS, n_rows, p=DEPARTMENT_WEIGHTS),
+        'Semester': rng.integers(1, 9, n_rows),
+        'Mentor_ID': [f"M{m:03d}" for m in rng.integers(1, n_mentors + 1, n_rows)],
+        'Attendance_Percentage': attendance,
+        'Monthly_Attendance': monthly_attendance,
+        'Avg_Test_Score': avg_score,
+        'Last_Test_Score': last_score,
+        'Subjects_Failed': subjects_failed,
+        'Attempts_Exhausted': attempts_exhausted,
+        'Fee_Total': fee_total,
+        'Fee_Paid': fee_paid,
+        'Fee_Due_Amount': fee_total - fee_paid,
+        'Fee_Status': fee_status,
+        'Fee_Due_Days': fee_due_days,
+        'Scholarship_Eligibility': np.where(rng.random(n_rows) < 0.3, 'Yes', 'No')
+    })
+
+    # Same thresholds the data team used to build the flags
+    df['Attendance_Flag'] = (df['Attendance_Percentage'] < 60).astype(int)
+    df['Score_Flag'] = (df['Avg_Test_Score'] < 40).astype(int)
+    df['Attempts_Flag'] = (df['Attempts_Exhausted'] > 2).astype(int)
+    df['Fee_Flag'] = (df['Fee_Due_Days'] > 30).astype(int)
+    df['Total_Risk_Flags'] = df[['Attendance_Flag', 'Score_Flag', 'Attempts_Flag', 'Fee_Flag']].sum(axis=1)
+    return df
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic student cohort CSV")
+    parser.add_argument('--rows', type=int, default=14000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--out', default=None, help="output CSV (default: synthetic_students_<rows>.csv)")
+    args = parser.parse_args()
+
+    out = args.out or f"synthetic_students_{args.rows}.csv"
+    generate_cohort(args.rows, args.seed).to_csv(out, index=False)
+    print(f"✅ Wrote {args.rows} synthetic students to {out}")
@@ -0,0 +1,36 @@
+# ================================================================
+# Hyperparameter Search CLI
+# Successive-halving CV search over model families, then saves the winner
+# ================================================================
+
+import argparse
+import json
+
+from param_ml_pipeline import DropoutPredictor
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tune the dropout model's family and hyperparameters")
+    parser.add_argument('--data', default="final_clean_students_14k.csv")
+    parser.add_argument('--out', default="dropout_prediction_model.pkl", help="where the tuned model is saved")
+    parser.add_argument('--space', default=None, help="JSON file of {family: {param: [values]}} (default: SEARCH_SPACE)")
+    parser.add_argument('--cv', type=int, default=3, help="cross-validation folds per trial")
+    parser.add_argument('--eta', type=int, default=3, help="keep the best 1/eta of each rung, on eta times more rows")
+    parser.add_argument('--min-rows', type=int, default=None, help="rows in the first rung's subsample (at least)")
+    parser.add_argument('--jobs', type=int, default=-1, help="parallel fits (default: all cores)")
+    parser.add_argument('--no-cache', action='store_true', help="recompute every stage")
+    parser.add_argument('--report', default=None, help="also write the search report JSON here")
+    args = parser.parse_args()
+
+    search_space = None
+    if args.space:
+        with open(args.space) as f:
+            search_space = json.load(f)
+
+    predictor = DropoutPredictor()
+    report = predictor.tune(args.data, search_space, cv=args.cv, eta=args.eta, min_rows=args.min_rows,
+                            n_jobs=args.jobs, use_cache=not args.no_cache)
+    predictor.save_model(args.out)
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
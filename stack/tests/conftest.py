@@ -0,0 +1,28 @@
+# ================================================================
+# Shared Test Fixtures
+# A model trained once on a synthetic cohort, for every test module
+# ================================================================
+
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'ml'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from param_ml_pipeline import DropoutPredictor  # noqa: E402
+from synthetic_cohort import generate_cohort  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def predictor():
+    predictor = DropoutPredictor()
+    predictor.data = generate_cohort(3000)
+    with contextlib.redirect_stdout(io.StringIO()):
+        predictor.create_dropout_labels()
+        X, y = predictor.prepare_features()
+        predictor.train_model(X, y)
+    return predictor
@@ -0,0 +1,40 @@
+# ================================================================
+# Dataset Store Tests
+# Upserts apply completely or not at all
+# ================================================================
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dataset_store import DatasetStore
+from synthetic_cohort import generate_cohort
+
+
+@pytest.fixture
+def store(predictor):
+    return DatasetStore(predictor).load(generate_cohort(1000, seed=7))
+
+
+def test_failed_scoring_leaves_the_store_unchanged(store):
+    frame, risk, summary, version = store.frame.copy(), store.risk.copy(), store.summary(), store.version
+    student_id = store.frame.index[0]
+    # An update and an insert, both with a value the model cannot score
+    bad = store.students([student_id, student_id]).astype(object)
+    bad['Student_ID'] = [student_id, 'NEW-1']
+    bad['Subjects_Failed'] = np.inf
+
+    with pytest.raises(ValueError):
+        store.upsert(bad)
+
+    pd.testing.assert_frame_equal(store.frame, frame)
+    pd.testing.assert_frame_equal(store.risk, risk)
+    assert store.summary() == summary
+    assert store.version == version
+
+    # The same student with a valid change is still detected and re-scored
+    good = store.students([student_id]).astype(object)
+    good['Subjects_Failed'] = int(frame.loc[student_id, 'Subjects_Failed']) + 1
+    result = store.upsert(good)
+    assert (result['updated'], result['rescored']) == (1, 1)
+    assert store.summary()['total_students'] == summary['total_students']
@@ -0,0 +1,18 @@
+# ================================================================
+# Feature Contribution Tests
+# Encoded columns fold back onto the raw inputs they came from
+# ================================================================
+
+
+def test_fee_due_days_is_not_in_the_fee_status_group(predictor):
+    groups = predictor._feature_groups()
+    row = groups[predictor.feature_columns.index('Fee_Due_Days')]
+    assert row[predictor.CONTRIBUTION_FEATURES.index('Fee_Due_Days')] == 1
+    assert row[predictor.CONTRIBUTION_FEATURES.index('Fee_Status')] == 0
+    fee_categories = [category for _, category in predictor.one_hot_columns()['Fee_Status']]
+    assert fee_categories and 'Due_Days' not in fee_categories
+
+
+def test_fee_due_days_gets_a_nonzero_attribution(predictor):
+    contributions = predictor.feature_contributions(predictor.data.head(1000))
+    assert contributions['Fee_Due_Days'].abs().mean() > 0
@@ -0,0 +1,49 @@
+# ================================================================
+# What-If Simulation Tests
+# Malformed requests are SimulationErrors (400s), never 500s or silent rewrites
+# ================================================================
+
+import pytest
+
+import simulation
+from simulation import SimulationError
+
+
+@pytest.mark.parametrize('spec', [
+    {'add': {'Subjects_Failed': float('inf')}},
+    {'at_most': {'Attendance_Percentage': float('-inf')}},
+    {'set': {'Fee_Due_Days': float('nan')}},
+    {'set': {'Semester': 'a'}},
+    {'set': {'Semester': True}},
+    {'set': 'Fee_Status'},
+    {'add': {'Department': 1}},
+    {'set': {'Department': 'XYZ'}},
+    {'set': {'Foo': 1}},
+])
+def test_malformed_interventions_are_rejected(predictor, spec):
+    with pytest.raises(SimulationError):
+        simulation.parse_interventions([spec], predictor)
+
+
+def test_finite_changes_are_accepted(predictor):
+    [intervention] = simulation.parse_interventions([{'add': {'Subjects_Failed': -1}, 'set': {'Fee_Status': 'Paid'}}],
+                                                    predictor)
+    assert sorted(intervention.changes) == [('add', 'Subjects_Failed', -1.0), ('set', 'Fee_Status', 'Paid')]
+
+
+@pytest.mark.parametrize('limit', ['abc', True, 2.5, [10]])
+def test_limit_must_be_an_integer(limit):
+    with pytest.raises(SimulationError):
+        simulation.parse_limit(limit)
+
+
+@pytest.mark.parametrize('student_ids', ['S00001', {'a': 1}, [{'a': 1}], [True]])
+def test_student_ids_must_be_a_list_of_ids(student_ids):
+    with pytest.raises(SimulationError):
+        simulation.parse_student_ids(student_ids)
+
+
+def test_limit_is_clamped():
+    assert simulation.parse_limit(None) == simulation.DEFAULT_STUDENT_LIMIT
+    assert simulation.parse_limit(-5) == 0
+    assert simulation.parse_limit(10 ** 9) == simulation.MAX_STUDENT_LIMIT